@@ -14,10 +14,13 @@ from core.i18n import i18n
 from core.pages_core.pages_effect import PagesEffect
 from core.utils.resource_manager import ResourceManager
 from core.utils.yiyanapi import YiyanAPI
+from core.thread.async_loop import async_loop
+from core.thread.thread_manager import thread_manager
 import sys
 import os
 import json
 import ctypes
+import multiprocessing
 import win32gui
 import win32con
 
@@ -137,17 +140,16 @@ class MainWindow(QMainWindow):
 
     def _show_welcome_notification(self):
         self.yiyan_api = YiyanAPI()
-        # 连接信号
-        self.yiyan_api.hitokoto_ready.connect(
+        # 开始异步获取，结果在界面线程上回调；窗口销毁时自动取消
+        self.yiyan_api.get_hitokoto_async(owner=self).on_done(
             lambda text: self.show_notification(
                 text=text,
                 type=NotificationType.TIPS,
                 duration=3000
             )
         )
-        # 开始异步获取
-        initial_text = self.yiyan_api.get_hitokoto_async()
         # 显示初始通知
+        initial_text = self.yiyan_api.get_cached_hitokoto()
         self.show_notification(
             text=initial_text,
             type=NotificationType.TIPS,
@@ -220,13 +222,19 @@ class MainWindow(QMainWindow):
         notification.show_notification()
 
 if __name__ == '__main__':
+    # 打包后进程池的工作进程也从这个入口启动，由它直接转去执行任务
+    multiprocessing.freeze_support()
     try:
         app = InitializationManager.init_application()
         window = MainWindow()
         window.show()
         log.info(i18n.get_text("app_started"))
         
-        exit_code = app.exec()
+        # 代替 app.exec()，同时驱动 asyncio 协程
+        exit_code = async_loop.run(app)
+        async_loop.close()
+        # 取消还在排队的任务，停止监控，关闭线程池和进程池
+        thread_manager.shutdown(wait=False, cancel_futures=True)
         sys.exit(exit_code)
         
     except Exception as e:
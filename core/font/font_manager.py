@@ -1,6 +1,6 @@
 from PySide6.QtGui import QFont, QFontDatabase, QColor
 from PySide6.QtWidgets import QWidget, QApplication, QLabel, QPushButton
-from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtCore import Qt, QObject, Signal
 import platform
 import re
 import os
@@ -8,6 +8,8 @@ import sys
 from core.log.log_manager import log
 from .icon_map import ICON_MAP
 from core.thread.thread_manager import thread_manager
+from core.thread.elastic_pool import LANE_INTERACTIVE
+from core.thread.qt_future import when_all
 
 def resource_path(relative_path):
     if hasattr(sys, '_MEIPASS'):
@@ -18,64 +20,56 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
-class FontLoaderThread(QThread):
+class FontLoader(QObject):
+    """在线程池上并行加载字体，结果在界面线程上通过信号发出，不阻塞任何线程"""
     finished = Signal(dict)  # 修改为返回字典，包含更多信息
     progress = Signal(str, int)  # 添加进度百分比
     
-    def __init__(self, fonts_to_load):
-        super().__init__()
+    def __init__(self, fonts_to_load, parent=None):
+        super().__init__(parent)
         self.fonts_to_load = fonts_to_load
         
-    def run(self):
-        font_db = QFontDatabase()
-        loaded_fonts = {}
+    def start(self):
         total = len(self.fonts_to_load)
         
         def load_single_font(font_path, font_name):
             try:
                 if os.path.exists(font_path):
-                    font_id = font_db.addApplicationFont(font_path)
+                    font_id = QFontDatabase.addApplicationFont(font_path)
                     if font_id >= 0:
                         return {
                             'success': True,
                             'name': font_name,
                             'id': font_id,
-                            'families': font_db.applicationFontFamilies(font_id)
+                            'families': QFontDatabase.applicationFontFamilies(font_id)
                         }
                 return {'success': False, 'name': font_name, 'error': '字体文件不存在'}
             except Exception as e:
                 return {'success': False, 'name': font_name, 'error': str(e)}
 
-        # 创建任务列表
-        tasks = {}
+        futures = []
+        completed = [0]
+        
+        def on_font_loaded(result):
+            completed[0] += 1
+            self.progress.emit(f"完成字体加载: {result['name']}", int(completed[0] * 100 / total))
+        
         for i, (font_path, font_name) in enumerate(self.fonts_to_load):
-            task_id = f"font_load_{font_name}_{i}"
             future = thread_manager.submit_task(
-                task_id,
+                f"font_load_{font_name}_{i}",
                 load_single_font,
                 font_path,
-                font_name
+                font_name,
+                lane=LANE_INTERACTIVE
             )
-            tasks[task_id] = (future, font_name)
-            self.progress.emit(f"提交字体加载任务: {font_name}", int((i + 1) * 50 / total))
-
-        # 收集结果
-        for i, (task_id, (future, font_name)) in enumerate(tasks.items()):
-            try:
-                result = future.result(timeout=3)  # 3秒超时
-                loaded_fonts[font_name] = result
-                self.progress.emit(
-                    f"完成字体加载: {font_name}", 
-                    int(50 + (i + 1) * 50 / total)
-                )
-            except Exception as e:
-                loaded_fonts[font_name] = {
-                    'success': False,
-                    'name': font_name,
-                    'error': f'加载超时: {str(e)}'
-                }
-                
-        self.finished.emit(loaded_fonts)
+            futures.append(future.on_done(on_font_loaded))
+        
+        # 全部完成后一次性发出结果
+        when_all(futures).on_done(
+            lambda results: self.finished.emit({result['name']: result for result in results})
+        ).on_error(
+            lambda e: log.error(f"字体加载失败: {str(e)}")
+        )
 
 class FontManager:
     _instance = None
@@ -0,0 +1,308 @@
+# =================
+# 崩溃飞行记录器
+# Version: 1.0.0
+# =================
+import faulthandler
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+import traceback
+import zlib
+from datetime import datetime
+from typing import List, NamedTuple, Optional
+
+# 文件头：魔数、版本、槽大小、槽数量、进程号、会话开始时间、退出状态，之后是会话日志路径
+_HEADER = struct.Struct('<8sIIIqdB')
+_HEADER_SIZE = 4096
+_LOG_FILE_OFFSET = 64
+_LOG_FILE_SIZE = 512
+_MAGIC = b'CLUTFR01'
+_VERSION = 1
+
+# 槽：seq（最后写入，作为提交标记）、crc32、消息长度、级别、调用方长度、时间、行号
+_SLOT = struct.Struct('<QIHBBdI')
+_COMMIT = struct.Struct('<QI')
+_FIELDS = struct.Struct('<HBBdI')
+_CRC_OFFSET = _COMMIT.size   # crc 覆盖从消息长度开始到消息结束的字节
+_CALLER_SIZE = 32
+
+STATE_RUNNING = 0
+STATE_CLEAN_EXIT = 1
+STATE_EXCEPTION = 2          # 出现过未捕获的 Python 异常（已当场写出报告），之后仍可能崩溃
+
+_LEVEL_NAMES = {10: 'DEBUG', 20: 'INFO', 30: 'WARNING', 40: 'ERROR', 50: 'CRITICAL'}
+
+
+class FlightRecord(NamedTuple):
+    seq: int
+    timestamp: float
+    level: str
+    caller: str
+    line: int
+    message: str
+
+
+class FlightRecorder:
+    """固定大小的内存映射环形记录文件，进程崩溃后仍能读回最后的日志
+
+    每条记录写入一个定长槽（seq % 槽数量），字段用 struct.pack_into 直接写进映射内存，
+    不经过任何缓冲区。seq 最后写入并带 crc，崩溃时写了一半的槽会被识别并丢弃。
+    映射页由操作系统负责落盘，进程被杀死或段错误时内容不会丢失。
+    """
+
+    SLOT_SIZE = 256
+    SLOT_COUNT = 4096
+    MESSAGE_SIZE = SLOT_SIZE - _SLOT.size - _CALLER_SIZE
+    # 崩溃报告中附带的最后记录条数
+    REPORT_RECORDS = 500
+
+    def __init__(self, log_dir: str, log_file: str = ''):
+        self.log_dir = log_dir
+        self.log_file = log_file
+        self.path = os.path.join(log_dir, 'flight_recorder.bin')
+        self.trace_path = os.path.join(log_dir, 'crash_trace.txt')
+        self._file = None
+        self._map = None
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._trace_file = None
+        self._logger = None
+        self._previous_excepthook = None
+        self._previous_thread_excepthook = None
+
+    # ---- 生命周期 ----
+    def open(self) -> Optional[str]:
+        """映射记录文件，如果上次运行没有正常退出则生成崩溃报告并返回其路径"""
+        report = None
+        if self._in_use_by_other_process():
+            # 另一个实例正在运行，改用本进程独占的文件
+            self.path = os.path.join(self.log_dir, f'flight_recorder_{os.getpid()}.bin')
+            self.trace_path = os.path.join(self.log_dir, f'crash_trace_{os.getpid()}.txt')
+        else:
+            report = self._report_previous_crash()
+
+        size = _HEADER_SIZE + self.SLOT_SIZE * self.SLOT_COUNT
+        self._file = open(self.path, 'a+b')
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size)
+        # 新会话：清空所有槽，写入文件头
+        self._map[_HEADER_SIZE:] = bytes(size - _HEADER_SIZE)
+        _HEADER.pack_into(self._map, 0, _MAGIC, _VERSION, self.SLOT_SIZE, self.SLOT_COUNT,
+                          os.getpid(), time.time(), STATE_RUNNING)
+        log_file = self.log_file.encode('utf-8')[:_LOG_FILE_SIZE]
+        self._map[_LOG_FILE_OFFSET:_LOG_FILE_OFFSET + _LOG_FILE_SIZE] = log_file.ljust(_LOG_FILE_SIZE, b'\0')
+        return report
+
+    def close(self, clean: bool = True) -> None:
+        """标记正常退出并释放映射"""
+        with self._lock:
+            if self._map is None:
+                return
+            if clean:
+                self._map[_HEADER.size - 1] = STATE_CLEAN_EXIT
+            self._map.flush()
+            self._map.close()
+            self._map = None
+            self._file.close()
+            self._file = None
+        if self._trace_file is not None:
+            faulthandler.disable()
+            self._trace_file.close()
+            self._trace_file = None
+        if clean and os.path.basename(self.path) != 'flight_recorder.bin':
+            # 多开实例使用的独占文件，正常退出后不再需要
+            for path in (self.path, self.trace_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    # ---- 写入 ----
+    def append(self, record: logging.LogRecord) -> None:
+        if self._map is None:
+            return
+        message = record.getMessage()[:self.MESSAGE_SIZE].encode('utf-8', errors='replace')[:self.MESSAGE_SIZE]
+        caller = getattr(record, 'caller', record.filename).encode('utf-8', errors='replace')[:_CALLER_SIZE]
+        # 槽内容在锁外拼好，映射内存只写两次：一次整块内容，一次提交标记
+        payload = b''.join((
+            _FIELDS.pack(len(message), record.levelno, len(caller), record.created, record.lineno),
+            caller.ljust(_CALLER_SIZE, b'\0'),
+            message,
+        ))
+        crc = zlib.crc32(payload)
+        with self._lock:
+            # 在锁内取映射，close() 之后不会再写入已关闭的映射
+            mm = self._map
+            if mm is None:
+                return
+            self._seq += 1
+            offset = _HEADER_SIZE + (self._seq % self.SLOT_COUNT) * self.SLOT_SIZE
+            start = offset + _CRC_OFFSET
+            # 先把 seq 清零，写一半时不会被当成旧记录
+            _COMMIT.pack_into(mm, offset, 0, 0)
+            mm[start:start + len(payload)] = payload
+            _COMMIT.pack_into(mm, offset, self._seq, crc)
+
+    # ---- 读取 ----
+    @classmethod
+    def read_records(cls, mm) -> List[FlightRecord]:
+        """解码映射或字节串中所有完整的记录，按写入顺序返回"""
+        magic, version, slot_size, slot_count = _HEADER.unpack_from(mm, 0)[:4]
+        if magic != _MAGIC or version != _VERSION:
+            return []
+        records = []
+        for index in range(slot_count):
+            offset = _HEADER_SIZE + index * slot_size
+            seq, crc, message_len, level, caller_len, created, lineno = _SLOT.unpack_from(mm, offset)
+            if seq == 0:
+                continue
+            body = offset + _SLOT.size
+            end = body + _CALLER_SIZE + message_len
+            if end > offset + slot_size or zlib.crc32(mm[offset + _CRC_OFFSET:end]) != crc:
+                continue  # 崩溃时正在写入的槽
+            records.append(FlightRecord(
+                seq, created, _LEVEL_NAMES.get(level, str(level)),
+                bytes(mm[body:body + caller_len]).decode('utf-8', errors='ignore'), lineno,
+                bytes(mm[body + _CALLER_SIZE:end]).decode('utf-8', errors='ignore'),
+            ))
+        records.sort()
+        return records
+
+    def _read_header(self):
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None, b''
+        if len(data) < _HEADER_SIZE:
+            return None, b''
+        header = _HEADER.unpack_from(data, 0)
+        if header[0] != _MAGIC:
+            return None, b''
+        return header, data
+
+    def _in_use_by_other_process(self) -> bool:
+        header, _ = self._read_header()
+        if header is None or header[6] == STATE_CLEAN_EXIT:
+            return False
+        pid, started = header[4], header[5]
+        if pid == os.getpid():
+            return False
+        # 只有上次没有正常退出时才需要查进程，psutil 导入较慢，不放在模块顶层
+        import psutil
+        try:
+            # 进程号可能已被其他程序复用，创建时间晚于会话开始的不是同一个进程
+            return psutil.Process(pid).create_time() <= started + 1
+        except (psutil.Error, OSError):
+            return False
+
+    def _report_previous_crash(self) -> Optional[str]:
+        header, data = self._read_header()
+        if header is None or header[6] == STATE_CLEAN_EXIT:
+            return None
+        _, _, _, _, pid, started, _ = header
+        log_file = data[_LOG_FILE_OFFSET:_LOG_FILE_OFFSET + _LOG_FILE_SIZE].rstrip(b'\0').decode('utf-8', errors='ignore')
+        try:
+            with open(self.trace_path, 'r', encoding='utf-8', errors='replace') as f:
+                trace = f.read().strip()
+        except OSError:
+            trace = ''
+        return self._write_report(
+            "上次运行异常退出（未正常关闭）",
+            pid, started, log_file, trace, self.read_records(data)
+        )
+
+    def _write_report(self, title, pid, started, log_file, trace, records) -> Optional[str]:
+        lines = [
+            f"==== {title} ====",
+            f"进程号: {pid}",
+            f"会话开始: {datetime.fromtimestamp(started).strftime('%Y-%m-%d %H:%M:%S')}",
+            f"会话日志: {log_file}",
+            "",
+        ]
+        if trace:
+            lines += ["---- 崩溃堆栈 ----", trace, ""]
+        lines.append(f"---- 最后 {min(len(records), self.REPORT_RECORDS)} 条日志 ----")
+        for record in records[-self.REPORT_RECORDS:]:
+            stamp = time.strftime('%H:%M:%S', time.localtime(record.timestamp))
+            lines.append(f"[{stamp}] │ {record.level:<8} │ {record.caller:<25}:{record.line:<4} │ {record.message}")
+
+        # 以会话开始时间命名，同一会话的多份报告依次编号
+        stem = os.path.join(self.log_dir, f"crash_report_{datetime.fromtimestamp(started).strftime('%Y-%m-%d_%H-%M-%S')}")
+        path, number = f"{stem}.txt", 1
+        while os.path.exists(path):
+            number += 1
+            path = f"{stem}_{number}.txt"
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+        except OSError:
+            return None
+        return path
+
+    # ---- 崩溃钩子 ----
+    def install_crash_hooks(self, logger: Optional[logging.Logger] = None) -> None:
+        """开启 faulthandler（原生崩溃）并接管 sys.excepthook / threading.excepthook（Python 异常）
+
+        传入 logger 时，未捕获的异常会先以 CRITICAL 级别写入日志，再生成崩溃报告。
+        """
+        self._logger = logger
+        if self._trace_file is None:
+            self._trace_file = open(self.trace_path, 'w', encoding='utf-8')
+            faulthandler.enable(file=self._trace_file, all_threads=True)
+        if self._previous_excepthook is None:
+            self._previous_excepthook = sys.excepthook
+            self._previous_thread_excepthook = threading.excepthook
+            sys.excepthook = self._excepthook
+            threading.excepthook = self._thread_excepthook
+
+    def _excepthook(self, exc_type, exc_value, exc_traceback):
+        self.dump_exception(exc_type, exc_value, exc_traceback)
+        self._previous_excepthook(exc_type, exc_value, exc_traceback)
+
+    def _thread_excepthook(self, args):
+        if args.exc_type is not SystemExit:
+            self.dump_exception(args.exc_type, args.exc_value, args.exc_traceback,
+                                args.thread.name if args.thread else '')
+        self._previous_thread_excepthook(args)
+
+    def dump_exception(self, exc_type, exc_value, exc_traceback, thread_name: str = '') -> Optional[str]:
+        """记录未捕获的异常，并立即把堆栈和最后的日志写成崩溃报告"""
+        trace = ''.join(traceback.format_exception(exc_type, exc_value, exc_traceback))
+        if self._logger is not None:
+            try:
+                self._logger.critical(f"未捕获的异常{f' (线程 {thread_name})' if thread_name else ''}: {exc_value!r}",
+                                      exc_info=(exc_type, exc_value, exc_traceback))
+            except Exception:
+                pass
+        if self._trace_file is not None:
+            try:
+                self._trace_file.write(f"未捕获的异常{f' (线程 {thread_name})' if thread_name else ''}:\n{trace}\n")
+                self._trace_file.flush()
+            except (OSError, ValueError):
+                pass
+        with self._lock:
+            if self._map is None:
+                return None
+            self._map[_HEADER.size - 1] = STATE_EXCEPTION
+            header = _HEADER.unpack_from(self._map, 0)
+            records = self.read_records(self._map)
+        return self._write_report("运行中出现未捕获的异常", header[4], header[5], self.log_file, trace, records)
+
+
+class FlightRecorderHandler(logging.Handler):
+    """把每条记录写入飞行记录器；只写映射内存，始终留在调用线程（异步模式下也不经过队列）"""
+
+    def __init__(self, recorder: FlightRecorder):
+        super().__init__(logging.DEBUG)
+        self.recorder = recorder
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.recorder.append(record)
+        except Exception:
+            self.handleError(record)
@@ -0,0 +1,136 @@
+# =================
+# 内存环形日志缓冲
+# Version: 1.0.0
+# =================
+import logging
+import threading
+from collections import deque
+from itertools import islice
+from typing import List, NamedTuple, Optional
+from PySide6.QtCore import QObject, Signal
+
+
+class LogEntry(NamedTuple):
+    """结构化的日志记录，供日志页面直接使用，不再需要解析文本"""
+    seq: int
+    timestamp: float
+    level: str
+    file: str
+    line: int
+    message: str
+    thread: str
+    task: str = ''            # 产生该记录的任务 task_id，不在任务内为空
+    task_parent: str = ''     # 外层任务的 task_id
+    task_elapsed: float = 0.0  # 距任务提交的毫秒数
+
+
+class LogRingBuffer:
+    """固定容量的日志环形缓冲，超出容量时自动覆盖最旧的记录
+
+    每条记录带一个单调递增的 seq，消费方只需记住上次读到的 seq 即可取增量。
+    """
+
+    # 单条消息的最大保留长度，防止超长消息撑爆内存
+    MAX_MESSAGE_LENGTH = 8192
+
+    def __init__(self, capacity: int = 20000):
+        if capacity <= 0:
+            raise ValueError("日志缓冲容量必须大于0")
+        self.capacity = capacity
+        self._entries = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._next_seq = 1
+
+    def append_record(self, record: logging.LogRecord) -> None:
+        message = record.getMessage()
+        if len(message) > self.MAX_MESSAGE_LENGTH:
+            message = message[:self.MAX_MESSAGE_LENGTH] + "..."
+        with self._lock:
+            self._entries.append(LogEntry(
+                self._next_seq,
+                record.created,
+                record.levelname,
+                getattr(record, 'caller', record.filename),
+                record.lineno,
+                message,
+                record.threadName,
+                getattr(record, 'task_id', ''),
+                getattr(record, 'task_parent', ''),
+                getattr(record, 'task_elapsed', 0.0),
+            ))
+            self._next_seq += 1
+
+    @property
+    def last_seq(self) -> int:
+        return self._next_seq - 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def snapshot(self) -> List[LogEntry]:
+        with self._lock:
+            return list(self._entries)
+
+    def since(self, seq: int) -> List[LogEntry]:
+        """返回 seq 之后的所有记录；已被覆盖的记录无法再取到"""
+        with self._lock:
+            count = min(self._next_seq - 1 - seq, len(self._entries))
+            if count <= 0:
+                return []
+            # 从右端反向取，代价只与增量大小有关
+            newest = list(islice(reversed(self._entries), count))
+        newest.reverse()
+        return newest
+
+
+class RingBufferHandler(logging.Handler):
+    """把日志记录写入 LogRingBuffer 的处理器
+
+    只做内存追加，异步模式下也留在调用线程上执行。
+    """
+
+    def __init__(self, buffer: LogRingBuffer):
+        super().__init__(logging.DEBUG)
+        self.buffer = buffer
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.buffer.append_record(record)
+        except Exception:
+            self.handleError(record)
+
+
+class LogStream(QObject):
+    """在 GUI 线程上按批次发出新日志记录
+
+    日志可以从任意线程写入，这里在 GUI 线程合并增量，突发的上千条记录只会触发一次信号。
+    流本身不带定时器，由消费方按自己的节奏调用 flush（日志页面用 scheduler 周期调用，
+    页面隐藏时随之暂停），没有消费方时不会唤醒进程。
+    """
+
+    records_appended = Signal(list)  # List[LogEntry]
+    records_dropped = Signal(int)    # 消费速度跟不上时被覆盖的记录数
+
+    def __init__(self, buffer: LogRingBuffer, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.buffer = buffer
+        self.last_seq = buffer.last_seq
+        self._stopped = False
+
+    def flush(self) -> None:
+        if self._stopped:
+            return
+        last_seq = self.buffer.last_seq
+        if last_seq == self.last_seq:
+            return
+        batch = self.buffer.since(self.last_seq)
+        if batch:
+            skipped = batch[0].seq - self.last_seq - 1
+            if skipped > 0:
+                self.records_dropped.emit(skipped)
+            self.last_seq = batch[-1].seq
+            self.records_appended.emit(batch)
+
+    def stop(self) -> None:
+        """停止发出记录，内存缓冲被替换时调用"""
+        self._stopped = True
@@ -4,8 +4,70 @@ import sys
 from logging.handlers import RotatingFileHandler
 from datetime import datetime
 from typing import Optional
+import atexit
 import colorama
 from colorama import Fore, Style
+from core.log.log_queue import AsyncLogDispatcher, QueueForwardHandler
+from core.log.log_buffer import LogRingBuffer, RingBufferHandler, LogStream
+from core.log.log_stats import LogCounters, LogStatsHandler
+from core.log.flight_recorder import FlightRecorder, FlightRecorderHandler
+from core.thread.task_context import current_task
+
+# 调用方文件名缓存：同一个代码对象/路径只截断一次
+_code_caller_cache = {}
+_path_caller_cache = {}
+
+
+def _short_caller_name(filename: str) -> str:
+    filename = os.path.basename(filename)
+    # 确保文件名不超过25个字符，如果超过则截断
+    if len(filename) > 25:
+        filename = filename[:22] + "..."
+    return filename
+
+
+def caller_name_for_code(code) -> str:
+    """返回代码对象所在文件的截断文件名（按代码对象缓存）"""
+    name = _code_caller_cache.get(code)
+    if name is None:
+        name = _code_caller_cache[code] = _short_caller_name(code.co_filename)
+    return name
+
+
+class CallerFilter(logging.Filter):
+    """为不经过 LogManager 包装方法的记录（如 get_logger() 直接调用）补齐 caller 字段"""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, 'caller'):
+            name = _path_caller_cache.get(record.pathname)
+            if name is None:
+                name = _path_caller_cache[record.pathname] = _short_caller_name(record.pathname)
+            record.caller = name
+        return True
+
+
+class TaskContextFilter(logging.Filter):
+    """在记录上附加当前任务信息（由 ThreadManager 提交时通过 contextvars 传入）
+
+    task_tag 供格式化器写入日志文件，形如 "<font_loader +12.3ms> "，
+    表示该行产生于 font_loader 任务、距提交已过 12.3 毫秒。
+    """
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        task = current_task()
+        if task is None:
+            record.task_id = ''
+            record.task_parent = ''
+            record.task_elapsed = 0.0
+            record.task_tag = ''
+        else:
+            elapsed = task.elapsed_ms(record.created)
+            record.task_id = task.task_id
+            record.task_parent = task.parent_id
+            record.task_elapsed = elapsed
+            record.task_tag = f"<{task.task_id} +{elapsed:.1f}ms> "
+        return True
+
 
 class ColoredFormatter(logging.Formatter):
     
@@ -19,7 +81,7 @@ class ColoredFormatter(logging.Formatter):
     
     def __init__(self, fmt: str, datefmt: Optional[str] = None, use_colors: bool = True):
         # 修改格式化字符串，使用固定宽度
-        fmt = ('[%(asctime)s] │ %(levelname)-8s │ %(pathname)-25s:%(lineno)-4d │ %(message)s')
+        fmt = ('[%(asctime)s] │ %(levelname)-8s │ %(caller)-25s:%(lineno)-4d │ %(task_tag)s%(message)s')
         super().__init__(fmt, datefmt)
         self.use_colors = use_colors
         if use_colors:
@@ -33,46 +95,28 @@ class ColoredFormatter(logging.Formatter):
             }
     
     def format(self, record: logging.LogRecord) -> str:
+        # 调用方信息在记录创建时已解析好（record.caller），这里只负责着色
+        if not hasattr(record, 'task_tag'):
+            record.task_tag = ''
+        if not self.use_colors:
+            return super().format(record)
+        
         # 保存原始的属性
         original_levelname = record.levelname
-        original_pathname = record.pathname
+        original_caller = record.caller
         
-        # 获取实际的调用文件信息
-        if hasattr(record, 'pathname'):
-            import inspect
-            frame = inspect.currentframe()
-            caller_frame = None
-            
-            while frame:
-                module_name = frame.f_globals.get('__name__', '')
-                if (not module_name.startswith('logging') and 
-                    not module_name.startswith('core.log')):
-                    caller_frame = frame
-                    break
-                frame = frame.f_back
-            
-            if caller_frame:
-                filename = os.path.basename(caller_frame.f_code.co_filename)
-                # 确保文件名不超过25个字符，如果超过则截断
-                if len(filename) > 25:
-                    filename = filename[:22] + "..."
-                record.pathname = filename
-                record.lineno = caller_frame.f_lineno
-        
-        # 根据是否使用颜色来格式化
-        if self.use_colors:
-            if record.levelname in self.COLORS:
-                record.levelname = (f"{self.COLORS[record.levelname]}"
-                                  f"{record.levelname}"
-                                  f"{Style.RESET_ALL}")
-            record.pathname = f"{Fore.BLUE}{record.pathname}{Style.RESET_ALL}"
+        if record.levelname in self.COLORS:
+            record.levelname = (f"{self.COLORS[record.levelname]}"
+                              f"{record.levelname}"
+                              f"{Style.RESET_ALL}")
+        record.caller = f"{Fore.BLUE}{record.caller}{Style.RESET_ALL}"
         
         # 格式化消息
         result = super().format(record)
         
         # 恢复原始属性
         record.levelname = original_levelname
-        record.pathname = original_pathname
+        record.caller = original_caller
         
         return result
 
@@ -81,6 +125,9 @@ class LogManager:
     _initialized = False
     _active_filters = set()
     
+    # 内存环形缓冲容量（条）
+    RING_BUFFER_CAPACITY = 20000
+    
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(LogManager, cls).__new__(cls)
@@ -92,6 +139,10 @@ class LogManager:
             
         LogManager._initialized = True
         
+        # 异步写入管道（默认关闭，调用 enable_async 开启）
+        self._dispatcher = None
+        self._forward_handler = None
+        
         # 创建日志目录
         self.log_dir = os.path.join(os.path.expanduser('~'), '.clutui_nextgen_example', 'logs')
         os.makedirs(self.log_dir, exist_ok=True)
@@ -103,6 +154,8 @@ class LogManager:
         # 创建主日志记录器
         self.logger = logging.getLogger('ClutCleaner')
         self.logger.setLevel(logging.DEBUG)
+        self.logger.addFilter(CallerFilter())
+        self.logger.addFilter(TaskContextFilter())
         
         # 清除可能存在的处理器
         if self.logger.handlers:
@@ -139,6 +192,7 @@ class LogManager:
         # 添加处理器
         self.logger.addHandler(file_handler)
         self.logger.addHandler(console_handler)
+        self._io_handlers = [file_handler, console_handler]
         
         # 修改过滤器实现
         class LevelFilter(logging.Filter):
@@ -158,33 +212,214 @@ class LogManager:
         for handler in self.logger.handlers:
             handler.addFilter(self.level_filter)
         
+        # 按级别/模块的实时计数，写入会话日志旁的 .stats.json
+        self.counters = LogCounters(self.log_file)
+        self._stats_handler = LogStatsHandler(self.counters)
+        self.logger.addHandler(self._stats_handler)
+        atexit.register(self.counters.close)
+        
+        # 崩溃飞行记录器：最后的日志写入内存映射文件，进程崩溃也不会丢失
+        self.flight_recorder = None
+        self.previous_crash_report = None
+        try:
+            recorder = FlightRecorder(self.log_dir, self.log_file)
+            self.previous_crash_report = recorder.open()
+            self.flight_recorder = recorder
+            self.logger.addHandler(FlightRecorderHandler(recorder))
+            atexit.register(recorder.close)
+        except Exception as e:
+            sys.stderr.write(f"飞行记录器初始化失败: {e}\n")
+        
+        # 内存环形缓冲，供日志页面实时显示（不受等级过滤器影响）
+        self.ring_buffer = None
+        self._ring_handler = None
+        self._stream = None
+        self._min_level = logging.NOTSET
+        self.set_ring_buffer_capacity(self.RING_BUFFER_CAPACITY)
+        
         # 启动信息
         self.info("="*50)
         self.info("日志系统初始化完成")
         self.info(f"日志文件路径: {self.log_file}")
         self.info("="*50)
+        if self.previous_crash_report:
+            self.warning(f"上次运行异常退出，崩溃报告已保存到: {self.previous_crash_report}")
+    
+    def _log(self, level: int, message, args, stacklevel: int, exc_info=None) -> None:
+        # 先用缓存的最低级别短路，被过滤的日志不做任何格式化和调用方定位
+        if level < self._min_level or not self.logger.isEnabledFor(level):
+            return
+        if callable(message):
+            message = message()
+        # stacklevel=1 表示调用包装方法的那一帧，直接定位，无需逐帧遍历
+        frame = sys._getframe(stacklevel + 1)
+        code = frame.f_code
+        if exc_info is True:
+            exc_info = sys.exc_info()
+        record = self.logger.makeRecord(
+            self.logger.name, level, code.co_filename, frame.f_lineno,
+            message, args or None, exc_info, code.co_name
+        )
+        if args:
+            # 只格式化一次，避免每个处理器各自调用 getMessage
+            record.msg = record.getMessage()
+            record.args = None
+        record.caller = caller_name_for_code(code)
+        self.logger.handle(record)
     
-    def debug(self, message: str) -> None:
-        self.logger.debug(message)
+    def enabled(self, level: int) -> bool:
+        """该级别的日志是否会被记录，调用方可据此跳过昂贵的准备工作"""
+        return level >= self._min_level and self.logger.isEnabledFor(level)
     
-    def info(self, message: str) -> None:
-        self.logger.info(message)
+    def debug(self, message, *args, stacklevel: int = 1) -> None:
+        """记录调试日志
+        
+        message 可以是带 % 占位符的字符串（配合 args 延迟格式化），
+        也可以是返回字符串的可调用对象，级别被过滤时都不会求值：
+            log.debug("提交任务: %s", task_id)
+            log.debug(lambda: i18n.get_text("switch_to_page").format(name))
+        """
+        if logging.DEBUG >= self._min_level:
+            self._log(logging.DEBUG, message, args, stacklevel)
     
-    def warning(self, message: str) -> None:
-        self.logger.warning(message)
+    def info(self, message, *args, stacklevel: int = 1) -> None:
+        if logging.INFO >= self._min_level:
+            self._log(logging.INFO, message, args, stacklevel)
     
-    def error(self, message: str) -> None:
-        self.logger.error(message)
+    def warning(self, message, *args, stacklevel: int = 1) -> None:
+        if logging.WARNING >= self._min_level:
+            self._log(logging.WARNING, message, args, stacklevel)
     
-    def critical(self, message: str) -> None:
-        self.logger.critical(message)
+    def error(self, message, *args, stacklevel: int = 1) -> None:
+        if logging.ERROR >= self._min_level:
+            self._log(logging.ERROR, message, args, stacklevel)
     
-    def exception(self, message: str) -> None:
-        self.logger.exception(message)
+    def critical(self, message, *args, stacklevel: int = 1) -> None:
+        if logging.CRITICAL >= self._min_level:
+            self._log(logging.CRITICAL, message, args, stacklevel)
+    
+    def exception(self, message, *args, stacklevel: int = 1) -> None:
+        if logging.ERROR >= self._min_level:
+            self._log(logging.ERROR, message, args, stacklevel, exc_info=True)
+    
+    def set_level(self, level: int) -> None:
+        """设置记录的最低级别，低于该级别的调用直接返回"""
+        self.logger.setLevel(level)
+        self.refresh_levels()
+    
+    def refresh_levels(self) -> None:
+        """重新计算最低生效级别；直接修改处理器级别后需调用一次
+        
+        取所有处理器（异步模式下为写入线程上的处理器）级别的最小值，
+        没有任何处理器会接收的级别在 enabled() 中即被排除。
+        """
+        handlers = [h for h in self.logger.handlers if h is not self._forward_handler]
+        handlers.extend(h for h in self._io_handlers if h not in handlers)
+        self._min_level = max(self.logger.getEffectiveLevel(), min(h.level for h in handlers))
     
     def get_logger(self) -> logging.Logger:
         return self.logger
     
+    def set_ring_buffer_capacity(self, capacity: int) -> None:
+        """调整内存缓冲容量，设为0时关闭，日志页面退回到增量读取日志文件"""
+        if self._ring_handler is not None:
+            self.logger.removeHandler(self._ring_handler)
+            self._ring_handler = None
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream = None
+        
+        self.ring_buffer = None
+        if capacity > 0:
+            self.ring_buffer = LogRingBuffer(capacity)
+            self._ring_handler = RingBufferHandler(self.ring_buffer)
+            self.logger.addHandler(self._ring_handler)
+        self.refresh_levels()
+    
+    def install_crash_hooks(self) -> None:
+        """开启 faulthandler 并接管未捕获异常，崩溃时转储飞行记录器中最后的日志"""
+        if self.flight_recorder is not None:
+            self.flight_recorder.install_crash_hooks(self.logger)
+    
+    def get_level_counts(self) -> dict:
+        """本次会话各级别的日志条数（如 {'INFO': 120, 'WARNING': 3}）"""
+        return dict(self.counters.levels)
+    
+    def get_module_counts(self) -> dict:
+        """本次会话各模块（调用方文件）的日志条数"""
+        return dict(self.counters.modules)
+    
+    def get_stream(self) -> Optional[LogStream]:
+        """获取实时日志流（需在 GUI 线程首次调用），未开启内存缓冲时返回 None"""
+        if self._stream is None and self.ring_buffer is not None:
+            self._stream = LogStream(self.ring_buffer)
+        return self._stream
+    
+    def enable_async(self, capacity: int = 10000, policy: str = 'block') -> None:
+        """开启异步日志：调用线程只入队，由专用写入线程负责格式化和写盘
+        
+        Args:
+            capacity: 队列容量
+            policy: 队列满时的策略 ('block', 'drop_oldest', 'drop_debug')
+        """
+        if self._dispatcher is not None:
+            if self._dispatcher.policy == policy and self._dispatcher.capacity == capacity:
+                return
+            self.disable_async()
+        
+        # 纯内存的处理器留在调用线程，只有涉及 I/O 的处理器交给写入线程
+        self._dispatcher = AsyncLogDispatcher(self._io_handlers, capacity, policy)
+        self._forward_handler = QueueForwardHandler(self._dispatcher)
+        
+        for handler in self._io_handlers:
+            self.logger.removeHandler(handler)
+        self.logger.addHandler(self._forward_handler)
+        atexit.register(self.disable_async)
+        self.info(f"异步日志已开启，队列容量: {capacity}，溢出策略: {policy}")
+    
+    def disable_async(self, timeout: Optional[float] = 5.0) -> None:
+        """写出队列中剩余的日志并切回同步模式"""
+        if self._dispatcher is None:
+            return
+        
+        dispatcher = self._dispatcher
+        self.logger.removeHandler(self._forward_handler)
+        for handler in self._io_handlers:
+            self.logger.addHandler(handler)
+        self._dispatcher = None
+        self._forward_handler = None
+        
+        if not dispatcher.stop(timeout):
+            self.warning(f"异步日志未能在 {timeout} 秒内写完，剩余: {dispatcher.get_stats()['pending']}")
+        stats = dispatcher.get_stats()
+        if stats['dropped']:
+            self.warning(f"异步日志期间共丢弃 {stats['dropped']} 条日志")
+        try:
+            atexit.unregister(self.disable_async)
+        except Exception:
+            pass
+    
+    def is_async(self) -> bool:
+        return self._dispatcher is not None
+    
+    def get_async_stats(self) -> Optional[dict]:
+        if self._dispatcher is None:
+            return None
+        return self._dispatcher.get_stats()
+    
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """确保所有已记录的日志都落盘"""
+        flushed = True
+        if self._dispatcher is not None:
+            flushed = self._dispatcher.flush(timeout)
+        for handler in self._io_handlers:
+            try:
+                handler.flush()
+            except Exception:
+                pass
+        self.counters.save()
+        return flushed
+    
     def set_level_filter(self, level: str) -> None:
         """设置日志等级过滤器
         
@@ -199,7 +434,7 @@ class LogManager:
             self._active_filters.add(level)
             
         # 强制更新处理器的过滤器
-        for handler in self.logger.handlers:
+        for handler in self._io_handlers:
             handler.removeFilter(self.level_filter)
             handler.addFilter(self.level_filter)
 
@@ -0,0 +1,298 @@
+# =================
+# 历史日志内存映射读取
+# Version: 1.0.0
+# =================
+import glob
+import gzip
+import mmap
+import os
+import tempfile
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from itertools import accumulate, islice, repeat
+from operator import add
+from typing import Callable, List, Optional
+from core.log.log_buffer import LogEntry
+from core.log.log_tail import LINE_PATTERN, SESSION_PATTERN
+
+# RotatingFileHandler 的备份数量（与 LogManager 保持一致）
+MAX_ROTATED_SEGMENTS = 5
+
+SESSION_GLOB = 'clutui_nextgen_*.log'
+
+# 日志清理后压缩的会话文件后缀
+GZIP_SUFFIX = '.gz'
+
+
+def open_log_file(path: str, mode: str = 'rb'):
+    """打开日志文件，.gz 文件透明地流式解压"""
+    if path.endswith(GZIP_SUFFIX):
+        return gzip.open(path, mode)
+    return open(path, mode)
+
+
+def session_base_path(path: str) -> str:
+    """把轮转备份或压缩文件路径（xxx.log.3 / xxx.log.3.gz）还原为会话日志路径（xxx.log）"""
+    if path.endswith(GZIP_SUFFIX):
+        path = path[:-len(GZIP_SUFFIX)]
+    stem, ext = os.path.splitext(path)
+    if ext[1:].isdigit() and stem.endswith('.log'):
+        return stem
+    return path
+
+
+def rotated_segments(path: str) -> List[str]:
+    """会话日志及其轮转备份，按时间从旧到新排列（.log.5 … .log.1, .log），已压缩的取 .gz"""
+    base = session_base_path(path)
+    candidates = [f"{base}.{i}" for i in range(MAX_ROTATED_SEGMENTS, 0, -1)]
+    candidates.append(base)
+    segments = []
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            segments.append(candidate)
+        elif os.path.isfile(candidate + GZIP_SUFFIX):
+            segments.append(candidate + GZIP_SUFFIX)
+    return segments
+
+
+def list_log_sessions(log_dir: str, exclude: Optional[str] = None) -> List[str]:
+    """列出日志目录下的会话（返回 .log 路径，压缩的会话同样列出），最新的在前
+
+    exclude 用于排除正在写入的会话。
+    """
+    paths = glob.glob(os.path.join(log_dir, SESSION_GLOB))
+    paths += glob.glob(os.path.join(log_dir, SESSION_GLOB + GZIP_SUFFIX))
+    sessions = sorted({session_base_path(path) for path in paths}, reverse=True)
+    if exclude:
+        exclude = os.path.normcase(os.path.abspath(exclude))
+        sessions = [s for s in sessions if os.path.normcase(os.path.abspath(s)) != exclude]
+    return sessions
+
+
+class MappedSegment:
+    """单个日志文件的内存映射和行起始偏移索引
+
+    压缩的 .gz 文件无法直接映射，建立索引前先流式解压到临时文件再映射。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.compressed = path.endswith(GZIP_SUFFIX)
+        self.size = os.path.getsize(path)
+        self._file = None
+        self._map = None
+        self.offsets = array('q')
+        self.complete = False
+        if not self.compressed:
+            self.attach(open(path, 'rb'))
+
+    @property
+    def ready(self) -> bool:
+        return self._file is not None
+
+    def attach(self, file) -> None:
+        """映射已打开的未压缩文件（原文件或解压出的临时文件）"""
+        file.seek(0, os.SEEK_END)
+        self.size = file.tell()
+        self._file = file
+        self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+        self.complete = self.size == 0
+
+    def line_count(self) -> int:
+        """已确认完整的行数；索引未完成时最后一行可能还没读到结尾，不计入"""
+        if self.complete:
+            return len(self.offsets)
+        return max(0, len(self.offsets) - 1)
+
+    def index_block(self, position: int, block_size: int) -> int:
+        """为 [position, position + block_size) 内的换行建立索引，返回下一个块的起点"""
+        end = min(position + block_size, self.size)
+        if position == 0:
+            self.offsets.append(0)
+        parts = self._map[position:end].split(b'\n')
+        # 每个换行之后是下一行的起点；拆分和累加都在 C 层完成
+        self.offsets.extend(islice(
+            accumulate(map(add, map(len, parts[:-1]), repeat(1)), initial=position), 1, None
+        ))
+        if end >= self.size:
+            if self.offsets and self.offsets[-1] >= self.size:
+                self.offsets.pop()  # 文件以换行结尾，最后一个起点是空行
+            self.complete = True
+        return end
+
+    def line(self, index: int) -> str:
+        start = self.offsets[index]
+        end = self.offsets[index + 1] - 1 if index + 1 < len(self.offsets) else self.size
+        return self._map[start:end].decode('utf-8', errors='replace').rstrip('\r\n')
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+
+
+class MappedLogFile:
+    """把一个会话的日志及其轮转备份拼接成一条按行随机访问的时间线
+
+    文件通过 mmap 映射，不读入内存；后台一次扫描建立行起始偏移索引（每行 8 字节），
+    视图只解析正在显示的行，并按页缓存最近用到的解析结果，内存占用与文件大小基本无关。
+    """
+
+    INDEX_BLOCK_SIZE = 4 * 1024 * 1024
+    DECOMPRESS_CHUNK_SIZE = 1024 * 1024
+    PAGE_SIZE = 256
+    MAX_CACHED_PAGES = 64
+    # 续行（异常堆栈等）向前查找所属记录的最大行数
+    MAX_LOOKBACK = 200
+
+    def __init__(self, path: str):
+        self.path = session_base_path(path)
+        self.segments: List[MappedSegment] = []
+        try:
+            for segment_path in rotated_segments(self.path):
+                self.segments.append(MappedSegment(segment_path))
+        except Exception:
+            self.close()
+            raise
+        self._starts = [0]        # 已完成索引的各段在时间线上的起始行号
+        self._indexing = 0        # 正在建立索引的段
+        self._lock = threading.Lock()
+        self._closed = False
+        self._pages = OrderedDict()
+        self._day, self._start_seconds = self._session_start(self.path)
+
+    @staticmethod
+    def _session_start(path: str):
+        match = SESSION_PATTERN.search(os.path.basename(path))
+        if match:
+            day = datetime.strptime(match.group(1), '%Y-%m-%d')
+            return day, int(match.group(2)) * 3600 + int(match.group(3)) * 60 + int(match.group(4))
+        try:
+            modified = datetime.fromtimestamp(os.path.getmtime(path))
+        except OSError:
+            modified = datetime.now()
+        return modified.replace(hour=0, minute=0, second=0, microsecond=0), 0
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(segment.size for segment in self.segments)
+
+    @property
+    def is_indexed(self) -> bool:
+        return self._indexing >= len(self.segments)
+
+    def line_count(self) -> int:
+        # 后台线程先追加 _starts 再推进 _indexing，按这个顺序读取不需要加锁
+        indexing = self._indexing
+        count = self._starts[indexing]
+        if indexing < len(self.segments):
+            count += self.segments[indexing].line_count()
+        return count
+
+    def build_index(self, progress: Optional[Callable[[int], None]] = None) -> bool:
+        """在后台线程调用：逐块建立行索引，每块完成后回调当前可用行数
+
+        返回 False 表示中途被 close() 取消。
+        """
+        while self._indexing < len(self.segments):
+            segment = self.segments[self._indexing]
+            if not segment.ready and not self._decompress(segment):
+                return False
+            position = 0
+            while not segment.complete:
+                with self._lock:
+                    if self._closed:
+                        return False
+                    position = segment.index_block(position, self.INDEX_BLOCK_SIZE)
+                if progress is not None and not segment.complete:
+                    progress(self.line_count())
+            self._starts.append(self._starts[-1] + segment.line_count())
+            self._indexing += 1
+            if progress is not None:
+                progress(self.line_count())
+        return True
+
+    def _decompress(self, segment: MappedSegment) -> bool:
+        # 临时文件关闭即删除；解压在锁外进行，只有写入和映射需要与 close() 互斥
+        temp = tempfile.TemporaryFile(prefix='clutui_log_')
+        try:
+            with open_log_file(segment.path) as source:
+                while True:
+                    chunk = source.read(self.DECOMPRESS_CHUNK_SIZE)
+                    with self._lock:
+                        if self._closed:
+                            temp.close()
+                            return False
+                        if not chunk:
+                            segment.attach(temp)
+                            return True
+                        temp.write(chunk)
+        except Exception:
+            temp.close()
+            raise
+
+    def line(self, row: int) -> str:
+        index = bisect_right(self._starts, row) - 1
+        return self.segments[index].line(row - self._starts[index])
+
+    def entry(self, row: int) -> LogEntry:
+        page_number, offset = divmod(row, self.PAGE_SIZE)
+        page = self._pages.get(page_number)
+        if page is None or offset >= len(page):
+            page = self._parse_page(page_number)
+            self._pages[page_number] = page
+            if len(self._pages) > self.MAX_CACHED_PAGES:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(page_number)
+        return page[offset]
+
+    def _parse_page(self, page_number: int) -> List[LogEntry]:
+        first = page_number * self.PAGE_SIZE
+        last = min(first + self.PAGE_SIZE, self.line_count())
+        context = self._context_before(first)
+        entries = []
+        for row in range(first, last):
+            entry = self._parse(row, self.line(row), context)
+            context = entry
+            entries.append(entry)
+        return entries
+
+    def _context_before(self, row: int) -> Optional[LogEntry]:
+        # 页首是续行时，向前找到它所属的记录以继承级别和位置
+        for previous in range(row - 1, max(-1, row - 1 - self.MAX_LOOKBACK), -1):
+            line = self.line(previous)
+            if LINE_PATTERN.match(line):
+                return self._parse(previous, line, None)
+        return None
+
+    def _parse(self, row: int, line: str, context: Optional[LogEntry]) -> LogEntry:
+        match = LINE_PATTERN.match(line)
+        if match is None:
+            if context is None:
+                return LogEntry(row + 1, self._day.timestamp(), 'INFO', '', 0, line, '')
+            return LogEntry(row + 1, context.timestamp, context.level,
+                            context.file, context.line, line, '', context.task)
+
+        hour, minute, second, level, file, lineno, task, elapsed, message = match.groups()
+        seconds = int(hour) * 3600 + int(minute) * 60 + int(second)
+        day = self._day
+        if seconds < self._start_seconds - 3600:
+            # 早于会话开始时间，说明已跨过午夜
+            day += timedelta(days=1)
+        timestamp = (day + timedelta(seconds=seconds)).timestamp()
+        return LogEntry(row + 1, timestamp, level, file, int(lineno), message, '',
+                        task or '', '', float(elapsed) if elapsed else 0.0)
+
+    def close(self) -> None:
+        """释放映射；正在进行的索引会在下一块之前退出"""
+        with self._lock:
+            self._closed = True
+            for segment in self.segments:
+                segment.close()
+            self._pages.clear()
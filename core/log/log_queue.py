@@ -0,0 +1,185 @@
+# =================
+# 异步日志管道
+# Version: 1.0.0
+# =================
+import logging
+import threading
+import time
+from collections import deque
+from typing import Iterable, List, Optional
+
+
+class AsyncLogDispatcher:
+    """有界日志队列 + 专用写入线程
+
+    调用线程只负责把 LogRecord 放入队列，真正的格式化和磁盘/控制台写入
+    都在写入线程中完成。队列满时按 overflow 策略处理：
+
+    - block:       调用线程等待直到队列有空位（不丢日志）
+    - drop_oldest: 丢弃队列中最旧的一条
+    - drop_debug:  优先丢弃队列中最旧的 DEBUG 记录；新记录本身是 DEBUG 时直接丢弃；
+                   队列中没有 DEBUG 且新记录级别更高时退化为 block，保证 INFO 及以上不丢失
+    """
+
+    POLICIES = ('block', 'drop_oldest', 'drop_debug')
+
+    def __init__(self, handlers: Iterable[logging.Handler], capacity: int = 10000,
+                 policy: str = 'block'):
+        if policy not in self.POLICIES:
+            raise ValueError(f"未知的日志溢出策略: {policy}")
+        if capacity <= 0:
+            raise ValueError("日志队列容量必须大于0")
+
+        self.handlers: List[logging.Handler] = list(handlers)
+        self.capacity = capacity
+        self.policy = policy
+
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._idle = threading.Condition(self._lock)
+        self._busy = False
+        self._running = True
+
+        # 统计信息
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+
+        self._thread = threading.Thread(
+            target=self._writer_loop,
+            name="ClutLogWriter",
+            daemon=True
+        )
+        self._thread.start()
+
+    def enqueue(self, record: logging.LogRecord) -> bool:
+        with self._lock:
+            if not self._running:
+                return False
+
+            if len(self._queue) >= self.capacity:
+                if not self._make_room(record):
+                    self.dropped += 1
+                    return False
+
+            self._queue.append(record)
+            self.enqueued += 1
+            self._not_empty.notify()
+            return True
+
+    def _make_room(self, record: logging.LogRecord) -> bool:
+        """队列已满时腾出空间，返回 False 表示丢弃新记录（调用时已持有锁）"""
+        if self.policy == 'drop_oldest':
+            self._queue.popleft()
+            self.dropped += 1
+            return True
+
+        if self.policy == 'drop_debug':
+            for index, queued in enumerate(self._queue):
+                if queued.levelno <= logging.DEBUG:
+                    del self._queue[index]
+                    self.dropped += 1
+                    return True
+            if record.levelno <= logging.DEBUG:
+                return False
+
+        # block: 等待写入线程腾出空间；写入线程自身或已退出时不再等待，避免死锁
+        if threading.current_thread() is self._thread:
+            return False
+        while len(self._queue) >= self.capacity and self._running:
+            if not self._thread.is_alive():
+                return False
+            self._not_full.wait(0.1)
+        return self._running
+
+    def _writer_loop(self) -> None:
+        while True:
+            with self._lock:
+                while not self._queue and self._running:
+                    self._not_empty.wait()
+                if not self._queue and not self._running:
+                    self._idle.notify_all()
+                    return
+                batch = list(self._queue)
+                self._queue.clear()
+                self._busy = True
+                self._not_full.notify_all()
+
+            for record in batch:
+                self._dispatch(record)
+
+            for handler in self.handlers:
+                try:
+                    handler.flush()
+                except Exception:
+                    pass
+
+            with self._lock:
+                self.written += len(batch)
+                self._busy = False
+                if not self._queue:
+                    self._idle.notify_all()
+
+    def _dispatch(self, record: logging.LogRecord) -> None:
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                try:
+                    handler.handle(record)
+                except Exception:
+                    handler.handleError(record)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """等待队列中的日志全部写出，超时返回 False"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            while self._queue or self._busy:
+                if not self._thread.is_alive():
+                    return False
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining if remaining is not None else 0.1)
+        return True
+
+    def stop(self, timeout: Optional[float] = 5.0) -> bool:
+        """写出剩余日志后停止写入线程"""
+        flushed = self.flush(timeout)
+        with self._lock:
+            self._running = False
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+        self._thread.join(timeout)
+        return flushed and not self._thread.is_alive()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                'policy': self.policy,
+                'capacity': self.capacity,
+                'pending': len(self._queue),
+                'enqueued': self.enqueued,
+                'written': self.written,
+                'dropped': self.dropped,
+            }
+
+
+class QueueForwardHandler(logging.Handler):
+    """把日志记录转交给 AsyncLogDispatcher 的处理器
+
+    消息文本在调用线程上提前合并好，写入线程只做格式化与 I/O。
+    """
+
+    def __init__(self, dispatcher: AsyncLogDispatcher):
+        super().__init__(logging.DEBUG)
+        self.dispatcher = dispatcher
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            # 提前合并参数，避免参数对象在写入线程被修改
+            record.msg = record.getMessage()
+            record.args = None
+            self.dispatcher.enqueue(record)
+        except Exception:
+            self.handleError(record)
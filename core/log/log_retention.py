@@ -0,0 +1,234 @@
+# =================
+# 日志保留与压缩
+# Version: 1.0.0
+# =================
+import glob
+import gzip
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from core.log.log_manager import log
+from core.log.log_mmap import SESSION_GLOB, GZIP_SUFFIX, session_base_path
+from core.log.log_stats import STATS_SUFFIX
+from core.thread.elastic_pool import LANE_BACKGROUND
+from core.thread.scheduler import scheduler
+from core.thread.task_context import current_token
+from core.thread.thread_manager import thread_manager
+
+
+class RetentionPolicy:
+    """日志目录的保留策略，任一限制设为 0 或 None 表示不限制
+
+    Args:
+        max_total_bytes: 日志目录（含当前会话）的总大小上限
+        max_age_days: 会话最后写入时间超过该天数即删除
+        max_sessions: 最多保留的会话数（含当前会话）
+        compress: 是否 gzip 压缩已结束的会话和轮转备份
+    """
+
+    def __init__(self, max_total_bytes: Optional[int] = 200 * 1024 * 1024,
+                 max_age_days: Optional[float] = 30, max_sessions: Optional[int] = 50,
+                 compress: bool = True):
+        self.max_total_bytes = max_total_bytes
+        self.max_age_days = max_age_days
+        self.max_sessions = max_sessions
+        self.compress = compress
+
+
+class LogSession:
+    """同一次运行产生的所有文件：会话日志、轮转备份（可能已压缩）和计数文件"""
+
+    def __init__(self, base_path: str):
+        self.base_path = base_path
+        self.files: List[str] = []
+
+    @property
+    def size(self) -> int:
+        return sum(self._stat(path).st_size for path in self.files if self._stat(path))
+
+    @property
+    def modified(self) -> float:
+        return max((self._stat(path).st_mtime for path in self.files if self._stat(path)), default=0)
+
+    @staticmethod
+    def _stat(path):
+        try:
+            return os.stat(path)
+        except OSError:
+            return None
+
+    def log_files(self) -> List[str]:
+        return [path for path in self.files if not path.endswith(STATS_SUFFIX)]
+
+
+def collect_sessions(log_dir: str) -> List[LogSession]:
+    """按会话归组日志目录中的文件，最新的会话在前"""
+    sessions: Dict[str, LogSession] = {}
+    for path in glob.glob(os.path.join(log_dir, SESSION_GLOB + '*')):
+        name = path
+        if name.endswith(STATS_SUFFIX):
+            name = name[:-len(STATS_SUFFIX)]
+        elif name.endswith(GZIP_SUFFIX):
+            name = name[:-len(GZIP_SUFFIX)]
+        if name.endswith('.tmp'):
+            continue
+        base = session_base_path(name)
+        sessions.setdefault(base, LogSession(base)).files.append(path)
+    return [sessions[base] for base in sorted(sessions, reverse=True)]
+
+
+class LogRetention:
+    """启动一段时间后在线程池的 background 通道上清理和压缩日志目录
+
+    先按策略整组删除过期会话，再把剩下的已结束会话及其轮转备份流式压缩为 .gz。
+    当前会话（包括它的轮转备份）始终不动：RotatingFileHandler 轮转时会按
+    .log.1 → .log.2 的顺序重命名，压缩后的备份会打乱这条链。
+    """
+
+    # 每写出这么多压缩数据就让出一次 CPU，避免与界面线程争抢
+    COMPRESS_CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, log_dir: str, current_log: str, policy: Optional[RetentionPolicy] = None):
+        self.log_dir = log_dir
+        self.current_log = os.path.normcase(os.path.abspath(current_log))
+        self.policy = policy or RetentionPolicy()
+        self._job = None
+        self._stopped = threading.Event()
+
+    def schedule(self, delay: float = 30.0) -> None:
+        """延迟 delay 秒后提交到 background 通道执行一次，不影响启动速度"""
+        self._job = scheduler.call_later(delay, self._submit)
+
+    def _submit(self) -> None:
+        if self._stopped.is_set():
+            return
+        try:
+            thread_manager.submit_task("log_retention", self.run, lane=LANE_BACKGROUND)
+        except RuntimeError:
+            # 线程管理器已关闭，程序正在退出
+            pass
+
+    def cancel(self) -> None:
+        self._stopped.set()
+        if self._job is not None:
+            self._job.cancel()
+
+    def _should_stop(self) -> bool:
+        # cancel() 或关闭程序时取消令牌，都在处理下一块数据前结束
+        return self._stopped.is_set() or current_token().cancelled
+
+    def run(self) -> dict:
+        """执行一次清理，返回 {'deleted': 会话数, 'compressed': 文件数, 'freed': 字节数}"""
+        result = {'deleted': 0, 'compressed': 0, 'freed': 0}
+        try:
+            # 上次退出时被打断的压缩会留下半截临时文件
+            for temp_path in glob.glob(os.path.join(self.log_dir, SESSION_GLOB + '*' + GZIP_SUFFIX + '.tmp')):
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+            self._remove_old_crash_reports(result)
+            sessions = [s for s in collect_sessions(self.log_dir) if not self._is_current(s)]
+            kept = self._apply_limits(sessions, result)
+            if self.policy.compress:
+                for session in kept:
+                    for path in session.log_files():
+                        if self._should_stop():
+                            return result
+                        if not path.endswith(GZIP_SUFFIX) and self._compress(path, result):
+                            result['compressed'] += 1
+            if result['deleted'] or result['compressed']:
+                log.info(f"日志清理完成: 删除 {result['deleted']} 个会话，压缩 {result['compressed']} 个文件，"
+                         f"释放 {result['freed'] / 1048576:.1f}MB")
+        except Exception as e:
+            log.error(f"日志清理失败: {str(e)}")
+        return result
+
+    def _is_current(self, session: LogSession) -> bool:
+        return os.path.normcase(os.path.abspath(session.base_path)) == self.current_log
+
+    def _apply_limits(self, sessions: List[LogSession], result: dict) -> List[LogSession]:
+        policy = self.policy
+        now = time.time()
+        # 当前会话也占用名额和空间
+        try:
+            used = sum(os.path.getsize(p) for p in glob.glob(glob.escape(self.current_log) + '*'))
+        except OSError:
+            used = 0
+        count = 1
+        kept = []
+        for session in sessions:  # 从新到旧
+            size = session.size
+            expired = (
+                (policy.max_sessions and count >= policy.max_sessions)
+                or (policy.max_age_days and now - session.modified > policy.max_age_days * 86400)
+                or (policy.max_total_bytes and used + size > policy.max_total_bytes)
+            )
+            if expired:
+                if self._delete(session):
+                    result['deleted'] += 1
+                    result['freed'] += size
+                continue
+            used += size
+            count += 1
+            kept.append(session)
+        return kept
+
+    def _remove_old_crash_reports(self, result: dict) -> None:
+        # 飞行记录器生成的崩溃报告按保留天数清理
+        if not self.policy.max_age_days:
+            return
+        cutoff = time.time() - self.policy.max_age_days * 86400
+        for path in glob.glob(os.path.join(self.log_dir, 'crash_report_*.txt')):
+            try:
+                stat = os.stat(path)
+                if stat.st_mtime < cutoff:
+                    os.remove(path)
+                    result['freed'] += stat.st_size
+            except OSError:
+                pass
+
+    @staticmethod
+    def _delete(session: LogSession) -> bool:
+        deleted = True
+        for path in session.files:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                # 文件可能正被查看器映射（Windows 上无法删除），下次启动再处理
+                log.warning(f"删除日志失败 {os.path.basename(path)}: {str(e)}")
+                deleted = False
+        return deleted
+
+    def _compress(self, path: str, result: dict) -> bool:
+        target = path + GZIP_SUFFIX
+        temp_path = target + '.tmp'
+        try:
+            stat = os.stat(path)
+            with open(path, 'rb') as source, gzip.open(temp_path, 'wb', compresslevel=6) as output:
+                while True:
+                    chunk = source.read(self.COMPRESS_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    output.write(chunk)
+                    if self._should_stop():
+                        raise InterruptedError("日志清理已取消")
+                    time.sleep(0)
+            # 保留原始修改时间，按时间清理时仍以最后写入时间为准
+            os.utime(temp_path, (stat.st_atime, stat.st_mtime))
+            os.replace(temp_path, target)
+            os.remove(path)
+            result['freed'] += stat.st_size - os.path.getsize(target)
+            return True
+        except (OSError, InterruptedError) as e:
+            if not isinstance(e, InterruptedError):
+                log.warning(f"压缩日志失败 {os.path.basename(path)}: {str(e)}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return False
+
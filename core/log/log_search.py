@@ -0,0 +1,249 @@
+# =================
+# 日志后台检索
+# Version: 1.0.0
+# =================
+import re
+import threading
+import time
+from bisect import bisect_right
+from array import array
+from itertools import accumulate, repeat
+from operator import add, attrgetter
+from typing import List, Optional
+from PySide6.QtCore import QObject, Signal
+from core.log.log_manager import log
+from core.thread.thread_manager import thread_manager
+from core.thread.elastic_pool import LANE_INTERACTIVE
+from core.thread.task_group import TaskGroupFull
+
+SEARCH_PLAIN = 'plain'              # 区分大小写的纯文本
+SEARCH_IGNORE_CASE = 'ignore_case'  # 不区分大小写的纯文本
+SEARCH_REGEX = 'regex'              # 正则表达式（区分大小写）
+SEARCH_REGEX_IGNORE_CASE = 'regex_ignore_case'
+
+
+_message_of = attrgetter('message')
+
+
+class _IndexChunk:
+    """一段连续日志消息拼接成的检索块
+
+    把多条消息用换行拼成一个大字符串，一次 str.find / finditer 就能扫完整块，
+    再用行起始偏移二分定位到具体行，比逐行匹配快一个数量级。
+    """
+
+    __slots__ = ('start_row', 'count', 'text', 'lower', 'offsets')
+
+    def __init__(self, start_row: int, messages: List[str]):
+        self.start_row = start_row
+        self.count = len(messages)
+        self.text = '\n'.join(messages)
+        self.lower = None
+        # 每行起始偏移 = 之前各行长度 + 换行符数量（全部在 C 层完成，尽量少占 GIL）
+        self.offsets = array('q', accumulate(map(add, map(len, messages), repeat(1)), initial=0))
+        self.offsets.pop()
+
+    def lowered(self) -> Optional[str]:
+        """小写后的文本；小写改变了长度时（例如 'İ' 变成两个码位）偏移对不上原文，返回 None"""
+        if self.lower is None:
+            lower = self.text.lower()
+            self.lower = lower if len(lower) == len(self.text) else False
+        return self.lower or None
+
+    def locate(self, position: int):
+        """返回 (绝对行号, 行内偏移, 行尾偏移)"""
+        index = bisect_right(self.offsets, position) - 1
+        line_start = self.offsets[index]
+        if index + 1 < len(self.offsets):
+            line_end = self.offsets[index + 1] - 1
+        else:
+            line_end = len(self.text)
+        return self.start_row + index, position - line_start, line_end - line_start
+
+
+class LogSearchIndex:
+    """按绝对行号分块的消息索引，只为新追加的记录建块，头部裁剪时整块丢弃"""
+
+    CHUNK_SIZE = 8192
+
+    def __init__(self):
+        self._chunks: List[_IndexChunk] = []
+        self._lock = threading.Lock()
+
+    def update(self, base: int, entries) -> List[_IndexChunk]:
+        """根据当前的记录快照补齐索引，返回覆盖这些记录的块
+
+        块按绝对行号对齐 CHUNK_SIZE；头部被裁剪的块仍可使用，检索时跳过 base 之前的行。
+        """
+        end_row = base + len(entries)
+        with self._lock:
+            chunks = [c for c in self._chunks if c.start_row + c.count > base]
+            if chunks and chunks[-1].start_row + chunks[-1].count > end_row:
+                # 数据集已被替换，整体重建
+                chunks = []
+            next_row = base
+            if chunks:
+                last = chunks[-1]
+                next_row = last.start_row + last.count
+                if last.count < self.CHUNK_SIZE and next_row < end_row:
+                    # 最后一块未满，重建它以纳入新记录
+                    chunks.pop()
+                    next_row = max(last.start_row, base)
+
+            while next_row < end_row:
+                chunk_end = min(next_row - next_row % self.CHUNK_SIZE + self.CHUNK_SIZE, end_row)
+                messages = list(map(_message_of, entries[next_row - base:chunk_end - base]))
+                chunks.append(_IndexChunk(next_row, messages))
+                next_row = chunk_end
+                # 让出 GIL，避免后台建索引时界面线程排队等待
+                time.sleep(0)
+
+            self._chunks = chunks
+            return list(chunks)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._chunks = []
+
+
+class LogSearchEngine(QObject):
+    """在后台线程上检索日志消息
+
+    每次调用 search 会递增查询代号，旧查询在处理下一块前发现代号已变即自行退出。
+    匹配结果按块增量发出，信号自动排队到 GUI 线程。
+    """
+
+    matches_found = Signal(int, list)   # 查询代号, [(绝对行号, 起始, 结束), ...]
+    search_finished = Signal(int, int)  # 查询代号, 匹配总数
+    search_failed = Signal(int, str)    # 查询代号, 错误信息
+
+    # 单次查询最多返回的匹配数，防止结果本身占用过多内存
+    MAX_MATCHES = 100000
+
+    # 追加记录少于该数量时直接在调用线程检索，省去提交任务的开销
+    INLINE_APPEND_LIMIT = 2000
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.index = LogSearchIndex()
+        self._generation = 0
+        self._query = None   # 当前查询 (matcher, mode)
+        self._total = 0
+        # 检索任务最多同时占用两个线程；开始新查询时丢弃还在排队的旧查询
+        self._group = thread_manager.task_group("log_search", max_concurrency=2,
+                                                max_pending=32, lane=LANE_INTERACTIVE)
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def cancel(self) -> None:
+        self._generation += 1
+        self._group.cancel()
+
+    def search(self, entries, base: int, text: str, mode: str = SEARCH_IGNORE_CASE) -> int:
+        """开始新的检索，返回查询代号；entries 应为调用方持有的快照"""
+        self._generation += 1
+        self._group.cancel()
+        generation = self._generation
+        self._query = None
+        self._total = 0
+        if not text:
+            return generation
+
+        try:
+            matcher = self._build_matcher(text, mode)
+        except re.error as e:
+            self.search_failed.emit(generation, str(e))
+            return generation
+        self._query = (matcher, mode)
+
+        self._group.submit(self._run, generation, list(entries), base, matcher, mode)
+        return generation
+
+    def search_appended(self, entries, start_row: int) -> None:
+        """用当前查询检索新追加的记录，结果沿用当前查询代号"""
+        if self._query is None or not entries:
+            return
+        matcher, mode = self._query
+        generation = self._generation
+        if len(entries) <= self.INLINE_APPEND_LIMIT:
+            self._run_appended(generation, list(entries), start_row, matcher, mode)
+        else:
+            try:
+                self._group.submit(self._run_appended, generation, list(entries), start_row, matcher, mode)
+            except TaskGroupFull:
+                # 排队的追加检索太多时直接在调用线程检索，不丢匹配结果
+                self._run_appended(generation, list(entries), start_row, matcher, mode)
+
+    def _run_appended(self, generation, entries, start_row, matcher, mode) -> None:
+        try:
+            chunk = _IndexChunk(start_row, list(map(_message_of, entries)))
+            matches = self._search_chunk(chunk, matcher, mode)
+            if matches and generation == self._generation:
+                matches = matches[:max(0, self.MAX_MATCHES - self._total)]
+                self._total += len(matches)
+                if matches:
+                    self.matches_found.emit(generation, matches)
+        except Exception as e:
+            log.error(f"日志检索失败: {str(e)}")
+
+    @staticmethod
+    def _build_matcher(text: str, mode: str):
+        if mode == SEARCH_REGEX:
+            return re.compile(text)
+        if mode == SEARCH_REGEX_IGNORE_CASE:
+            return re.compile(text, re.IGNORECASE)
+        if mode == SEARCH_IGNORE_CASE:
+            return text.lower()
+        return text
+
+    def _run(self, generation, entries, base, matcher, mode) -> None:
+        try:
+            total = 0
+            for chunk in self.index.update(base, entries):
+                if generation != self._generation:
+                    return
+                matches = self._search_chunk(chunk, matcher, mode)
+                if chunk.start_row < base:
+                    matches = [m for m in matches if m[0] >= base]
+                if matches:
+                    if total + len(matches) > self.MAX_MATCHES:
+                        matches = matches[:self.MAX_MATCHES - total]
+                    total += len(matches)
+                    self._total = total
+                    self.matches_found.emit(generation, matches)
+                    if total >= self.MAX_MATCHES:
+                        break
+                time.sleep(0)
+            if generation == self._generation:
+                self.search_finished.emit(generation, total)
+        except Exception as e:
+            log.error(f"日志检索失败: {str(e)}")
+            self.search_failed.emit(generation, str(e))
+
+    @staticmethod
+    def _search_chunk(chunk: _IndexChunk, matcher, mode) -> list:
+        matches = []
+        haystack = chunk.text
+        if mode == SEARCH_IGNORE_CASE:
+            haystack = chunk.lowered()
+            if haystack is None:
+                # 这一块不能用小写文本定位，改用忽略大小写的正则直接在原文上匹配
+                matcher = re.compile(re.escape(matcher), re.IGNORECASE)
+        if isinstance(matcher, str):
+            size = len(matcher)
+            position = haystack.find(matcher)
+            while position != -1:
+                row, start, _ = chunk.locate(position)
+                matches.append((row, start, start + size))
+                position = haystack.find(matcher, position + size)
+        else:
+            for match in matcher.finditer(chunk.text):
+                if match.end() == match.start():
+                    continue
+                row, start, line_end = chunk.locate(match.start())
+                end = start + match.end() - match.start()
+                if end <= line_end:  # 丢弃跨行的匹配
+                    matches.append((row, start, end))
+        return matches
@@ -0,0 +1,125 @@
+# =================
+# 日志实时计数
+# Version: 1.0.0
+# =================
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+from PySide6.QtCore import QCoreApplication
+
+STATS_SUFFIX = '.stats.json'
+STATS_VERSION = 1
+
+
+def stats_path_for(log_file: str) -> str:
+    """会话日志对应的计数文件路径（与 .log 放在同一目录）"""
+    return log_file + STATS_SUFFIX
+
+
+def load_log_stats(log_file: str) -> Optional[dict]:
+    """读取历史会话的计数文件，无需扫描日志内容；不存在或损坏时返回 None"""
+    try:
+        with open(stats_path_for(log_file), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('version') != STATS_VERSION:
+        return None
+    return data
+
+
+class LogCounters:
+    """按级别和模块累计的日志条数
+
+    每条记录只做两次字典自增（O(1)），由 LogStatsHandler 的处理器锁保证线程安全。
+    有变化时由界面线程的调度器定时写出到会话日志旁的 .stats.json，退出时再写一次。
+    """
+
+    # 两次写盘之间的最短间隔（秒）
+    SAVE_INTERVAL = 5.0
+
+    def __init__(self, log_file: Optional[str] = None):
+        self.log_file = log_file
+        self.started = time.time()
+        self.levels: Dict[str, int] = {}
+        self.modules: Dict[str, int] = {}
+        self.total = 0
+        self._save_lock = threading.Lock()
+        self._job = None
+        self._dirty = False
+
+    def add(self, level: str, module: str) -> None:
+        levels = self.levels
+        levels[level] = levels.get(level, 0) + 1
+        modules = self.modules
+        modules[module] = modules.get(module, 0) + 1
+        self.total += 1
+        if not self._dirty and self.log_file:
+            self._dirty = True
+            self._schedule_save()
+
+    def level_count(self, level: str) -> int:
+        return self.levels.get(level, 0)
+
+    def snapshot(self) -> dict:
+        return {
+            'version': STATS_VERSION,
+            'log_file': os.path.basename(self.log_file) if self.log_file else None,
+            'started': self.started,
+            'updated': time.time(),
+            'total': self.total,
+            'levels': dict(self.levels),
+            'modules': dict(self.modules),
+        }
+
+    def _schedule_save(self) -> None:
+        # 由界面线程上的调度器定时写出，不为计数单独开线程；
+        # 还没有 QApplication（启动早期或非界面进程）时先不安排，下一条记录再试，退出时 close() 兜底
+        if QCoreApplication.instance() is None:
+            self._dirty = False
+            return
+        try:
+            from core.thread.scheduler import scheduler
+        except ImportError:
+            # 日志系统自身还在初始化（调度器依赖它），同样留给下一条记录
+            self._dirty = False
+            return
+        self._job = scheduler.call_later(self.SAVE_INTERVAL, self.save)
+
+    def save(self) -> bool:
+        """把当前计数写入计数文件（先写临时文件再替换，避免留下半截文件）"""
+        if not self.log_file:
+            return False
+        with self._save_lock:
+            self._dirty = False
+            path = stats_path_for(self.log_file)
+            temp_path = path + '.tmp'
+            try:
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.snapshot(), f, ensure_ascii=False)
+                os.replace(temp_path, path)
+                return True
+            except OSError:
+                # 写盘失败不影响计数，下一条记录会重新安排写出
+                return False
+
+    def close(self) -> None:
+        """取消待执行的定时写出并立即写盘"""
+        if self._job is not None:
+            self._job.cancel()
+            self._job = None
+        self.save()
+
+
+class LogStatsHandler(logging.Handler):
+    """把每条记录计入 LogCounters 的处理器，只做内存操作，始终留在调用线程"""
+
+    def __init__(self, counters: LogCounters):
+        super().__init__(logging.DEBUG)
+        self.counters = counters
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.counters.add(record.levelname, getattr(record, 'caller', record.filename))
@@ -0,0 +1,151 @@
+# =================
+# 日志文件增量读取
+# Version: 1.0.0
+# =================
+import os
+import re
+from datetime import datetime, timedelta
+from typing import List, Optional
+from core.log.log_buffer import LogEntry
+
+# [12:34:56] │ INFO     │ quick_start.py           :42   │ 消息
+# [12:34:56] │ INFO     │ font_manager.py          :42   │ <font_loader +12.3ms> 消息
+LINE_PATTERN = re.compile(
+    r'^\[(\d{2}):(\d{2}):(\d{2})\] │ (\w+)\s*│ (.*?)\s*:(\d+)\s*│ '
+    r'(?:<([^<>]+) \+(\d+(?:\.\d+)?)ms> )?(.*)$'
+)
+SESSION_PATTERN = re.compile(r'(\d{4}-\d{2}-\d{2})_(\d{2})-(\d{2})-(\d{2})')
+
+
+class LogLineParser:
+    """把日志文件中的文本行解析为 LogEntry
+
+    文件里只记录了时分秒，日期取自会话文件名（clutui_nextgen_<日期>_<时间>.log），
+    时间回绕时自动跨天。无法识别格式的行（如异常堆栈）并入上一条记录的级别和位置。
+    """
+
+    def __init__(self, path: Optional[str] = None, start_seq: int = 0):
+        self.seq = start_seq
+        self._day = self._session_day(path)
+        self._last_time = 0.0
+        self._last_level = 'INFO'
+        self._last_file = ''
+        self._last_line = 0
+        self._last_task = ''
+
+    @staticmethod
+    def _session_day(path: Optional[str]) -> datetime:
+        if path:
+            match = SESSION_PATTERN.search(os.path.basename(path))
+            if match:
+                return datetime.strptime(match.group(1), '%Y-%m-%d')
+            try:
+                return datetime.fromtimestamp(os.path.getmtime(path)).replace(
+                    hour=0, minute=0, second=0, microsecond=0)
+            except OSError:
+                pass
+        return datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def parse_line(self, line: str) -> Optional[LogEntry]:
+        line = line.rstrip('\r')
+        if not line.strip():
+            return None
+
+        self.seq += 1
+        match = LINE_PATTERN.match(line)
+        if match is None:
+            return LogEntry(self.seq, self._last_time, self._last_level,
+                            self._last_file, self._last_line, line, '', self._last_task)
+
+        hour, minute, second, level, file, lineno, task, elapsed, message = match.groups()
+        timestamp = (self._day + timedelta(hours=int(hour), minutes=int(minute),
+                                           seconds=int(second))).timestamp()
+        if timestamp < self._last_time - 3600:
+            # 跨过午夜
+            self._day += timedelta(days=1)
+            timestamp += 86400
+        self._last_time = timestamp
+        self._last_level = level
+        self._last_file = file
+        self._last_line = int(lineno)
+        self._last_task = task or ''
+        return LogEntry(self.seq, timestamp, level, file, self._last_line, message, '',
+                        self._last_task, '', float(elapsed) if elapsed else 0.0)
+
+    def parse_lines(self, lines) -> List[LogEntry]:
+        entries = []
+        for line in lines:
+            entry = self.parse_line(line)
+            if entry is not None:
+                entries.append(entry)
+        return entries
+
+
+class LogTailer:
+    """按字节偏移增量读取正在写入的日志文件
+
+    记住上次读到的偏移量和 inode，每次只读取新追加的字节并解析完整的行。
+    RotatingFileHandler 轮转时（当前文件被重命名为 .1，新建同名文件），
+    先从 .1 读完旧文件剩余部分，再从新文件开头继续。
+    每次轮询都重新打开文件，不长期占用句柄，避免在 Windows 上阻止轮转重命名。
+    """
+
+    def __init__(self, path: str, parser: Optional[LogLineParser] = None):
+        self.path = path
+        self.parser = parser or LogLineParser(path)
+        self._offset = 0
+        self._inode = None
+        self._pending = b''
+
+    @property
+    def offset(self) -> int:
+        return self._offset
+
+    def poll(self) -> List[LogEntry]:
+        """读取自上次调用以来新增的记录"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return []
+
+        entries = []
+        if self._inode is not None and (stat.st_ino != self._inode or stat.st_size < self._offset):
+            entries.extend(self._drain_rotated())
+            self._offset = 0
+            self._pending = b''
+        self._inode = stat.st_ino
+
+        if stat.st_size > self._offset:
+            entries.extend(self._read_from(self.path, self._offset, stat.st_size))
+            self._offset = stat.st_size
+        return entries
+
+    def _drain_rotated(self) -> List[LogEntry]:
+        rotated = f"{self.path}.1"
+        try:
+            stat = os.stat(rotated)
+        except OSError:
+            return []
+        if stat.st_ino != self._inode:
+            return []
+        entries = []
+        if stat.st_size > self._offset:
+            entries = self._read_from(rotated, self._offset, stat.st_size)
+        if self._pending:
+            # 旧文件最后一行没有换行符，也视为完整的一行
+            entries.extend(self.parser.parse_lines([self._pending.decode('utf-8', errors='replace')]))
+            self._pending = b''
+        return entries
+
+    def _read_from(self, path: str, start: int, end: int) -> List[LogEntry]:
+        with open(path, 'rb') as f:
+            f.seek(start)
+            data = self._pending + f.read(end - start)
+
+        cut = data.rfind(b'\n')
+        if cut < 0:
+            self._pending = data
+            return []
+        self._pending = data[cut + 1:]
+        text = data[:cut].decode('utf-8', errors='replace')
+        return self.parser.parse_lines(text.split('\n'))
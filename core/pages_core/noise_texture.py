@@ -0,0 +1,24 @@
+'''
+亚克力效果的噪声纹理像素
+
+在进程池里执行，只依赖标准库，不导入 Qt
+'''
+import random
+
+
+def generate_noise_pixels(width: int = 200, height: int = 200, opacity: float = 0.05,
+                          density: float = 0.3, seed=None):
+    """生成噪声纹理的像素数据
+
+    Returns:
+        (width, height, pixels)，pixels 为 QImage.Format_ARGB32 的像素字节（按 B, G, R, A 排列）
+    """
+    rng = random.Random(seed)
+    alpha = int(opacity * 255)
+    pixels = bytearray(width * height * 4)
+    for offset in range(0, len(pixels), 4):
+        # 按噪点密度随机点亮，灰度在 200-255 之间，其余像素保持透明
+        if rng.random() < density:
+            gray = rng.randint(200, 255)
+            pixels[offset:offset + 4] = bytes((gray, gray, gray, alpha))
+    return width, height, pixels
@@ -9,6 +9,10 @@ import platform
 import os
 import random
 import numpy as np
+from core.log.log_manager import log
+from core.thread.thread_manager import thread_manager
+from core.thread.process_pool import LANE_PROCESS, SharedBuffer
+from core.pages_core.noise_texture import generate_noise_pixels
 
 class PagesEffect:
     # 常量定义
@@ -62,41 +66,57 @@ class PagesEffect:
             return False
     
     @staticmethod
-    def _generate_noise_texture(width=200, height=200, opacity=0.05):
+    def _generate_noise_texture(width=200, height=200, opacity=0.05, on_ready=None):
         """生成噪声纹理图
         
-        创建一个带有随机噪点的透明纹理图，用于增强亚克力效果
+        创建一个带有随机噪点的透明纹理图，用于增强亚克力效果。
+        像素在进程池里生成，通过共享内存取回，不占用界面线程
         
         Args:
             width: 纹理宽度
             height: 纹理高度
             opacity: 噪点不透明度 (0.0-1.0)
+            on_ready: 纹理生成后在界面线程上调用 on_ready(pixmap)
             
         Returns:
-            QPixmap: 生成的噪声纹理
+            QPixmap: 已缓存的噪声纹理，还在生成时返回 None
         """
         # 如果已经有缓存的纹理，直接返回
         if PagesEffect._noise_texture is not None:
             return PagesEffect._noise_texture
-            
-        # 创建透明图像
-        image = QImage(width, height, QImage.Format_ARGB32)
-        image.fill(Qt.transparent)
-        
-        # 获取图像数据
-        for y in range(height):
-            for x in range(width):
-                # 生成随机噪点
-                if random.random() < 0.3:  # 噪点密度
-                    # 随机灰度值
-                    gray = random.randint(200, 255)
-                    # 设置像素颜色 (ARGB格式)
-                    alpha = int(opacity * 255)
-                    image.setPixelColor(x, y, QColor(gray, gray, gray, alpha))
-        
-        # 转换为QPixmap并缓存
-        PagesEffect._noise_texture = QPixmap.fromImage(image)
-        return PagesEffect._noise_texture
+        
+        def on_pixels(result):
+            w, h, pixels = result
+            if PagesEffect._noise_texture is None:
+                PagesEffect._noise_texture = PagesEffect._pixmap_from_pixels(w, h, pixels)
+            if on_ready:
+                on_ready(PagesEffect._noise_texture)
+        
+        def on_error(error):
+            # 进程池不可用时在当前线程生成
+            log.warning(f"进程池生成噪声纹理失败，改为直接生成: {str(error)}")
+            on_pixels(generate_noise_pixels(width, height, opacity))
+        
+        # 纹理生成前的重复调用共用同一个进程任务，结果只转成一次 QPixmap
+        thread_manager.submit_once(f"noise_texture_{width}x{height}_{opacity}", generate_noise_pixels,
+                                   width, height, opacity,
+                                   lane=LANE_PROCESS).on_done(on_pixels).on_error(on_error)
+        return None
+    
+    @staticmethod
+    def _pixmap_from_pixels(width, height, pixels):
+        """由 ARGB32 像素数据创建 QPixmap，pixels 为 SharedBuffer 时用完即释放共享内存"""
+        if isinstance(pixels, SharedBuffer):
+            view = pixels.buffer
+            try:
+                # copy() 让图像拥有自己的数据，之后才能释放共享内存
+                image = QImage(view, width, height, QImage.Format_ARGB32).copy()
+            finally:
+                view.release()
+                pixels.release()
+        else:
+            image = QImage(bytes(pixels), width, height, QImage.Format_ARGB32).copy()
+        return QPixmap.fromImage(image)
     
     @staticmethod
     def apply_mica_effect(widget: QWidget):
@@ -446,11 +466,12 @@ class PagesEffect:
         # 设置窗口背景透明
         widget.setAttribute(Qt.WA_TranslucentBackground)
         
-        # 生成噪声纹理
-        noise_texture = PagesEffect._generate_noise_texture()
-        
         # 获取主窗口部件
         main_widget = PagesEffect._get_main_widget(widget)
+        
+        # 生成噪声纹理，生成完成后重绘
+        if main_widget:
+            PagesEffect._generate_noise_texture(on_ready=lambda _: main_widget.update())
         if main_widget:
             # 移除之前的效果
             main_widget.setGraphicsEffect(None)
@@ -467,6 +488,9 @@ class PagesEffect:
                 QWidget.paintEvent(main_widget, event)
                 
                 # 在原始绘制之上叠加噪声纹理
+                noise_texture = PagesEffect._noise_texture
+                if noise_texture is None:
+                    return
                 painter = QPainter(main_widget)
                 painter.setOpacity(0.03)  # 设置噪声纹理的透明度
                 
@@ -1,20 +1,27 @@
+import importlib
 from PySide6.QtWidgets import QStackedWidget, QPushButton, QVBoxLayout, QWidget, QHBoxLayout, QLabel
-from PySide6.QtCore import Qt, QEasingCurve, QObject
+from PySide6.QtCore import Qt, QEasingCurve, QObject, QEvent
 from PySide6.QtGui import QFont, QFontDatabase
-from pages.quick_start import QuickStartPage
-from pages.about_page import AboutPage
-from pages.log_page import LogPage
 from core.animations.animation_manager import AnimationManager
 from core.log.log_manager import log
 from core.font.font_manager import FontManager
 from core.font.font_pages_manager import FontPagesManager
 from core.animations.animation_pagemanager import PageAnimationManager
-from pages.example_page import ExamplePage
-from pages.settings_pages import SettingsPage
-from pages.expandable_example import ExpandableExamplePage
 from core.i18n import i18n
+from core.thread.frame_queue import frame_queue, PRIORITY_HIGH
 
 class PagesManager(QObject):
+    # 页面注册表：页面名、属性名、模块和类名，顺序决定切换动画的方向
+    # 页面模块在页面第一次创建时才导入
+    PAGE_REGISTRY = [
+        ("quick_start", "quick_start_page", "pages.quick_start", "QuickStartPage"),
+        ("example", "example_page", "pages.example_page", "ExamplePage"),
+        ("expandable", "expandable_example_page", "pages.expandable_example", "ExpandableExamplePage"),
+        ("log", "log_page", "pages.log_page", "LogPage"),
+        ("about", "about_page", "pages.about_page", "AboutPage"),
+        ("settings", "settings_page", "pages.settings_pages", "SettingsPage"),
+    ]
+    
     def __init__(self):
         super().__init__()
         # 基础组件初始化
@@ -31,13 +38,15 @@ class PagesManager(QObject):
         self.font_manager = FontManager()
         self.font_pages_manager = FontPagesManager()
         
-        # 创建页面实例
-        self.quick_start_page = QuickStartPage()
-        self.about_page = AboutPage()
-        self.log_page = LogPage()
-        self.example_page = ExamplePage()
-        self.settings_page = SettingsPage()
-        self.expandable_example_page = ExpandableExamplePage()
+        # 页面工厂：默认页面直接创建，其余页面先放占位控件，第一次切换到时才创建，
+        # 鼠标悬停在侧边栏按钮上时提前在下一轮事件循环里创建
+        self._factories = {}
+        self._attrs = {}
+        self._placeholders = {}
+        self._prefetch = {}
+        for name, attr, module, class_name in self.PAGE_REGISTRY:
+            self.register_page(name, self._import_factory(module, class_name), attr)
+        self._build_page("quick_start")
         
         # 初始化侧边栏
         self.sidebar = QWidget()
@@ -70,20 +79,6 @@ class PagesManager(QObject):
         self.sidebar_layout.addWidget(self.buttons["about"])
         self.sidebar_layout.addWidget(self.buttons["settings"])
         
-        # 添加页面映射
-        self.pages = {
-            "quick_start": self.quick_start_page,
-            "example": self.example_page,
-            "expandable": self.expandable_example_page,
-            "log": self.log_page,
-            "about": self.about_page,
-            "settings": self.settings_page
-        }
-        
-        # 将页面添加到堆叠窗口
-        for page in self.pages.values():
-            self.stacked_widget.addWidget(page)
-        
         # 设置默认页面
         self.buttons["quick_start"].setChecked(True)
         self.stacked_widget.setCurrentWidget(self.quick_start_page)
@@ -93,7 +88,77 @@ class PagesManager(QObject):
         # 连接语言变更信号
         i18n.language_changed.connect(self.update_all_pages_text)
         
-        log.info(i18n.get_text("init_page_manager"))
+        log.info(lambda: i18n.get_text("init_page_manager"))
+    
+    @staticmethod
+    def _import_factory(module, class_name):
+        def factory():
+            return getattr(importlib.import_module(module), class_name)()
+        return factory
+    
+    def register_page(self, name, factory, attr=None):
+        """注册页面工厂，页面在第一次切换到时才创建，之前堆叠窗口里是一个占位控件"""
+        if name in self._factories or name in self.pages:
+            log.warning(lambda: i18n.get_text("page_exists").format(name))
+            return
+        self._factories[name] = factory
+        if attr:
+            self._attrs[name] = attr
+            setattr(self, attr, None)
+        placeholder = QWidget()
+        placeholder.setObjectName(f"placeholder_{name}")
+        self._placeholders[name] = placeholder
+        self.stacked_widget.addWidget(placeholder)
+    
+    def _build_page(self, name):
+        """创建页面并替换占位控件，已创建的直接返回"""
+        if name in self.pages:
+            return self.pages[name]
+        factory = self._factories.pop(name, None)
+        if factory is None:
+            return None
+        job = self._prefetch.pop(name, None)
+        if job is not None:
+            job.cancel()
+        try:
+            page = factory()
+        except Exception as e:
+            # 放回工厂，占位控件保留，下次切换或预创建时重试
+            self._factories[name] = factory
+            log.exception(f"创建页面 {name} 失败: {str(e)}")
+            return None
+        placeholder = self._placeholders.pop(name)
+        index = self.stacked_widget.indexOf(placeholder)
+        self.stacked_widget.insertWidget(index, page)
+        self.stacked_widget.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.pages[name] = page
+        if name in self._attrs:
+            setattr(self, self._attrs[name], page)
+        log.debug("页面 %s 已创建", name)
+        return page
+    
+    def prefetch_page(self, name):
+        """在下一轮事件循环里创建页面，不阻塞当前事件"""
+        if name in self._factories and name not in self._prefetch:
+            self._prefetch[name] = frame_queue.post(
+                lambda: self._build_page(name), PRIORITY_HIGH, owner=self
+            )
+    
+    def cancel_pending_pages(self):
+        """取消还没执行的预创建，关闭窗口时调用"""
+        for job in self._prefetch.values():
+            job.cancel()
+        self._prefetch.clear()
+        self._factories.clear()
+    
+    def eventFilter(self, watched, event):
+        # 鼠标移到侧边栏按钮上时预创建对应页面，点击时通常已经建好
+        if event.type() == QEvent.Enter:
+            name = watched.property("page_name")
+            if name:
+                self.prefetch_page(name)
+        return False
     
     def create_sidebar_button(self, key, icon_name, text):
         btn = QPushButton()
@@ -139,6 +204,8 @@ class PagesManager(QObject):
         btn.setMinimumHeight(40)  # 改为最小高度而不是固定高度
         btn.setCheckable(True)
         btn.clicked.connect(lambda: self.switch_page(key))
+        btn.setProperty("page_name", key)
+        btn.installEventFilter(self)
         
         # 设置布局
         btn.setLayout(layout)
@@ -184,20 +251,20 @@ class PagesManager(QObject):
         
     def add_page(self, name, page, button):
         if name in self.pages:
-            log.warning(i18n.get_text("page_exists", name))
+            log.warning(lambda: i18n.get_text("page_exists").format(name))
             
         self.stacked_widget.addWidget(page)
         self.pages[name] = page
         self.buttons[name] = button
-        log.info(i18n.get_text("add_page", name))
+        log.info(lambda: i18n.get_text("add_page").format(name))
         
     def switch_page(self, name):
-        if name not in self.pages:
-            log.error(i18n.get_text("page_not_exists", name))
+        if name not in self.pages and self._build_page(name) is None:
+            log.error(lambda: i18n.get_text("page_not_exists").format(name))
             return
         
         if name == self.current_page:
-            log.debug(i18n.get_text("already_on_page", name))
+            log.debug(lambda: i18n.get_text("already_on_page").format(name))
             self.buttons[name].setChecked(True)
             return
             
@@ -211,7 +278,7 @@ class PagesManager(QObject):
         # 创建按钮点击动画
         self.page_animation_manager.create_button_click_animation(self.buttons[name])
         
-        log.info(i18n.get_text("switch_to_page", name))
+        log.info(lambda: i18n.get_text("switch_to_page").format(name))
         
         # 取消其他按钮的选中状态
         for btn in self.buttons.values():
@@ -225,8 +292,10 @@ class PagesManager(QObject):
         next_page = self.pages[name]
         
         # 根据页面索引决定动画方向
-        current_index = list(self.pages.keys()).index(self.current_page)
-        next_index = list(self.pages.keys()).index(name)
+        order = [page_name for page_name, _, _, _ in self.PAGE_REGISTRY]
+        order += [page_name for page_name in self.pages if page_name not in order]
+        current_index = order.index(self.current_page)
+        next_index = order.index(name)
         
         # 优化动画方向判断
         if current_index < next_index:
@@ -250,7 +319,7 @@ class PagesManager(QObject):
         )
         
         self.current_page = name
-        log.info(i18n.get_text("page_switch_complete", name))
+        log.info(lambda: i18n.get_text("page_switch_complete").format(name))
     
     def get_stacked_widget(self):
         return self.stacked_widget
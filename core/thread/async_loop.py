@@ -0,0 +1,186 @@
+# =================
+# asyncio 事件循环
+# Version: 1.0.0
+# =================
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import Future, InvalidStateError
+from typing import Coroutine, Optional
+from PySide6.QtCore import QCoreApplication
+from core.log.log_manager import log
+
+try:
+    from PySide6.QtAsyncio import QAsyncioEventLoop
+except ImportError:  # PySide6 < 6.6 没有 QtAsyncio
+    QAsyncioEventLoop = None
+
+
+class AsyncLoop:
+    """把 asyncio 接入 Qt 主循环
+
+    有 QtAsyncio 时（mode == 'qt'），asyncio 的回调和定时器直接由 Qt 事件循环驱动，
+    协程运行在界面线程上，可以直接操作控件，await 期间界面照常响应，不占用任何线程；
+    此时主程序要用 run(app) 代替 app.exec()，否则协程里的 await 拿不到正在运行的事件循环。
+
+    没有 QtAsyncio 时（mode == 'thread'）退回到一个独立线程上的 asyncio 事件循环，
+    所有协程共用这一个线程，协程内不能直接操作控件，结果仍通过 QtFuture 回到界面线程。
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super(AsyncLoop, cls).__new__(cls)
+            return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, 'initialized'):
+            self.loop: Optional[asyncio.AbstractEventLoop] = None
+            self.mode: Optional[str] = None
+            self._thread: Optional[threading.Thread] = None
+            self.initialized = True
+
+    def install(self) -> asyncio.AbstractEventLoop:
+        """创建事件循环；在 QApplication 创建之后、界面线程上调用，重复调用直接返回"""
+        with self._lock:
+            if self.loop is not None:
+                return self.loop
+            app = QCoreApplication.instance()
+            if (QAsyncioEventLoop is not None and app is not None
+                    and threading.current_thread() is threading.main_thread()):
+                # 应用何时退出由窗口决定，asyncio 停止时不连带退出 Qt
+                self.loop = QAsyncioEventLoop(app, quit_qapp=False)
+                asyncio.set_event_loop(self.loop)
+                self.mode = 'qt'
+            else:
+                self.loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._run_thread_loop,
+                                                name="ClutAsyncLoop", daemon=True)
+                self._thread.start()
+                self.mode = 'thread'
+            self.loop.set_exception_handler(self._handle_exception)
+            log.info(f"asyncio 事件循环已启动（{self.mode}）")
+            return self.loop
+
+    def _run_thread_loop(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def run(self, app) -> int:
+        """代替 app.exec() 运行主循环，返回退出码"""
+        loop = self.install()
+        if self.mode != 'qt':
+            return app.exec()
+        # 与 QAsyncioEventLoop.run_forever() 相同，只是保留 exec() 的退出码
+        asyncio.events._set_running_loop(loop)
+        try:
+            return app.exec()
+        finally:
+            asyncio.events._set_running_loop(None)
+
+    def submit(self, coro: Coroutine) -> Future:
+        """把协程调度到事件循环上，可在任意线程调用；取消返回的 Future 会取消协程
+
+        每个协程在调用方上下文的副本中运行（QtAsyncio 的任务默认共用同一个上下文，
+        协程里设置的 contextvars 会互相串），结果和异常转交给返回的 Future。
+        """
+        loop = self.install()
+        future = Future()
+        context = contextvars.copy_context()
+
+        def start():
+            if future.cancelled():
+                coro.close()
+                return
+            if self.mode == 'qt':
+                # QtAsyncio 在 await 的 Future 完成后唤醒任务时不带任务的上下文，
+                # 由包装器在每一步进入上下文，任务创建时不再传 context（不能重复进入）
+                task = loop.create_task(_ContextCoroutine(coro, context))
+            else:
+                task = loop.create_task(coro, context=context)
+            task.add_done_callback(lambda done: _copy_task_outcome(done, future))
+            future.add_done_callback(
+                lambda f: f.cancelled() and not task.done() and loop.call_soon_threadsafe(task.cancel)
+            )
+
+        loop.call_soon_threadsafe(start)
+        return future
+
+    @staticmethod
+    def _handle_exception(context: dict) -> None:
+        # 协程的异常已经交给对应的 Future 处理，这里只记录没有 Future 接收的错误
+        if context.get('task') is not None or context.get('future') is not None:
+            return
+        error = context.get('exception')
+        log.error(f"asyncio 事件循环异常: {context.get('message')}"
+                  + (f" ({error!r})" if error is not None else ""))
+
+    def close(self) -> None:
+        """取消还在运行的协程并关闭事件循环"""
+        with self._lock:
+            loop, self.loop = self.loop, None
+        if loop is None:
+            return
+        if self.mode == 'thread':
+            def stop():
+                for task in asyncio.all_tasks(loop):
+                    task.cancel()
+                loop.stop()
+            loop.call_soon_threadsafe(stop)
+            self._thread.join(timeout=2)
+            if not loop.is_running():
+                loop.close()
+        else:
+            for task in asyncio.all_tasks(loop):
+                task.cancel()
+        self.mode = None
+
+
+class _ContextCoroutine:
+    """每次推进协程时都在指定的上下文中执行"""
+
+    __slots__ = ('_coro', '_context')
+
+    def __init__(self, coro: Coroutine, context: contextvars.Context):
+        self._coro = coro
+        self._context = context
+
+    def send(self, value):
+        return self._context.run(self._coro.send, value)
+
+    def throw(self, *args):
+        return self._context.run(self._coro.throw, *args)
+
+    def close(self):
+        return self._coro.close()
+
+    def __await__(self):
+        return self
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.send(None)
+
+
+def _copy_task_outcome(task: asyncio.Future, future: Future) -> None:
+    if task.cancelled():
+        future.cancel()
+        return
+    try:
+        error = task.exception()
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(task.result())
+    except InvalidStateError:
+        # Future 已在其他线程被取消
+        pass
+
+
+# 全局实例
+async_loop = AsyncLoop()
@@ -0,0 +1,341 @@
+# =================
+# 弹性线程池
+# Version: 1.0.0
+# =================
+import itertools
+from bisect import bisect_left
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future
+from typing import Callable, Optional
+
+
+# 任务通道：界面相关的短任务走 interactive，后台批量/重试类任务走 background
+LANE_INTERACTIVE = 'interactive'
+LANE_NORMAL = 'normal'
+LANE_BACKGROUND = 'background'
+LANES = (LANE_INTERACTIVE, LANE_NORMAL, LANE_BACKGROUND)
+_LANE_RANK = {lane: rank for rank, lane in enumerate(LANES)}
+# CPU 密集任务的进程池通道，由 ThreadManager 转交给进程池，不进线程池
+LANE_PROCESS = 'process'
+
+# 排队等待时间直方图的桶上限（毫秒），最后一个桶收集超过 5 秒的
+WAIT_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class _WorkItem:
+    __slots__ = ('future', 'fn', 'args', 'kwargs', 'lane', 'enqueue_time')
+
+    def __init__(self, future: Future, fn: Callable, args, kwargs, lane: str):
+        self.future = future
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.lane = lane
+        self.enqueue_time = time.perf_counter()
+
+    def run(self) -> None:
+        if not self.future.set_running_or_notify_cancel():
+            return
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except BaseException as e:
+            self.future.set_exception(e)
+            self = None  # 断开异常与栈帧的引用环
+        else:
+            self.future.set_result(result)
+
+
+class _LaneStats:
+    """单个通道的排队等待统计"""
+
+    __slots__ = ('histogram', 'waits', 'running', 'completed')
+
+    def __init__(self, window: int):
+        self.histogram = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.waits = deque(maxlen=window)
+        self.running = 0
+        self.completed = 0
+
+    def add_wait(self, wait: float) -> None:
+        self.waits.append(wait)
+        self.histogram[bisect_left(WAIT_BUCKETS_MS, wait * 1000)] += 1
+
+
+class ElasticThreadPool(Executor):
+    """可原地伸缩、带优先级通道的线程池
+
+    与 ThreadPoolExecutor 的区别：
+    - 线程上限可随时调整，不需要重建执行器，已排队和正在执行的任务不受影响；
+    - 空闲超过 idle_timeout 秒的线程自动退出，保留 min_workers 个常驻线程；
+    - 按排队深度和排队等待时间自动扩容：任务出队时若已等待超过 wait_target，
+      且队列里仍有积压，就把上限提高一档（不超过 max_limit）；
+      队列空闲后由 autoscale() 把上限逐步收回到 base_workers。
+    - 任务分 interactive / normal / background 三个通道，空闲线程优先取高优先级通道；
+      background 同时占用的线程数不超过上限的 background_share，其余线程始终留给前两个通道；
+      每排队 aging 秒相当于提升一个优先级，低优先级任务不会被一直饿着。
+
+    Args:
+        base_workers: 正常负载下的线程上限
+        min_workers: 常驻线程数，空闲也不退出
+        max_limit: 自动扩容能达到的最大线程数
+        idle_timeout: 多余线程的空闲退出时间（秒）
+        wait_target: 排队等待时间目标（秒），超过即视为线程不足
+        background_share: background 通道最多占用的线程比例
+        aging: 排队多少秒提升一个优先级
+        on_grow: 自动扩容后在工作线程上调用（不持有锁），可用来安排之后的 autoscale()
+    """
+
+    # 最近出队任务的排队等待时间样本数
+    WAIT_WINDOW = 256
+
+    def __init__(self, base_workers: int = 8, min_workers: int = 1, max_limit: int = 64,
+                 idle_timeout: float = 60.0, wait_target: float = 0.05,
+                 background_share: float = 0.75, aging: float = 0.5,
+                 thread_name_prefix: str = "ClutWorker",
+                 on_grow: Optional[Callable[[], None]] = None):
+        self.base_workers = max(1, base_workers)
+        self.min_workers = max(0, min(min_workers, self.base_workers))
+        self.max_limit = max(self.base_workers, max_limit)
+        self.idle_timeout = idle_timeout
+        self.wait_target = wait_target
+        self.background_share = background_share
+        self.aging = aging
+        self.thread_name_prefix = thread_name_prefix
+        self.on_grow = on_grow
+
+        self._max_workers = self.base_workers
+        self._queues = {lane: deque() for lane in LANES}
+        self._queued = 0
+        self._lanes = {lane: _LaneStats(self.WAIT_WINDOW) for lane in LANES}
+        self._cond = threading.Condition(threading.Lock())
+        self._workers = set()
+        self._idle = 0
+        self._starting = 0     # 已创建但还没开始取任务的线程
+        self._last_grow = 0.0
+        self._shutdown = False
+        self._counter = itertools.count()
+        self._waits = deque(maxlen=self.WAIT_WINDOW)
+        self._completed = 0
+        self._spawned = 0
+        self._retired = 0
+
+    # ---------- Executor 接口 ----------
+
+    def submit(self, fn: Callable, /, *args, **kwargs) -> Future:
+        return self.submit_to(LANE_NORMAL, fn, *args, **kwargs)
+
+    def submit_to(self, lane: str, fn: Callable, /, *args, **kwargs) -> Future:
+        """提交到指定通道"""
+        if lane not in self._queues:
+            raise ValueError(f"未知的任务通道: {lane}")
+        future = Future()
+        item = _WorkItem(future, fn, args, kwargs, lane)
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("线程池已关闭，无法提交任务")
+            self._queues[lane].append(item)
+            self._queued += 1
+            # 空闲线程不够接手积压的任务时才新建线程
+            if (self._idle + self._starting < self._runnable()
+                    and len(self._workers) < self._max_workers):
+                self._spawn()
+            else:
+                self._cond.notify()
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        with self._cond:
+            self._shutdown = True
+            if cancel_futures:
+                for queue in self._queues.values():
+                    while queue:
+                        queue.popleft().future.cancel()
+                self._queued = 0
+            workers = list(self._workers)
+            self._cond.notify_all()
+        if wait:
+            current = threading.current_thread()
+            for worker in workers:
+                if worker is not current:
+                    worker.join()
+
+    # ---------- 伸缩 ----------
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def set_max_workers(self, count: int) -> None:
+        """原地调整线程上限：扩大时立即补线程处理积压，缩小时多余线程在手头任务完成后退出"""
+        count = max(1, min(count, self.max_limit))
+        with self._cond:
+            self._max_workers = count
+            self._spawn_for_backlog()
+            self._cond.notify_all()
+
+    def autoscale(self) -> Optional[int]:
+        """按排队情况调整上限，返回新的上限；没有变化时返回 None
+
+        由外部周期调用；扩容在任务出队时已经即时发生，这里主要负责空闲后的收缩。
+        """
+        with self._cond:
+            current = self._max_workers
+            backlog = self._queued
+            waits = sorted(self._waits)
+            p95 = waits[int(len(waits) * 0.95)] if waits else 0.0
+            if backlog and p95 > self.wait_target:
+                target = min(self.max_limit, current + max(1, current // 2))
+            elif (not backlog and current > self.base_workers
+                  and time.monotonic() - self._last_grow >= self.idle_timeout):
+                # 最近一个 idle_timeout 内扩容过的不收缩，避免突发负载间隙里反复创建线程
+                target = max(self.base_workers, current - max(1, (current - self.base_workers) // 2))
+                self._waits.clear()
+            else:
+                return None
+        if target == current:
+            return None
+        self.set_max_workers(target)
+        return target
+
+    def stats(self) -> dict:
+        with self._cond:
+            waits = sorted(self._waits)
+            return {
+                'workers': len(self._workers),
+                'idle': self._idle,
+                'max_workers': self._max_workers,
+                'queued': self._queued,
+                'completed': self._completed,
+                'spawned': self._spawned,
+                'retired': self._retired,
+                'wait_p50_ms': _percentile_ms(waits, 0.50),
+                'wait_p95_ms': _percentile_ms(waits, 0.95),
+                'lanes': {lane: self._lane_snapshot(lane) for lane in LANES},
+            }
+
+    def _lane_snapshot(self, lane: str) -> dict:
+        stats = self._lanes[lane]
+        waits = sorted(stats.waits)
+        return {
+            'queued': len(self._queues[lane]),
+            'running': stats.running,
+            'completed': stats.completed,
+            'wait_p50_ms': _percentile_ms(waits, 0.50),
+            'wait_p95_ms': _percentile_ms(waits, 0.95),
+            'wait_p99_ms': _percentile_ms(waits, 0.99),
+            # [(桶上限毫秒, 次数)]，最后一个桶上限为 None 表示超过 5 秒
+            'histogram': list(zip(WAIT_BUCKETS_MS + (None,), stats.histogram)),
+        }
+
+    # ---------- 工作线程 ----------
+
+    def _spawn(self) -> None:
+        # 调用方持有 self._cond
+        worker = threading.Thread(target=self._worker,
+                                  name=f"{self.thread_name_prefix}_{next(self._counter)}",
+                                  daemon=True)
+        self._workers.add(worker)
+        self._starting += 1
+        self._spawned += 1
+        worker.start()
+
+    def _spawn_for_backlog(self) -> None:
+        # 调用方持有 self._cond；按积压补足线程，空闲线程会先被唤醒接手
+        needed = self._runnable() - self._idle - self._starting
+        for _ in range(min(needed, self._max_workers - len(self._workers))):
+            self._spawn()
+
+    def _worker(self) -> None:
+        cond = self._cond
+        with cond:
+            self._starting -= 1
+        while True:
+            grown = False
+            with cond:
+                idle_since = time.monotonic()
+                while not self._runnable():
+                    # 只剩受限的 background 任务时由正在跑 background 的线程接着处理
+                    if ((self._shutdown and not self._queued)
+                            or self._should_retire(idle_since)):
+                        self._retire()
+                        return
+                    self._idle += 1
+                    cond.wait(self.idle_timeout)
+                    self._idle -= 1
+                if len(self._workers) > self._max_workers:
+                    # 上限被调低，多出来的线程让出任务后退出
+                    self._retire()
+                    cond.notify()
+                    return
+                item = self._pick()
+                wait = time.perf_counter() - item.enqueue_time
+                self._waits.append(wait)
+                lane_stats = self._lanes[item.lane]
+                lane_stats.add_wait(wait)
+                lane_stats.running += 1
+                # 排队太久且仍有积压：线程不够，提高上限并补线程；
+                # 每个 wait_target 周期最多翻一倍，给新线程消化积压的时间
+                if self._queued and wait > self.wait_target and self._max_workers < self.max_limit:
+                    now = time.monotonic()
+                    if now - self._last_grow >= self.wait_target:
+                        self._last_grow = now
+                        self._max_workers = min(self.max_limit,
+                                                self._max_workers * 2)
+                        grown = True
+                self._spawn_for_backlog()
+            if grown and self.on_grow is not None:
+                self.on_grow()
+            item.run()
+            with cond:
+                lane_stats.running -= 1
+                lane_stats.completed += 1
+                self._completed += 1
+                if self._shutdown and not self._queued:
+                    cond.notify_all()
+            del item
+
+    def _background_limit(self) -> int:
+        return max(1, int(self._max_workers * self.background_share))
+
+    def _runnable(self) -> int:
+        # 当前能被取走的任务数：background 超出占用上限的部分暂不计入
+        background = len(self._queues[LANE_BACKGROUND])
+        allowed = max(0, self._background_limit() - self._lanes[LANE_BACKGROUND].running)
+        return self._queued - background + min(background, allowed)
+
+    def _pick(self) -> _WorkItem:
+        # 调用方持有 self._cond 且 _runnable() > 0
+        # 比较各通道队首：优先级每级折算 aging 秒，排队越久越靠前
+        now = time.perf_counter()
+        best_lane = None
+        best_score = None
+        for lane, queue in self._queues.items():
+            if not queue:
+                continue
+            if (lane == LANE_BACKGROUND
+                    and self._lanes[lane].running >= self._background_limit()):
+                continue
+            score = _LANE_RANK[lane] * self.aging - (now - queue[0].enqueue_time)
+            if best_score is None or score < best_score:
+                best_lane, best_score = lane, score
+        self._queued -= 1
+        return self._queues[best_lane].popleft()
+
+    def _should_retire(self, idle_since: float) -> bool:
+        if len(self._workers) <= self.min_workers:
+            return False
+        if len(self._workers) > self._max_workers:
+            return True
+        return time.monotonic() - idle_since >= self.idle_timeout
+
+    def _retire(self) -> None:
+        self._workers.discard(threading.current_thread())
+        self._retired += 1
+
+
+def _percentile_ms(samples, p: float) -> float:
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(len(samples) * p))] * 1000
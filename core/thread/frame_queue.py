@@ -0,0 +1,287 @@
+# =================
+# 界面线程分帧任务队列
+# Version: 1.0.0
+# =================
+import heapq
+import itertools
+import time
+from typing import Callable, List, Optional
+from PySide6.QtCore import QObject, QTimer, QThread, QCoreApplication, Signal, Qt
+from core.log.log_manager import log
+
+# 每次事件循环迭代最多占用的时间（毫秒），用完即让出，输入和绘制事件得以及时处理
+FRAME_BUDGET_MS = 8.0
+
+# 优先级：数值越小越先执行，同一优先级按提交顺序
+PRIORITY_HIGH = 0     # 当前可见页面的内容
+PRIORITY_NORMAL = 1
+PRIORITY_IDLE = 2     # 还没显示的页面，预先构建
+
+
+class FrameJob:
+    """队列中的一个界面构建闭包，cancel() 后不再执行"""
+
+    __slots__ = ('fn', 'priority', 'seq', 'owner', 'batch', 'state', '__weakref__')
+
+    PENDING, DONE, CANCELLED = 0, 1, 2
+
+    def __init__(self, fn: Callable[[], None], priority: int, seq: int,
+                 owner: Optional[QObject], batch: Optional['FrameBatch']):
+        self.fn = fn
+        self.priority = priority
+        self.seq = seq
+        self.owner = owner
+        self.batch = batch
+        self.state = FrameJob.PENDING
+
+    def __lt__(self, other: 'FrameJob') -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+    def cancel(self) -> None:
+        if self.state == FrameJob.PENDING:
+            self.state = FrameJob.CANCELLED
+            if self.batch is not None:
+                self.batch._job_finished(self)
+
+
+class FrameBatch(QObject):
+    """同一批构建任务（通常是一个页面的内容），汇报进度
+
+    progress(已完成, 总数) 在每个任务完成后发出，finished 在当前所有任务都完成（或取消）后发出；
+    finished 之后仍可以继续 add，全部完成时会再次发出。
+    """
+
+    progress = Signal(int, int)
+    finished = Signal()
+
+    def __init__(self, queue: 'FrameQueue', name: str, priority: int, owner: Optional[QObject]):
+        super().__init__()
+        self.name = name
+        self.priority = priority
+        self.owner = owner
+        self._queue = queue
+        self._jobs: List[FrameJob] = []
+        self._done = 0
+
+    def add(self, fn: Callable[[], None], priority: Optional[int] = None) -> FrameJob:
+        """添加一个任务，priority 默认使用批次的优先级"""
+        job = self._queue._post(fn, self.priority if priority is None else priority, self.owner, self)
+        self._jobs.append(job)
+        return job
+
+    @property
+    def total(self) -> int:
+        return len(self._jobs)
+
+    @property
+    def done(self) -> int:
+        return self._done
+
+    def is_finished(self) -> bool:
+        return self._done >= len(self._jobs)
+
+    def flush(self) -> None:
+        """立即按顺序执行批次中剩下的任务，例如页面在构建完成前就被切换到了"""
+        for job in sorted(job for job in self._jobs if job.state == FrameJob.PENDING):
+            self._queue._execute(job)
+
+    def cancel(self) -> int:
+        """取消批次中还没执行的任务，返回取消的个数"""
+        pending = [job for job in self._jobs if job.state == FrameJob.PENDING]
+        for job in pending:
+            job.cancel()
+        return len(pending)
+
+    def _job_finished(self, job: FrameJob) -> None:
+        self._done += 1
+        self.progress.emit(self._done, len(self._jobs))
+        if self._done >= len(self._jobs):
+            log.debug("分帧任务批次 %s 完成: %d 个任务", self.name, len(self._jobs))
+            self.finished.emit()
+
+
+class FrameQueue(QObject):
+    """界面线程上按时间片执行的任务队列
+
+    页面把构建控件的工作拆成一个个小闭包提交进来，队列在每次事件循环迭代里按优先级执行，
+    累计超过 FRAME_BUDGET_MS 就让出，剩下的留到下一轮；窗口在构建期间仍然可以响应和重绘。
+    单个任务无法被打断，应拆到几毫秒以内；超出预算的任务会记录到调试日志。
+
+    指定 owner 时 owner 销毁后其任务自动取消。post / batch 可在任意线程调用，任务总在界面线程执行。
+    """
+
+    _add_requested = Signal(object)
+
+    def __init__(self, budget_ms: float = FRAME_BUDGET_MS):
+        super().__init__()
+        self.budget_ms = budget_ms
+        self._heap: List[FrameJob] = []
+        self._seq = itertools.count()
+        self._watched = set()
+        self._timer: Optional[QTimer] = None
+        self._executed = 0
+        self._slices = 0
+        self._overruns = 0
+        self._longest_slice = 0.0
+        self._longest_job = 0.0
+        app = QCoreApplication.instance()
+        if app is not None and self.thread() != app.thread():
+            self.moveToThread(app.thread())
+        self._add_requested.connect(self._add, Qt.QueuedConnection)
+
+    # ---------- 提交 ----------
+
+    def post(self, fn: Callable[[], None], priority: int = PRIORITY_NORMAL,
+             owner: Optional[QObject] = None) -> FrameJob:
+        """提交单个任务"""
+        return self._post(fn, priority, owner, None)
+
+    def batch(self, name: str, priority: int = PRIORITY_NORMAL,
+              owner: Optional[QObject] = None) -> FrameBatch:
+        """创建一个批次，用 add 提交任务，通过 progress / finished 信号跟踪进度"""
+        return FrameBatch(self, name, priority, owner)
+
+    def _post(self, fn, priority, owner, batch) -> FrameJob:
+        job = FrameJob(fn, priority, next(self._seq), owner, batch)
+        app = QCoreApplication.instance()
+        if app is not None and QThread.currentThread() != self.thread():
+            self._add_requested.emit(job)
+        else:
+            self._add(job)
+        return job
+
+    def _add(self, job: FrameJob) -> None:
+        if job.state != FrameJob.PENDING:
+            return
+        if job.owner is not None and job.owner not in self._watched:
+            self._watched.add(job.owner)
+            owner = job.owner
+            owner.destroyed.connect(lambda *_: self._on_owner_destroyed(owner))
+        heapq.heappush(self._heap, job)
+        if self._timer is None:
+            # 零间隔定时器：每次事件循环处理完其他事件后触发一次
+            self._timer = QTimer(self)
+            self._timer.setInterval(0)
+            self._timer.timeout.connect(self._run_slice)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    # ---------- 执行 ----------
+
+    def _run_slice(self) -> None:
+        started = time.perf_counter()
+        deadline = started + self.budget_ms / 1000
+        ran = 0
+        while self._heap:
+            job = heapq.heappop(self._heap)
+            if job.state != FrameJob.PENDING:
+                continue
+            self._execute(job)
+            ran += 1
+            if time.perf_counter() >= deadline:
+                break
+        if ran:
+            self._slices += 1
+            self._longest_slice = max(self._longest_slice, (time.perf_counter() - started) * 1000)
+        if not self._heap:
+            self._timer.stop()
+
+    def _execute(self, job: FrameJob) -> None:
+        # 已执行的任务留在堆里，轮到时直接丢弃
+        job.state = FrameJob.DONE
+        started = time.perf_counter()
+        try:
+            job.fn()
+        except Exception as e:
+            log.exception(f"分帧任务执行失败: {str(e)}")
+        elapsed = (time.perf_counter() - started) * 1000
+        self._executed += 1
+        self._longest_job = max(self._longest_job, elapsed)
+        if elapsed > self.budget_ms:
+            self._overruns += 1
+            log.debug("分帧任务超出预算: %.1fms (%s)", elapsed,
+                      job.batch.name if job.batch is not None else getattr(job.fn, '__qualname__', job.fn))
+        if job.batch is not None:
+            job.batch._job_finished(job)
+
+    def flush(self) -> None:
+        """立即执行队列中所有任务"""
+        while self._heap:
+            job = heapq.heappop(self._heap)
+            if job.state == FrameJob.PENDING:
+                self._execute(job)
+        if self._timer is not None:
+            self._timer.stop()
+
+    def _on_owner_destroyed(self, owner: QObject) -> None:
+        self._watched.discard(owner)
+        # owner 已经销毁，批次的进度没人关心，直接丢弃，不再发出信号
+        for job in self._heap:
+            if job.owner is owner and job.state == FrameJob.PENDING:
+                job.state = FrameJob.CANCELLED
+
+    # ---------- 统计 ----------
+
+    def stats(self) -> dict:
+        """排队数、已执行数、时间片数、最长时间片 / 最长单个任务（毫秒）和超出预算的任务数"""
+        return {
+            'pending': sum(1 for job in self._heap if job.state == FrameJob.PENDING),
+            'executed': self._executed,
+            'slices': self._slices,
+            'longest_slice_ms': round(self._longest_slice, 2),
+            'longest_job_ms': round(self._longest_job, 2),
+            'overruns': self._overruns,
+        }
+
+
+class StallMonitor(QObject):
+    """界面线程卡顿测量
+
+    以 interval_ms 的精确定时器作心跳，两次心跳之间超出预期的时间就是事件循环被阻塞的时长；
+    max_stall_ms 为测量期间最长的一次阻塞。只在需要时 start()，心跳本身会保持进程唤醒。
+    """
+
+    def __init__(self, interval_ms: int = 5):
+        super().__init__()
+        self.interval_ms = interval_ms
+        self._timer: Optional[QTimer] = None
+        self._last = 0.0
+        self.max_stall_ms = 0.0
+        self.stalls = 0
+        app = QCoreApplication.instance()
+        if app is not None and self.thread() != app.thread():
+            self.moveToThread(app.thread())
+
+    def start(self) -> None:
+        if self._timer is None:
+            self._timer = QTimer(self)
+            self._timer.setTimerType(Qt.PreciseTimer)
+            self._timer.timeout.connect(self._beat)
+        self._last = time.perf_counter()
+        self._timer.start(self.interval_ms)
+
+    def stop(self) -> None:
+        if self._timer is not None:
+            self._timer.stop()
+
+    def reset(self) -> None:
+        self._last = time.perf_counter()
+        self.max_stall_ms = 0.0
+        self.stalls = 0
+
+    def _beat(self) -> None:
+        now = time.perf_counter()
+        late = (now - self._last) * 1000 - self.interval_ms
+        self._last = now
+        if late > FRAME_BUDGET_MS:
+            # 超过一个时间片预算才算一次卡顿
+            self.stalls += 1
+        self.max_stall_ms = max(self.max_stall_ms, late)
+
+    def stats(self) -> dict:
+        return {'max_stall_ms': round(self.max_stall_ms, 2), 'stalls': self.stalls}
+
+
+# 全局实例
+frame_queue = FrameQueue()
+stall_monitor = StallMonitor()
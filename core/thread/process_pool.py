@@ -0,0 +1,213 @@
+# =================
+# 进程池任务通道
+# Version: 1.0.0
+# =================
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, InvalidStateError
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Any, Callable, Optional
+from core.log.log_manager import log
+from core.thread.elastic_pool import LANE_PROCESS
+from core.thread.process_worker import SharedBufferRef, ping, run_job
+
+
+class SharedBuffer:
+    """工作进程返回的大块字节数据，直接映射共享内存，不经过 pickle 复制
+
+    buffer 是映射到共享内存的 memoryview，可直接交给 QImage 等按地址读取数据的接口；
+    用完后调用 release() 释放共享内存，释放前要先丢掉由 buffer 派生出的视图。
+    """
+
+    def __init__(self, ref: SharedBufferRef):
+        self._shm = shared_memory.SharedMemory(name=ref.name)
+        self.size = ref.size
+
+    @property
+    def buffer(self) -> memoryview:
+        if self._shm is None:
+            raise ValueError("共享内存已释放")
+        return self._shm.buf[:self.size]
+
+    def tobytes(self) -> bytes:
+        return bytes(self.buffer)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def release(self) -> None:
+        shm, self._shm = self._shm, None
+        if shm is None:
+            return
+        try:
+            shm.close()
+        except BufferError:
+            # 还有视图在使用，交给视图释放后的垃圾回收
+            log.warning("共享内存仍被引用，延后释放")
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+    def __del__(self):
+        try:
+            self.release()
+        except Exception:
+            pass
+
+
+class ProcessLane:
+    """CPU 密集任务的进程池通道
+
+    任务在独立进程里执行，不和界面线程争抢 GIL。进程池在第一次提交或 warm() 时才创建，
+    进程按需启动；warm() 提前拉起 warm_workers 个进程，首个任务不用等进程启动。
+    任务函数和参数必须能被 pickle（模块级函数），结果里超过 64KB 的字节数据
+    （bytes / bytearray / memoryview / numpy 数组）通过共享内存返回，在主进程中变为 SharedBuffer。
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, warm_workers: int = 1):
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self.warm_workers = min(warm_workers, self.max_workers)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._completed = 0
+        self._shutdown = False
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        if self._shutdown:
+            raise RuntimeError("进程池已关闭")
+        if self._executor is None:
+            # 统一用 spawn：fork 会把界面线程和 Qt 状态一起复制到子进程
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                 mp_context=_SpawnContext())
+            log.info(f"进程池已创建，最大进程数: {self.max_workers}")
+        return self._executor
+
+    def warm(self) -> None:
+        """提前启动 warm_workers 个工作进程"""
+        with self._lock:
+            executor = self._ensure_executor()
+            for _ in range(self.warm_workers):
+                executor.submit(ping)
+
+    def submit(self, fn: Callable, /, *args, **kwargs) -> Future:
+        with self._lock:
+            executor = self._ensure_executor()
+            # 进程池在提交时按需启动进程
+            inner = executor.submit(run_job, fn, args, kwargs)
+            self._submitted += 1
+
+        future = Future()
+        future.start_time = future.end_time = None
+        future.add_done_callback(lambda f: f.cancelled() and inner.cancel())
+        inner.add_done_callback(lambda done: self._resolve(done, future))
+        return future
+
+    def _resolve(self, inner: Future, future: Future) -> None:
+        # 在进程池的结果线程上执行
+        with self._lock:
+            self._completed += 1
+        if inner.cancelled():
+            future.cancel()
+            return
+        try:
+            error = inner.exception()
+            if error is not None:
+                future.set_exception(error)
+                return
+            value, future.start_time, future.end_time = inner.result()
+            result = _import_shared(value)
+        except Exception as e:
+            try:
+                future.set_exception(e)
+            except InvalidStateError:
+                pass
+            return
+        try:
+            future.set_result(result)
+        except InvalidStateError:
+            # 已被取消，释放没人接收的共享内存
+            _release_shared(result)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'started': self._executor is not None,
+                'max_workers': self.max_workers,
+                'workers': len(self._executor._processes or {}) if self._executor is not None else 0,
+                'queued': self._submitted - self._completed,
+                'completed': self._completed,
+            }
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False, terminate: bool = False) -> None:
+        """关闭进程池；terminate 为 True 时直接终止还在执行任务的工作进程"""
+        with self._lock:
+            self._shutdown = True
+            executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        if terminate:
+            for process in list((executor._processes or {}).values()):
+                process.terminate()
+        executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+_main_lock = threading.Lock()
+
+
+@contextmanager
+def _skip_main_import():
+    """spawn 出的子进程默认会先导入主脚本，而主脚本会连带初始化日志、线程池和所有页面；
+    任务函数都在 core 包内，不需要主脚本，创建进程的那一刻暂时隐藏主模块的来源"""
+    with _main_lock:
+        main = sys.modules.get('__main__')
+        saved = {key: main.__dict__[key] for key in ('__file__', '__spec__')
+                 if main is not None and key in main.__dict__}
+        for key in saved:
+            if key == '__spec__':
+                main.__spec__ = None
+            else:
+                del main.__dict__[key]
+        try:
+            yield
+        finally:
+            if main is not None:
+                main.__dict__.update(saved)
+
+
+class _SpawnProcess(multiprocessing.context.SpawnProcess):
+    # 子进程的启动参数在 _Popen 里生成，只在这一步隐藏主模块，进程池的其他操作不受影响
+    @staticmethod
+    def _Popen(process_obj):
+        with _skip_main_import():
+            return multiprocessing.context.SpawnProcess._Popen(process_obj)
+
+
+class _SpawnContext(multiprocessing.context.SpawnContext):
+    Process = _SpawnProcess
+
+
+def _import_shared(value: Any) -> Any:
+    if isinstance(value, SharedBufferRef):
+        return SharedBuffer(value)
+    if isinstance(value, (tuple, list)):
+        items = [_import_shared(item) for item in value]
+        return type(value)(*items) if hasattr(value, '_fields') else type(value)(items)
+    if isinstance(value, dict):
+        return {key: _import_shared(item) for key, item in value.items()}
+    return value
+
+
+def _release_shared(value: Any) -> None:
+    if isinstance(value, SharedBuffer):
+        value.release()
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            _release_shared(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _release_shared(item)
@@ -0,0 +1,71 @@
+# =================
+# 进程池工作端
+# Version: 1.0.0
+# =================
+# 这个模块会在每个工作进程里导入，只能依赖标准库，
+# 不能导入日志、线程管理器等会在导入时初始化的模块
+import os
+import time
+from collections import deque
+from multiprocessing import shared_memory
+from typing import Any, NamedTuple
+
+# 超过这个大小的字节结果走共享内存，更小的直接 pickle 更快
+SHARED_MEMORY_THRESHOLD = 64 * 1024
+
+# 导出的共享内存在子进程里保留的秒数：Windows 上最后一个句柄关闭时共享内存即被销毁，
+# 要等主进程映射之后才能关闭
+EXPORT_HOLD_SECONDS = 10.0
+
+_exported = deque()
+
+
+class SharedBufferRef(NamedTuple):
+    """共享内存中一段字节数据的引用，代替数据本身在进程间传递"""
+    name: str
+    size: int
+
+
+def ping() -> int:
+    """预热用的空任务"""
+    return os.getpid()
+
+
+def run_job(fn, args, kwargs):
+    """在工作进程中执行任务，返回 (结果, 开始时间, 结束时间)，大块字节结果换成共享内存引用"""
+    _release_exported()
+    started = time.time()
+    value = fn(*args, **kwargs)
+    return _export(value), started, time.time()
+
+
+def _export(value: Any) -> Any:
+    if isinstance(value, (tuple, list)):
+        exported = [_export(item) for item in value]
+        # NamedTuple 等子类需要按位置参数重建
+        return type(value)(*exported) if hasattr(value, '_fields') else type(value)(exported)
+    if isinstance(value, dict):
+        return {key: _export(item) for key, item in value.items()}
+    if isinstance(value, (bytes, bytearray, memoryview)) or hasattr(value, '__array_interface__'):
+        view = memoryview(value)
+        if view.nbytes >= SHARED_MEMORY_THRESHOLD and view.contiguous:
+            return _to_shared_memory(view.cast('B'))
+    return value
+
+
+def _to_shared_memory(view: memoryview) -> SharedBufferRef:
+    size = view.nbytes
+    shm = shared_memory.SharedMemory(create=True, size=size)
+    shm.buf[:size] = view
+    if os.name == 'posix':
+        # 共享内存交给主进程释放，不让本进程的资源跟踪器在退出时删除
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, 'shared_memory')
+    _exported.append((time.monotonic(), shm))
+    return SharedBufferRef(shm.name, size)
+
+
+def _release_exported() -> None:
+    now = time.monotonic()
+    while _exported and now - _exported[0][0] > EXPORT_HOLD_SECONDS:
+        _exported.popleft()[1].close()
@@ -0,0 +1,202 @@
+# =================
+# 界面线程回调的 Future
+# Version: 1.0.0
+# =================
+import threading
+from concurrent.futures import Future, CancelledError
+from typing import Callable, Iterable, List, Optional
+from PySide6.QtCore import QObject, QThread, QCoreApplication, Signal, Qt
+from core.log.log_manager import log
+
+
+class QtFuture(QObject):
+    """包装 concurrent.futures.Future，回调统一在界面线程执行
+
+    任务在线程池完成后通过排队连接把结果送回界面线程，回调里可以直接操作控件，
+    不需要为每个功能单独写 QThread 或信号。
+
+    - on_done(fn): 成功时回调 fn(result)
+    - on_error(fn): 失败时回调 fn(exception)，取消也算失败（CancelledError）
+    - then(fn): 成功后在界面线程执行 fn(result)，返回以 fn 返回值完成的新 QtFuture；
+      fn 返回 Future/QtFuture 时等它完成，便于串联多个后台步骤；前一步失败时直接传递异常
+
+    同时保留 Future 的 result()/exception()/done()/cancel() 等接口，旧代码可以照常使用。
+    在界面线程上调用 result() 会阻塞界面，应改用回调。
+    """
+
+    _finished = Signal()
+    _invoke = Signal(object)
+
+    # 已提交但还没把结果送回界面线程的对象，防止中途被回收导致回调丢失
+    _pending = set()
+    _pending_lock = threading.Lock()
+
+    def __init__(self, future: Optional[Future] = None):
+        super().__init__()
+        self.future = future if future is not None else Future()
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        self._dispatched = False
+
+        app = QCoreApplication.instance()
+        self._direct = app is None
+        if not self._direct:
+            # 在工作线程上创建时（任务里再提交任务）挪到界面线程，回调才会在界面线程执行
+            if self.thread() != app.thread():
+                self.moveToThread(app.thread())
+            self._finished.connect(self._dispatch, Qt.QueuedConnection)
+            self._invoke.connect(self._run_callback, Qt.QueuedConnection)
+
+        with QtFuture._pending_lock:
+            QtFuture._pending.add(self)
+        self.future.add_done_callback(self._on_future_done)
+
+    # ---------- Future 接口 ----------
+
+    def result(self, timeout: Optional[float] = None):
+        return self.future.result(timeout)
+
+    def exception(self, timeout: Optional[float] = None):
+        return self.future.exception(timeout)
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def running(self) -> bool:
+        return self.future.running()
+
+    def cancel(self) -> bool:
+        return self.future.cancel()
+
+    def cancelled(self) -> bool:
+        return self.future.cancelled()
+
+    def add_done_callback(self, fn: Callable) -> None:
+        # 与 Future 一致：在完成任务的线程上回调，参数为底层 Future
+        self.future.add_done_callback(fn)
+
+    # ---------- 界面线程回调 ----------
+
+    def on_done(self, fn: Callable) -> "QtFuture":
+        def callback():
+            if not self.future.cancelled() and self.future.exception() is None:
+                fn(self.future.result())
+        self._add_callback(callback)
+        return self
+
+    def on_error(self, fn: Callable) -> "QtFuture":
+        def callback():
+            error = _error_of(self.future)
+            if error is not None:
+                fn(error)
+        self._add_callback(callback)
+        return self
+
+    def then(self, fn: Callable) -> "QtFuture":
+        chained = QtFuture()
+
+        def callback():
+            if chained.future.cancelled():
+                return
+            error = _error_of(self.future)
+            if error is not None:
+                chained.future.set_exception(error)
+                return
+            try:
+                value = fn(self.future.result())
+            except Exception as e:
+                chained.future.set_exception(e)
+                return
+            if isinstance(value, (Future, QtFuture)):
+                value.add_done_callback(lambda inner: _copy_outcome(inner, chained.future))
+            else:
+                chained.future.set_result(value)
+
+        self._add_callback(callback)
+        return chained
+
+    def _add_callback(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if not self._dispatched:
+                self._callbacks.append(callback)
+                return
+        # 已经完成：界面线程上直接执行，其他线程排队到界面线程
+        if self._direct or QThread.currentThread() == self.thread():
+            self._run_callback(callback)
+        else:
+            self._invoke.emit(callback)
+
+    def _on_future_done(self, _future: Future) -> None:
+        # 在完成任务的工作线程上执行
+        if self._direct:
+            self._dispatch()
+            return
+        try:
+            self._finished.emit()
+        except RuntimeError:
+            # 程序退出时 Qt 对象先被销毁，之后才完成（通常是 owner 销毁引起的取消），回调已无人接收
+            with QtFuture._pending_lock:
+                QtFuture._pending.discard(self)
+
+    def _dispatch(self) -> None:
+        with self._lock:
+            self._dispatched = True
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            self._run_callback(callback)
+        with QtFuture._pending_lock:
+            QtFuture._pending.discard(self)
+
+    def _run_callback(self, callback: Callable[[], None]) -> None:
+        try:
+            callback()
+        except Exception as e:
+            log.exception(f"任务回调执行失败: {str(e)}")
+
+
+def when_all(futures: Iterable) -> QtFuture:
+    """所有 future 都成功后，以按顺序排列的结果列表完成；任一失败则以该异常立即失败"""
+    futures = list(futures)
+    combined = QtFuture()
+    if not futures:
+        combined.future.set_result([])
+        return combined
+
+    results = [None] * len(futures)
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def make_callback(index):
+        def callback(future):
+            error = _error_of(future)
+            with lock:
+                if combined.future.done():
+                    return
+                if error is not None:
+                    combined.future.set_exception(error)
+                    return
+                results[index] = future.result()
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    combined.future.set_result(results)
+        return callback
+
+    for index, future in enumerate(futures):
+        future.add_done_callback(make_callback(index))
+    return combined
+
+
+def _error_of(future: Future) -> Optional[BaseException]:
+    if future.cancelled():
+        return CancelledError()
+    return future.exception()
+
+
+def _copy_outcome(source: Future, target: Future) -> None:
+    if target.done():
+        return
+    error = _error_of(source)
+    if error is not None:
+        target.set_exception(error)
+    else:
+        target.set_result(source.result())
@@ -0,0 +1,319 @@
+# =================
+# 定时任务调度器
+# Version: 1.0.0
+# =================
+import itertools
+import random
+import time
+from typing import Callable, List, Optional
+from PySide6.QtCore import QObject, QTimer, QEvent, QThread, QCoreApplication, Signal, Qt
+from PySide6.QtWidgets import QWidget
+from core.log.log_manager import log
+
+# 时间轮的最小刻度（毫秒）：落在同一刻度内的到期任务合并到一次唤醒中执行
+TICK_MS = 50
+# 每层 64 个槽，四层依次覆盖 3.2 秒、3.4 分钟、3.6 小时、9.7 天，更远的放在最后一层反复下沉
+_WHEEL_BITS = 6
+_WHEEL_SIZE = 1 << _WHEEL_BITS
+_WHEEL_MASK = _WHEEL_SIZE - 1
+_LEVELS = 4
+
+
+class ScheduledJob:
+    """调度器中的一个延时或周期任务，cancel() 后不再执行"""
+
+    __slots__ = ('job_id', 'callback', 'interval', 'jitter', 'owner', 'due_tick',
+                 'cancelled', 'paused', 'runs', '__weakref__')
+
+    def __init__(self, job_id: int, callback: Callable[[], None], interval: Optional[float],
+                 jitter: float, owner: Optional[QObject]):
+        self.job_id = job_id
+        self.callback = callback
+        self.interval = interval   # 周期任务的间隔（秒），延时任务为 None
+        self.jitter = jitter
+        self.owner = owner
+        self.due_tick = 0
+        self.cancelled = False
+        self.paused = False
+        self.runs = 0
+
+    def cancel(self) -> None:
+        self.cancelled = True
+        scheduler._forget(self)
+
+
+class Scheduler(QObject):
+    """界面线程上的分层时间轮调度器
+
+    所有延时 / 周期任务共用一个单次 QTimer，只在最近的到期刻度唤醒一次，没有任务时定时器停止；
+    同一刻度（TICK_MS）内到期的任务在同一次唤醒中执行，jitter 让周期任务错开，避免同时扎堆。
+
+    任务在界面线程上执行，可以直接操作控件；耗时的工作应在回调里另行提交到 thread_manager。
+    指定 owner 时：owner 销毁后任务自动取消；owner 是控件且到期时不可见（页面被切走、窗口隐藏），
+    任务暂停，控件再次显示时从显示时刻重新计时，隐藏页面的定时器不再唤醒进程。
+    call_later / call_every 可在任意线程调用。
+    """
+
+    _add_requested = Signal(object)
+
+    def __init__(self):
+        super().__init__()
+        self._wheels: List[List[List[ScheduledJob]]] = [
+            [[] for _ in range(_WHEEL_SIZE)] for _ in range(_LEVELS)
+        ]
+        self._origin = time.monotonic()
+        self._current = 0          # 已处理到的刻度
+        self._count = 0            # 时间轮中的任务数
+        self._paused = {}          # owner -> [暂停的任务]
+        self._watched = set()      # 已安装事件过滤器 / destroyed 连接的 owner
+        self._ids = itertools.count(1)
+        self._timer: Optional[QTimer] = None
+        self._armed_tick = 0
+        self._wakeups = 0
+        self._executed = 0
+        app = QCoreApplication.instance()
+        if app is not None and self.thread() != app.thread():
+            # 第一次在工作线程上导入时挪到界面线程，定时器和回调都在界面线程上
+            self.moveToThread(app.thread())
+        self._add_requested.connect(self._add, Qt.QueuedConnection)
+
+    # ---------- 提交 ----------
+
+    def call_later(self, delay: float, callback: Callable[[], None],
+                   owner: Optional[QObject] = None) -> ScheduledJob:
+        """delay 秒后执行一次 callback"""
+        return self._submit(ScheduledJob(next(self._ids), callback, None, 0.0, owner), delay)
+
+    def call_every(self, interval: float, callback: Callable[[], None], owner: Optional[QObject] = None,
+                   jitter: float = 0.0, immediate: bool = False) -> ScheduledJob:
+        """每隔 interval 秒执行一次 callback
+
+        jitter 为间隔的随机浮动比例（0.1 表示 ±10%）；immediate 为 True 时先在下一个刻度执行一次。
+        """
+        job = ScheduledJob(next(self._ids), callback, interval, jitter, owner)
+        return self._submit(job, 0.0 if immediate else self._next_interval(job))
+
+    def _submit(self, job: ScheduledJob, delay: float) -> ScheduledJob:
+        job.due_tick = self._tick_at(time.monotonic() + delay)
+        app = QCoreApplication.instance()
+        if app is not None and QThread.currentThread() != self.thread():
+            self._add_requested.emit(job)
+        else:
+            self._add(job)
+        return job
+
+    def _add(self, job: ScheduledJob) -> None:
+        if job.cancelled:
+            return
+        if job.owner is not None and job.owner not in self._watched:
+            self._watch(job.owner)
+        if self._count == 0:
+            # 空闲期间定时器没有运行，直接跳到当前刻度，不逐格补走
+            self._current = max(self._current, min(self._now_tick(), job.due_tick - 1))
+        self._insert(job)
+        self._arm()
+
+    # ---------- 时间轮 ----------
+
+    def _tick_at(self, moment: float) -> int:
+        # 向上取整到刻度，任务不会早于指定时间执行
+        return max(self._current + 1, -int(-(moment - self._origin) * 1000 // TICK_MS))
+
+    def _now_tick(self) -> int:
+        return int((time.monotonic() - self._origin) * 1000 // TICK_MS)
+
+    def _insert(self, job: ScheduledJob) -> None:
+        due = max(job.due_tick, self._current + 1)
+        delta = due - self._current
+        level = 0
+        while level < _LEVELS - 1 and delta >= 1 << (_WHEEL_BITS * (level + 1)):
+            level += 1
+        # 超出最后一层范围的任务先放在最后一层最远的槽，下沉时再重新安排
+        slot_tick = min(due, self._current + (1 << (_WHEEL_BITS * _LEVELS)) - 1)
+        slot = (slot_tick >> (_WHEEL_BITS * level)) & _WHEEL_MASK
+        self._wheels[level][slot].append(job)
+        self._count += 1
+
+    def _advance(self, target: int) -> List[ScheduledJob]:
+        """推进到 target 刻度，返回到期的任务；上层的槽在低层转完一圈时下沉"""
+        if target - self._current > _WHEEL_SIZE:
+            return self._jump(target)
+        due = []
+        while self._current < target:
+            self._current += 1
+            tick = self._current
+            for level in range(1, _LEVELS):
+                if tick & ((1 << (_WHEEL_BITS * level)) - 1):
+                    break
+                bucket = self._wheels[level][(tick >> (_WHEEL_BITS * level)) & _WHEEL_MASK]
+                if bucket:
+                    jobs = bucket[:]
+                    bucket.clear()
+                    self._count -= len(jobs)
+                    for job in jobs:
+                        # 正好在下沉刻度到期的任务直接执行，重新放入只能排到下一个刻度
+                        if job.due_tick <= tick:
+                            due.append(job)
+                        else:
+                            self._insert(job)
+            bucket = self._wheels[0][tick & _WHEEL_MASK]
+            if bucket:
+                jobs = bucket[:]
+                bucket.clear()
+                self._count -= len(jobs)
+                for job in jobs:
+                    if job.due_tick <= tick:
+                        due.append(job)
+                    else:
+                        self._insert(job)
+        return due
+
+    def _jump(self, target: int) -> List[ScheduledJob]:
+        """一次跳到 target 刻度，开销只与任务数有关
+
+        系统休眠唤醒后 time.monotonic 可能一下前进数小时（Windows 上包含休眠时间），
+        逐格推进会让界面线程卡住；这里取出所有层的任务，已到期的返回，其余按新位置重新放入。
+        周期任务只补执行一次，下一次从当前刻度重新计时。
+        """
+        jobs = []
+        for wheel in self._wheels:
+            for bucket in wheel:
+                if bucket:
+                    jobs.extend(bucket)
+                    bucket.clear()
+        self._count = 0
+        self._current = target
+        due = []
+        for job in jobs:
+            if job.due_tick <= target:
+                due.append(job)
+            else:
+                self._insert(job)
+        due.sort(key=lambda job: job.due_tick)
+        return due
+
+    def _next_tick(self) -> Optional[int]:
+        """下一次需要唤醒的刻度：最低层最近的非空槽和各层最近的下沉时刻中最早的一个
+
+        上层槽里的任务可能比最低层已有的任务更早到期，必须在下沉时刻醒来把它放到最低层。
+        """
+        if self._count == 0:
+            return None
+        best = None
+        for offset in range(1, _WHEEL_SIZE + 1):
+            if self._wheels[0][(self._current + offset) & _WHEEL_MASK]:
+                best = self._current + offset
+                break
+        for level in range(1, _LEVELS):
+            span = 1 << (_WHEEL_BITS * level)
+            base = self._current - self._current % span
+            for offset in range(1, _WHEEL_SIZE + 1):
+                tick = base + offset * span
+                if best is not None and tick >= best:
+                    break
+                if self._wheels[level][(tick >> (_WHEEL_BITS * level)) & _WHEEL_MASK]:
+                    best = tick
+                    break
+        return best
+
+    def _arm(self) -> None:
+        if self._timer is None:
+            self._timer = QTimer(self)
+            self._timer.setSingleShot(True)
+            self._timer.setTimerType(Qt.CoarseTimer)
+            self._timer.timeout.connect(self._on_timeout)
+        next_tick = self._next_tick()
+        if next_tick is None:
+            self._timer.stop()
+            return
+        self._armed_tick = next_tick
+        delay_ms = max(0, int((self._origin + next_tick * TICK_MS / 1000 - time.monotonic()) * 1000))
+        self._timer.start(delay_ms)
+
+    def _on_timeout(self) -> None:
+        self._wakeups += 1
+        # 粗精度定时器可能略早触发，至少推进到预定的刻度
+        for job in self._advance(max(self._now_tick(), self._armed_tick)):
+            self._run(job)
+        self._arm()
+
+    def _run(self, job: ScheduledJob) -> None:
+        if job.cancelled:
+            return
+        owner = job.owner
+        if isinstance(owner, QWidget) and not owner.isVisible():
+            # 控件隐藏期间暂停，显示时再重新计时
+            job.paused = True
+            self._paused.setdefault(owner, []).append(job)
+            return
+        try:
+            job.callback()
+        except Exception as e:
+            log.exception(f"定时任务执行失败: {str(e)}")
+        job.runs += 1
+        self._executed += 1
+        if job.interval is not None and not job.cancelled:
+            # 从上次的预定刻度起算，回调耗时和唤醒延迟不会累积成漂移；
+            # 落后超过一个周期（例如休眠唤醒后）时从当前刻度重新起算，不连续补执行
+            ticks = max(1, round(self._next_interval(job) * 1000 / TICK_MS))
+            job.due_tick += ticks
+            if job.due_tick <= self._current:
+                job.due_tick = self._current + ticks
+            self._insert(job)
+
+    @staticmethod
+    def _next_interval(job: ScheduledJob) -> float:
+        if job.jitter:
+            return job.interval * (1 + random.uniform(-job.jitter, job.jitter))
+        return job.interval
+
+    # ---------- owner ----------
+
+    def _watch(self, owner: QObject) -> None:
+        self._watched.add(owner)
+        owner.destroyed.connect(lambda *_: self._on_owner_destroyed(owner))
+        if isinstance(owner, QWidget):
+            owner.installEventFilter(self)
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if event.type() == QEvent.Show and watched in self._paused:
+            for job in self._paused.pop(watched):
+                if job.cancelled:
+                    continue
+                job.paused = False
+                delay = self._next_interval(job) if job.interval is not None else 0.0
+                job.due_tick = self._tick_at(time.monotonic() + delay)
+                self._insert(job)
+            self._arm()
+        return False
+
+    def _on_owner_destroyed(self, owner: QObject) -> None:
+        self._watched.discard(owner)
+        for job in self._paused.pop(owner, []):
+            job.cancelled = True
+        for wheel in self._wheels:
+            for bucket in wheel:
+                for job in bucket:
+                    if job.owner is owner:
+                        job.cancelled = True
+
+    def _forget(self, job: ScheduledJob) -> None:
+        # 取消的任务留在槽里，到期时直接丢弃；这里只处理暂停中的任务
+        paused = self._paused.get(job.owner)
+        if paused and job in paused:
+            paused.remove(job)
+
+    # ---------- 统计 ----------
+
+    def stats(self) -> dict:
+        """时间轮中的任务数、暂停的任务数、唤醒次数和执行次数"""
+        return {
+            'scheduled': self._count,
+            'paused': sum(len(jobs) for jobs in self._paused.values()),
+            'wakeups': self._wakeups,
+            'executed': self._executed,
+        }
+
+
+# 全局实例
+scheduler = Scheduler()
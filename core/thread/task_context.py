@@ -0,0 +1,122 @@
+# =================
+# 任务上下文
+# Version: 1.0.0
+# =================
+import contextvars
+import threading
+import time
+from concurrent.futures import CancelledError
+from typing import Callable, NamedTuple, Optional
+
+
+class TaskCancelled(CancelledError):
+    """任务被取消或超过截止时间，由 CancelToken.raise_if_cancelled() 抛出"""
+
+
+class CancelToken:
+    """协作式取消令牌
+
+    线程上正在执行的函数无法被强行打断，长任务应在循环、重试之间调用 raise_if_cancelled()，
+    需要等待时用 sleep() 代替 time.sleep()，取消后立即醒来。
+    timeout 为从创建起的秒数，超过后视为已取消（原因为 'deadline'）。
+    """
+
+    __slots__ = ('deadline', 'reason', '_event', '_callbacks', '_lock')
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def cancel(self, reason: str = 'cancelled') -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    @property
+    def cancelled(self) -> bool:
+        if not self._event.is_set() and self.deadline is not None and time.monotonic() >= self.deadline:
+            self.cancel('deadline')
+        return self._event.is_set()
+
+    def remaining(self) -> Optional[float]:
+        """距截止时间的秒数，没有截止时间时返回 None"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def raise_if_cancelled(self) -> None:
+        if self.cancelled:
+            raise TaskCancelled(f"任务已取消（{self.reason}）")
+
+    def sleep(self, seconds: float) -> None:
+        """等待 seconds 秒，期间被取消或到达截止时间时抛出 TaskCancelled"""
+        remaining = self.remaining()
+        self._event.wait(seconds if remaining is None else min(seconds, remaining))
+        self.raise_if_cancelled()
+
+    def on_cancel(self, callback: Callable[[], None]) -> None:
+        """取消时调用 callback（在调用 cancel 的线程上）；已取消时立即调用"""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+
+class TaskContext(NamedTuple):
+    """提交到线程池的任务信息，随 contextvars 传递到任务内部的所有调用"""
+    task_id: str
+    submit_time: float
+    parent_id: str = ''   # 在另一个任务内部提交时为外层任务的 task_id
+    token: Optional[CancelToken] = None
+
+    def elapsed_ms(self, now: Optional[float] = None) -> float:
+        """自提交以来经过的毫秒数（含排队等待时间）"""
+        return ((now if now is not None else time.time()) - self.submit_time) * 1000
+
+
+_current_task: contextvars.ContextVar = contextvars.ContextVar('clutui_task', default=None)
+
+
+def current_task() -> Optional[TaskContext]:
+    """当前正在执行的任务，不在任务内时返回 None"""
+    return _current_task.get()
+
+
+def current_token() -> CancelToken:
+    """当前任务的取消令牌；不在任务内（例如界面线程）时返回一个不会被取消的令牌"""
+    task = _current_task.get()
+    if task is not None and task.token is not None:
+        return task.token
+    return CancelToken()
+
+
+def new_task_context(task_id: str, token: Optional[CancelToken] = None) -> TaskContext:
+    """以调用方所在的任务为父任务，创建新任务的信息"""
+    parent = _current_task.get()
+    return TaskContext(task_id, time.time(), parent.task_id if parent is not None else '', token)
+
+
+def set_current_task(task: TaskContext) -> None:
+    """在当前上下文中登记任务，供协程在自己的 asyncio.Task 上下文里调用"""
+    _current_task.set(task)
+
+
+def capture_task_context(task_id: str, token: Optional[CancelToken] = None) -> contextvars.Context:
+    """在提交时复制调用方的上下文，并在副本中登记新任务
+
+    返回的 Context 交给工作线程用 context.run(...) 执行，任务内的日志等即可读到任务信息；
+    调用方自身的上下文不受影响。
+    """
+    task = new_task_context(task_id, token)
+    context = contextvars.copy_context()
+    context.run(_current_task.set, task)
+    return context
@@ -0,0 +1,182 @@
+# =================
+# 任务组
+# Version: 1.0.0
+# =================
+import inspect
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import Future, CancelledError, InvalidStateError
+from typing import Callable, Optional
+from core.log.log_manager import log
+from core.thread.elastic_pool import LANE_NORMAL
+from core.thread.qt_future import QtFuture
+
+# 组内并发已满时 submit 的处理方式
+BACKPRESSURE_QUEUE = 'queue'    # 放进等待队列，立即返回排队中的 future；等待队列也满时抛出 TaskGroupFull
+BACKPRESSURE_BLOCK = 'block'    # 阻塞提交方直到有空位（不要在界面线程上使用）
+BACKPRESSURE_REJECT = 'reject'  # 直接抛出 TaskGroupFull
+BACKPRESSURE_MODES = (BACKPRESSURE_QUEUE, BACKPRESSURE_BLOCK, BACKPRESSURE_REJECT)
+
+
+class TaskGroupFull(RuntimeError):
+    """任务组没有空位、不再接受新任务"""
+
+
+class _GroupTask:
+    __slots__ = ('future', 'func', 'args', 'kwargs', 'inner', 'task_id')
+
+    def __init__(self, future: Future, func: Callable, args, kwargs):
+        self.future = future
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.inner: Optional[Future] = None
+        self.task_id: Optional[str] = None
+
+
+class TaskGroup:
+    """限制并发数的一组任务
+
+    同一组内同时执行的任务不超过 max_concurrency 个，多出来的按 mode 处理（见 BACKPRESSURE_*），
+    等待队列最多 max_pending 个。任务 id 为 "<组名>_<序号>"，统计按组名汇总。
+    func 为协程函数时放到 asyncio 事件循环上执行，同样受并发数限制。
+
+    cancel() 取消组内所有排队中和执行中的任务，例如页面隐藏时放弃还没完成的加载；
+    执行中的任务通过取消令牌得到通知，需要在任务里检查 current_token() 才能提前结束，
+    不检查的函数会执行完，只是结果不再送达。
+    """
+
+    def __init__(self, name: str, manager, max_concurrency: int = 4, max_pending: int = 64,
+                 mode: str = BACKPRESSURE_QUEUE, lane: str = LANE_NORMAL):
+        if mode not in BACKPRESSURE_MODES:
+            raise ValueError(f"未知的背压模式: {mode}")
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_pending = max(0, max_pending)
+        self.mode = mode
+        self.lane = lane
+        self._manager = manager
+        self._cond = threading.Condition(threading.Lock())
+        self._pending = deque()
+        self._running = set()
+        self._counter = itertools.count()
+        self._rejected = 0
+        self._cancelled = 0
+
+    def submit(self, func: Callable, *args, timeout: Optional[float] = None, **kwargs) -> QtFuture:
+        """提交任务，返回的 QtFuture 在任务真正开始前处于排队状态
+
+        block 模式下最多等待 timeout 秒（None 为一直等），超时抛出 TaskGroupFull。
+        """
+        task = _GroupTask(Future(), func, args, kwargs)
+        with self._cond:
+            if len(self._running) >= self.max_concurrency:
+                if self.mode == BACKPRESSURE_BLOCK:
+                    if not self._cond.wait_for(lambda: len(self._running) < self.max_concurrency, timeout):
+                        self._rejected += 1
+                        raise TaskGroupFull(f"任务组 {self.name} 等待空位超时")
+                elif self.mode == BACKPRESSURE_QUEUE and len(self._pending) < self.max_pending:
+                    self._pending.append(task)
+                    task.future.add_done_callback(lambda f: f.cancelled() and self._drop_pending(task))
+                    return QtFuture(task.future)
+                else:
+                    self._rejected += 1
+                    raise TaskGroupFull(f"任务组 {self.name} 已满（执行中 {len(self._running)}，"
+                                        f"排队 {len(self._pending)}）")
+            self._running.add(task)
+        self._start(task)
+        return QtFuture(task.future)
+
+    def _start(self, task: _GroupTask) -> None:
+        # 调用方已把 task 计入 self._running
+        if task.future.done() or not task.future.set_running_or_notify_cancel():
+            self._release(task)
+            return
+        task_id = task.task_id = f"{self.name}_{next(self._counter)}"
+        try:
+            if inspect.iscoroutinefunction(task.func):
+                inner = self._manager.submit_coroutine(task_id, task.func(*task.args, **task.kwargs))
+            else:
+                inner = self._manager.submit_task(task_id, task.func, *task.args,
+                                                  lane=self.lane, **task.kwargs)
+        except Exception as e:
+            task.future.set_exception(e)
+            self._release(task)
+            return
+        task.inner = inner.future
+        task.inner.add_done_callback(lambda done: self._on_done(task, done))
+
+    def _on_done(self, task: _GroupTask, inner: Future) -> None:
+        try:
+            if inner.cancelled():
+                task.future.cancel()
+            elif inner.exception() is not None:
+                task.future.set_exception(inner.exception())
+            else:
+                task.future.set_result(inner.result())
+        except InvalidStateError:
+            # 组已取消，结果不再送达
+            pass
+        self._release(task)
+
+    def _release(self, task: _GroupTask) -> None:
+        # 空出的位置优先给等待队列，block 模式下唤醒等待的提交方
+        with self._cond:
+            self._running.discard(task)
+            following = None
+            while self._pending and len(self._running) < self.max_concurrency:
+                candidate = self._pending.popleft()
+                if not candidate.future.cancelled():
+                    following = candidate
+                    self._running.add(following)
+                    break
+            self._cond.notify()
+        if following is not None:
+            self._start(following)
+
+    def _drop_pending(self, task: _GroupTask) -> None:
+        with self._cond:
+            try:
+                self._pending.remove(task)
+            except ValueError:
+                pass
+
+    def cancel(self) -> int:
+        """取消组内排队中和执行中的任务，返回取消的个数；之后仍可继续提交"""
+        with self._cond:
+            pending = list(self._pending)
+            self._pending.clear()
+            running = list(self._running)
+        count = 0
+        for task in pending:
+            count += task.future.cancel()
+        for task in running:
+            # 还在线程池排队的直接取消；已经在执行的通过取消令牌通知，
+            # 任务里的 current_token() / token.sleep() 随即看到取消并自行结束
+            cancelled = task.task_id is not None and self._manager.cancel_task(task.task_id)
+            if not cancelled and task.inner is not None:
+                task.inner.cancel()
+            # 组对外的 future 已经在运行状态，不能 cancel()，改为以取消异常结束
+            try:
+                task.future.set_exception(CancelledError())
+                count += 1
+            except InvalidStateError:
+                pass
+        with self._cond:
+            self._cancelled += count
+        if count:
+            log.debug("任务组 %s 取消 %d 个任务", self.name, count)
+        return count
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                'running': len(self._running),
+                'pending': len(self._pending),
+                'max_concurrency': self.max_concurrency,
+                'max_pending': self.max_pending,
+                'rejected': self._rejected,
+                'cancelled': self._cancelled,
+            }
+
@@ -0,0 +1,192 @@
+# =================
+# 任务登记与统计
+# Version: 1.0.0
+# =================
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+# 去掉任务名末尾含数字的部分：log_search_12 -> log_search，task_1712.3_1234 -> task
+_TASK_SUFFIX = re.compile(r'(_[^_]*\d[^_]*)+$')
+
+
+def task_prefix(task_id: str) -> str:
+    """任务名前缀，同一类任务（每次 id 不同）归到同一组统计"""
+    return _TASK_SUFFIX.sub('', task_id) or task_id
+
+
+class TaskRecord:
+    """单个任务的生命周期记录"""
+
+    __slots__ = ('task_id', 'prefix', 'future', 'token', 'submit_time', 'start_time',
+                 'end_time', 'status', 'error', 'coroutine')
+
+    def __init__(self, task_id: str):
+        self.task_id = task_id
+        self.prefix = task_prefix(task_id)
+        self.future: Optional[Future] = None
+        self.token = None
+        self.submit_time = time.time()
+        self.start_time = None
+        self.end_time = None
+        self.status = 'pending'
+        self.error = None
+        self.coroutine = False     # submit_coroutine 提交的协程，在界面线程的事件循环上执行
+
+    def as_dict(self) -> dict:
+        info = {'submit_time': self.submit_time, 'status': self.status}
+        if self.start_time is not None:
+            info['start_time'] = self.start_time
+        if self.end_time is not None:
+            info['end_time'] = self.end_time
+        if self.error is not None:
+            info['error'] = self.error
+        return info
+
+
+class PrefixStats:
+    """同一前缀任务的滚动统计，耗时只保留最近 SAMPLE_WINDOW 个样本用于计算分位数"""
+
+    SAMPLE_WINDOW = 1024
+
+    __slots__ = ('count', 'failed', 'cancelled', 'total_runtime', 'total_wait', 'runtimes')
+
+    def __init__(self):
+        self.count = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.total_runtime = 0.0
+        self.total_wait = 0.0
+        self.runtimes = deque(maxlen=self.SAMPLE_WINDOW)
+
+    def add(self, record: TaskRecord) -> None:
+        self.count += 1
+        if record.status == 'cancelled':
+            self.cancelled += 1
+            return
+        if record.status == 'failed':
+            self.failed += 1
+        if record.start_time is not None and record.end_time is not None:
+            runtime = record.end_time - record.start_time
+            self.total_runtime += runtime
+            self.total_wait += record.start_time - record.submit_time
+            self.runtimes.append(runtime)
+
+    def snapshot(self) -> dict:
+        samples = sorted(self.runtimes)
+        finished = self.count - self.cancelled
+
+        def percentile(p):
+            if not samples:
+                return 0.0
+            return samples[min(len(samples) - 1, int(len(samples) * p))] * 1000
+
+        return {
+            'count': self.count,
+            'failed': self.failed,
+            'cancelled': self.cancelled,
+            'failure_rate': self.failed / finished if finished else 0.0,
+            'mean_ms': self.total_runtime / finished * 1000 if finished else 0.0,
+            'mean_wait_ms': self.total_wait / finished * 1000 if finished else 0.0,
+            'p50_ms': percentile(0.50),
+            'p95_ms': percentile(0.95),
+            'p99_ms': percentile(0.99),
+        }
+
+
+class TaskRegistry:
+    """有界的任务登记表
+
+    运行中的任务按 id 登记，活动任务数用计数器维护（O(1)）；
+    任务结束后计入所属前缀的统计，并移入容量为 RECENT_LIMIT 的最近任务 LRU，
+    更早的记录直接丢弃，长时间运行也不会无限增长。
+    """
+
+    RECENT_LIMIT = 256
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._active: Dict[str, TaskRecord] = {}
+        self._active_count = 0
+        # 所有未结束的记录；_active 按 id 登记，同名任务重复提交时只保留最新的一个
+        self._live = set()
+        self._recent: "OrderedDict[str, TaskRecord]" = OrderedDict()
+        self._stats: Dict[str, PrefixStats] = {}
+
+    @property
+    def active_count(self) -> int:
+        return self._active_count
+
+    def register(self, task_id: str) -> TaskRecord:
+        record = TaskRecord(task_id)
+        with self._lock:
+            self._active[task_id] = record
+            self._active_count += 1
+            self._live.add(record)
+        return record
+
+    def attach(self, record: TaskRecord, future: Future) -> None:
+        """关联 Future，任务结束（完成/失败/取消）时自动归档"""
+        record.future = future
+        future.add_done_callback(lambda f: self._finish(record, f))
+
+    def discard(self, record: TaskRecord) -> None:
+        """提交失败时撤销登记"""
+        with self._lock:
+            self._active_count -= 1
+            self._live.discard(record)
+            if self._active.get(record.task_id) is record:
+                del self._active[record.task_id]
+
+    def _finish(self, record: TaskRecord, future: Future) -> None:
+        if future.cancelled():
+            record.status = 'cancelled'
+        elif record.status == 'running':
+            # 包装函数没来得及更新状态（例如执行器内部出错）
+            record.status = 'failed' if future.exception() is not None else 'completed'
+        if record.end_time is None:
+            record.end_time = time.time()
+        with self._lock:
+            self._active_count -= 1
+            self._live.discard(record)
+            # 同名任务可能已被重新提交，只移除自己
+            if self._active.get(record.task_id) is record:
+                del self._active[record.task_id]
+            self._recent[record.task_id] = record
+            self._recent.move_to_end(record.task_id)
+            if len(self._recent) > self.RECENT_LIMIT:
+                self._recent.popitem(last=False)
+            stats = self._stats.get(record.prefix)
+            if stats is None:
+                stats = self._stats[record.prefix] = PrefixStats()
+            stats.add(record)
+
+    def get(self, task_id: str) -> Optional[TaskRecord]:
+        with self._lock:
+            record = self._active.get(task_id)
+            if record is None:
+                record = self._recent.get(task_id)
+            return record
+
+    def is_active(self, task_id: str) -> bool:
+        return task_id in self._active
+
+    def active_records(self) -> List[TaskRecord]:
+        """所有未结束的任务记录，包括被同名任务覆盖的"""
+        with self._lock:
+            return list(self._live)
+
+    def records(self) -> Dict[str, dict]:
+        """运行中任务和最近结束任务的记录"""
+        with self._lock:
+            records = list(self._recent.values()) + list(self._active.values())
+        return {record.task_id: record.as_dict() for record in records}
+
+    def summary(self) -> Dict[str, dict]:
+        """按任务名前缀汇总的统计"""
+        with self._lock:
+            stats = list(self._stats.items())
+        return {prefix: item.snapshot() for prefix, item in stats}
@@ -2,19 +2,36 @@
 # 线程管理器
 # Version: 1.0.0
 # =================
-from concurrent.futures import ThreadPoolExecutor, Future
-from typing import Callable, Any, Optional, Dict
+from collections import Counter
+from concurrent.futures import Future, InvalidStateError, wait as wait_futures
+from typing import Callable, Any, Optional, Dict, Coroutine, List
+from PySide6.QtCore import QObject, QCoreApplication, QThread
 from core.log.log_manager import log
+from core.thread.task_context import (CancelToken, TaskCancelled, capture_task_context,
+                                      new_task_context, set_current_task)
+from core.thread.task_registry import TaskRegistry
+from core.thread.elastic_pool import ElasticThreadPool, LANE_NORMAL, LANE_PROCESS
+from core.thread.qt_future import QtFuture
+from core.thread.task_group import TaskGroup, BACKPRESSURE_QUEUE
 import threading
 import queue
+import inspect
 import time
-import psutil
 import os
 
 
 class ThreadManager:
+    """全局任务调度入口
+
+    导入时只创建登记表等轻量对象；线程池在第一次提交任务时创建，进程池在第一次提交进程任务时创建。
+    监控定时器只在线程池扩容后运行，上限收回到基础线程数就停止，应用空闲时不额外占用线程。
+    """
+
     _instance = None
     _lock = threading.Lock()
+
+    # 线程池有积压或扩容过时，每隔多久检查一次是否需要伸缩（秒）
+    MONITOR_INTERVAL = 30.0
     
     def __new__(cls):
         with cls._lock:
@@ -24,92 +41,285 @@ class ThreadManager:
     
     def __init__(self):
         if not hasattr(self, 'initialized'):
-            self.max_workers = self._calculate_optimal_thread_count()
-            self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
-            self.tasks: Dict[str, Future] = {}
+            self.max_workers: Optional[int] = None
+            self._executor: Optional[ElasticThreadPool] = None
+            self._process_pool = None
+            self._monitor = None   # 监控定时器（调度器任务或 threading.Timer）
+            self._state_lock = threading.Lock()
+            self._closed = False      # 不再接受新任务
+            self._shut_down = False   # 线程池/进程池已关闭
+            # 运行中任务 + 最近结束任务的有界登记表，结束的任务汇总到按前缀的统计中
+            self.registry = TaskRegistry()
+            # submit_once 的共享任务：key -> [future, 结果过期时间]，运行中的过期时间为 None
+            self._once: Dict[str, list] = {}
+            self._once_lock = threading.RLock()
+            self._coalesced = Counter()
+            self._groups: Dict[str, TaskGroup] = {}
             self.task_queue = queue.Queue()
             self.results = {}
-            self.task_stats = {}
             self.initialized = True
-            self._start_monitoring()
-            log.info(f"线程管理器初始化完成，当前线程数: {self.max_workers}")
     
+    @property
+    def executor(self) -> ElasticThreadPool:
+        """线程池，第一次使用时创建"""
+        executor = self._executor
+        if executor is not None:
+            return executor
+        with self._state_lock:
+            if self._closed:
+                raise RuntimeError("线程管理器已关闭")
+            if self._executor is None:
+                self.max_workers = self._calculate_optimal_thread_count()
+                # 线程按需创建、空闲退出；排队等待过久时线程池自行扩容，不再重建执行器
+                self._executor = ElasticThreadPool(base_workers=self.max_workers,
+                                                   min_workers=2,
+                                                   max_limit=min(self.max_workers * 4, 256),
+                                                   on_grow=self._schedule_monitor)
+                log.info(f"线程管理器初始化完成，当前线程数: {self.max_workers}")
+            return self._executor
+
+    @property
+    def process_pool(self):
+        """CPU 密集任务的进程池，第一次使用时创建，进程在提交任务时才启动"""
+        if self._process_pool is None:
+            from core.thread.process_pool import ProcessLane
+            with self._state_lock:
+                if self._closed:
+                    raise RuntimeError("线程管理器已关闭")
+                if self._process_pool is None:
+                    self._process_pool = ProcessLane()
+        return self._process_pool
+
     def _calculate_optimal_thread_count(self) -> int:
-        cpu_count = psutil.cpu_count(logical=True)
-        memory = psutil.virtual_memory()
-        
-        # 基础线程数：CPU核心数 * 2
-        base_threads = cpu_count * 2
+        import psutil
+        cpu_count = psutil.cpu_count(logical=True) or os.cpu_count() or 2
         
-        # 根据内存使用情况调整
-        memory_factor = 1.0
-        if memory.percent > 80:
-            memory_factor = 0.5
-        elif memory.percent > 60:
-            memory_factor = 0.7
-        
-        optimal_threads = int(base_threads * memory_factor)
-        return max(4, min(optimal_threads, 256))
+        # 基础线程数：CPU核心数 * 2，负载高时由线程池按排队情况自行扩容
+        return max(4, min(cpu_count * 2, 64))
     
-    def _start_monitoring(self):
-        def monitor():
-            while True:
-                try:
-                    self._adjust_thread_pool()
-                    time.sleep(30)
-                except Exception as e:
-                    log.error(f"线程池监控异常: {str(e)}")
-        
-        monitor_thread = threading.Thread(target=monitor, daemon=True)
-        monitor_thread.start()
+    def _schedule_monitor(self):
+        """启动监控定时器，已经在等待的不重复启动
+
+        有 QApplication 时交给全局调度器，与其他定时任务合并唤醒；否则（工具脚本等）用一次性线程定时器。
+        """
+        with self._state_lock:
+            if self._monitor is not None or self._closed:
+                return
+            if QCoreApplication.instance() is not None:
+                from core.thread.scheduler import scheduler
+                self._monitor = scheduler.call_later(self.MONITOR_INTERVAL, self._monitor_tick)
+                return
+            self._monitor = threading.Timer(self.MONITOR_INTERVAL, self._monitor_tick)
+            self._monitor.name = "ClutThreadMonitor"
+            self._monitor.daemon = True
+            self._monitor.start()
+
+    def _monitor_tick(self):
+        try:
+            self._adjust_thread_pool()
+        except Exception as e:
+            log.error(f"线程池监控异常: {str(e)}")
+        with self._state_lock:
+            self._monitor = None
+        # 还有积压、或者扩容后还没收回时继续监控；否则等下次扩容后再启动
+        stats = self._executor.stats()
+        if stats['queued'] or stats['max_workers'] > self._executor.base_workers:
+            self._schedule_monitor()
     
     def _adjust_thread_pool(self):
-        active_tasks = len([t for t in self.tasks.values() if not t.done()])
-        current_workers = self.executor._max_workers
-        optimal_count = self._calculate_optimal_thread_count()
-        
-        # 根据任务负载调整线程数
-        if active_tasks > current_workers * 0.8:
-            new_workers = min(current_workers * 2, 256)
-        elif active_tasks < current_workers * 0.2:
-            new_workers = max(current_workers // 2, optimal_count)
-        else:
-            new_workers = optimal_count
-        
-        if new_workers != current_workers:
-            log.info(f"调整线程池大小: {current_workers} -> {new_workers}")
-            new_executor = ThreadPoolExecutor(max_workers=new_workers)
-            old_executor = self.executor
-            self.executor = new_executor
-            old_executor.shutdown(wait=False)
-
-    def submit_task(self, task_id: str, func: Callable, *args, **kwargs) -> Future:
+        # 按排队深度和等待时间原地调整上限，排队中和执行中的任务不受影响
+        current_workers = self.executor.max_workers
+        new_workers = self.executor.autoscale()
+        if new_workers is not None:
+            stats = self.executor.stats()
+            log.info(f"调整线程池大小: {current_workers} -> {new_workers}"
+                     f"（排队 {stats['queued']}，等待 p95 {stats['wait_p95_ms']:.0f}ms）")
+
+    def submit_task(self, task_id: str, func: Callable, *args, lane: str = LANE_NORMAL,
+                    task_timeout: Optional[float] = None, **kwargs) -> QtFuture:
+        """提交任务
+
+        lane 为任务通道：界面等着要结果的用 LANE_INTERACTIVE，
+        可以慢慢做的后台任务（网络重试、预加载等）用 LANE_BACKGROUND，
+        纯计算、会长时间占用 GIL 的任务用 LANE_PROCESS 放到工作进程里执行：
+        此时 func 和参数必须能被 pickle，结果中的大块字节数据以 SharedBuffer 返回。
+        返回的 QtFuture 可用 on_done/on_error/then 在界面线程上处理结果，不需要阻塞等待。
+
+        任务内用 current_token() 取得取消令牌：cancel_task() 或关闭程序时令牌被取消，
+        长任务应在循环/重试之间调用 token.raise_if_cancelled()，等待用 token.sleep()。
+        task_timeout 为从提交起的秒数，超过后令牌视为已取消，还没开始的任务直接跳过。
+        进程任务不支持令牌，只能在开始前取消。
+        """
+        self._check_open()
+        record = self.registry.register(task_id)
         try:
-            self.task_stats[task_id] = {
-                'start_time': time.time(),
-                'status': 'running'
-            }
-            
+            if lane == LANE_PROCESS:
+                future = self.process_pool.submit(func, *args, **kwargs)
+                # 先于登记表的回调执行，补上子进程里的执行时间和状态
+                future.add_done_callback(lambda done: _record_process_outcome(record, done))
+                self.registry.attach(record, future)
+                log.debug("提交进程任务: %s", task_id)
+                return QtFuture(future)
+
+            token = record.token = CancelToken(task_timeout)
+
             def wrapped_func(*args, **kwargs):
+                record.start_time = time.time()
+                record.status = 'running'
                 try:
+                    # 排队期间已被取消或超时的任务不再执行
+                    token.raise_if_cancelled()
                     result = func(*args, **kwargs)
-                    self.task_stats[task_id]['status'] = 'completed'
-                    self.task_stats[task_id]['end_time'] = time.time()
+                    record.status = 'completed'
                     return result
+                except TaskCancelled as e:
+                    record.status = 'cancelled'
+                    record.error = str(e)
+                    raise
                 except Exception as e:
-                    self.task_stats[task_id]['status'] = 'failed'
-                    self.task_stats[task_id]['error'] = str(e)
+                    record.status = 'failed'
+                    record.error = str(e)
                     raise
+                finally:
+                    record.end_time = time.time()
             
-            future = self.executor.submit(wrapped_func, *args, **kwargs)
-            self.tasks[task_id] = future
-            log.debug(f"提交任务: {task_id}")
-            return future
+            # 任务内的日志自动带上 task_id / 提交时间 / 父任务，current_token() 取得令牌
+            context = capture_task_context(task_id, token)
+            future = self.executor.submit_to(lane, context.run, wrapped_func, *args, **kwargs)
+            self.registry.attach(record, future)
+            log.debug("提交任务: %s", task_id)
+            return QtFuture(future)
 
         except Exception as e:
+            self.registry.discard(record)
             log.error(f"提交任务失败 {task_id}: {str(e)}")
             raise
     
+    def submit_coroutine(self, task_id: str, coro: Coroutine, owner: Optional[QObject] = None,
+                         task_timeout: Optional[float] = None) -> QtFuture:
+        """把协程调度到与 Qt 主循环集成的 asyncio 事件循环上，await 期间不占用线程
+
+        owner 为发起任务的控件：控件销毁时自动取消协程，回调不会落到已删除的控件上。
+        task_timeout 秒后协程被取消；取消令牌被取消时同样取消协程。
+        返回的 QtFuture 与 submit_task 的相同，可用 on_done/on_error/then 处理结果。
+        """
+        if self._closed:
+            coro.close()
+            self._check_open()
+        record = self.registry.register(task_id)
+        record.coroutine = True
+        token = record.token = CancelToken(task_timeout)
+        task = new_task_context(task_id, token)
+
+        async def run():
+            set_current_task(task)
+            record.start_time = time.time()
+            record.status = 'running'
+            if task_timeout is not None:
+                import asyncio
+                asyncio.get_running_loop().call_later(task_timeout, token.cancel, 'deadline')
+            try:
+                result = await coro
+                record.status = 'completed'
+                return result
+            except Exception as e:
+                record.status = 'failed'
+                record.error = str(e)
+                raise
+            finally:
+                record.end_time = time.time()
+
+        from core.thread.async_loop import async_loop
+        try:
+            future = async_loop.submit(run())
+        except Exception as e:
+            coro.close()
+            self.registry.discard(record)
+            log.error(f"提交协程失败 {task_id}: {str(e)}")
+            raise
+        self.registry.attach(record, future)
+        token.on_cancel(future.cancel)
+        if owner is not None:
+            _cancel_with_owner(owner, future)
+        log.debug("提交协程: %s", task_id)
+        return QtFuture(future)
+
+    def submit_once(self, key: str, func: Callable, *args, ttl: float = 0.0,
+                    lane: str = LANE_NORMAL, owner: Optional[QObject] = None, **kwargs) -> QtFuture:
+        """同一 key 同时只执行一次的任务
+
+        key 对应的任务还在执行时不再重复提交，直接等待它的结果；ttl 秒内再次提交直接复用
+        上一次成功的结果，用于合并短时间内的重复请求。失败或取消的结果不复用。
+        func 为协程函数时放到 asyncio 事件循环上执行（同 submit_coroutine），否则按 lane 提交。
+
+        每个调用方拿到各自的 QtFuture：取消它或 owner 销毁只影响这个调用方，
+        共享的任务照常执行完，结果留给其他调用方。
+        """
+        with self._once_lock:
+            entry = self._once.get(key)
+            if entry is not None and entry[1] is not None and time.monotonic() >= entry[1]:
+                entry = None
+            if entry is not None:
+                self._coalesced[key] += 1
+                log.debug("合并任务: %s", key)
+            else:
+                if inspect.iscoroutinefunction(func):
+                    shared = self.submit_coroutine(key, func(*args, **kwargs)).future
+                else:
+                    shared = self.submit_task(key, func, *args, lane=lane, **kwargs).future
+                entry = self._once[key] = [shared, None]
+                shared.add_done_callback(lambda done: self._finish_once(key, done, ttl))
+
+        caller = Future()
+        entry[0].add_done_callback(lambda done: _forward_outcome(done, caller))
+        if owner is not None:
+            _cancel_with_owner(owner, caller)
+        return QtFuture(caller)
+
+    def _finish_once(self, key: str, future: Future, ttl: float) -> None:
+        with self._once_lock:
+            entry = self._once.get(key)
+            if entry is None or entry[0] is not future:
+                return
+            if ttl > 0 and not future.cancelled() and future.exception() is None:
+                entry[1] = time.monotonic() + ttl
+            else:
+                del self._once[key]
+
+    def get_coalesced_count(self, key: Optional[str] = None) -> int:
+        """submit_once 被合并（没有重复执行）的提交次数，不指定 key 时返回总数"""
+        with self._once_lock:
+            if key is not None:
+                return self._coalesced[key]
+            return sum(self._coalesced.values())
+
+    def task_group(self, name: str, max_concurrency: int = 4, max_pending: int = 64,
+                   mode: str = BACKPRESSURE_QUEUE, lane: str = LANE_NORMAL) -> TaskGroup:
+        """按名称获取任务组，第一次获取时按参数创建，之后返回同一个组（参数不再生效）
+
+        组内同时执行的任务数受 max_concurrency 限制，超出部分按 mode 排队、阻塞或拒绝，
+        用 group.submit(func, ...) 提交，group.cancel() 取消组内全部任务。
+        """
+        with self._state_lock:
+            group = self._groups.get(name)
+            if group is None:
+                group = self._groups[name] = TaskGroup(name, self, max_concurrency=max_concurrency,
+                                                       max_pending=max_pending, mode=mode, lane=lane)
+            return group
+
+    def get_group_stats(self) -> Dict[str, dict]:
+        """各任务组的执行数、排队数、拒绝数和取消数"""
+        with self._state_lock:
+            groups = dict(self._groups)
+        return {name: group.stats() for name, group in groups.items()}
+
+    def warm_process_pool(self) -> None:
+        """提前启动进程池的常驻进程，之后的进程任务不用等进程启动"""
+        try:
+            self.process_pool.warm()
+        except Exception as e:
+            log.error(f"进程池预热失败: {str(e)}")
+
     def run_in_thread(self, func: Callable) -> Callable:
         def wrapper(*args, **kwargs):
             return self.submit_task(
@@ -120,44 +330,204 @@ class ThreadManager:
             )
         return wrapper
     
+    def _get_future(self, task_id: str) -> Optional[Future]:
+        record = self.registry.get(task_id)
+        return record.future if record is not None else None
+
     def get_result(self, task_id: str, timeout: Optional[float] = None) -> Any:
+        # 只能取到运行中或最近结束的任务，更早的任务记录已被淘汰
         try:
-            if task_id in self.tasks:
-                return self.tasks[task_id].result(timeout=timeout)
+            future = self._get_future(task_id)
+            if future is not None:
+                return future.result(timeout=timeout)
             return None
         except Exception as e:
             log.error(f"获取任务结果失败 {task_id}: {str(e)}")
             return None
     
     def cancel_task(self, task_id: str) -> bool:
-        if task_id in self.tasks:
-            self.task_stats[task_id]['status'] = 'cancelled'
-            return self.tasks[task_id].cancel()
+        """取消任务：还没开始的直接取消，执行中的通过取消令牌通知任务自行结束"""
+        record = self.registry.get(task_id)
+        if record is None or record.future is None or record.future.done():
+            return False
+        if record.future.cancel():
+            return True
+        if record.token is not None:
+            record.token.cancel()
+            return True
         return False
     
     def is_task_running(self, task_id: str) -> bool:
-        return task_id in self.tasks and not self.tasks[task_id].done()
+        return self.registry.is_active(task_id)
     
     def wait_for_task(self, task_id: str, timeout: Optional[float] = None) -> bool:
         try:
-            if task_id in self.tasks:
-                self.tasks[task_id].result(timeout=timeout)
+            future = self._get_future(task_id)
+            if future is not None:
+                future.result(timeout=timeout)
                 return True
             return False
         except Exception:
             return False
     
     def get_task_stats(self, task_id: str = None) -> Dict:
+        """单个任务的记录；不指定 task_id 时返回运行中和最近结束的所有任务记录"""
         if task_id:
-            return self.task_stats.get(task_id)
-        return self.task_stats
+            record = self.registry.get(task_id)
+            return record.as_dict() if record is not None else None
+        return self.registry.records()
+
+    def get_task_summary(self) -> Dict[str, dict]:
+        """按任务名前缀汇总的统计：次数、失败率、平均/p50/p95/p99 耗时（毫秒）"""
+        return self.registry.summary()
+
+    def get_lane_stats(self) -> Dict[str, dict]:
+        """各任务通道的排队数、运行数和排队等待时间分布；线程池还没创建时返回空字典"""
+        if self._executor is None:
+            return {}
+        return self._executor.stats()['lanes']
     
-    def shutdown(self, wait: bool = True):
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("线程管理器已关闭")
+
+    def begin_shutdown(self) -> int:
+        """关闭的第一步：不再接受新任务，取消排队中的任务，通知执行中的任务尽快结束
+
+        在关闭动画开始时调用，任务可以利用动画的时间自行退出；返回通知到的任务数。
+        """
+        with self._state_lock:
+            if self._closed:
+                return 0
+            self._closed = True
+            monitor, self._monitor = self._monitor, None
+            groups = list(self._groups.values())
+        if monitor is not None:
+            monitor.cancel()
+        for group in groups:
+            group.cancel()
+        records = self.registry.active_records()
+        for record in records:
+            if record.future is not None and not record.future.cancel() and record.token is not None:
+                record.token.cancel('shutdown')
+        log.info(f"开始关闭线程管理器，通知 {len(records)} 个未完成的任务")
+        return len(records)
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False,
+                 deadline: Optional[float] = None) -> List[str]:
+        """停止监控，关闭线程池和进程池；可重复调用，没有创建过的线程池/进程池不会再被创建
+
+        cancel_futures 为 True 时取消还在排队的任务，只等待正在执行的任务。
+        给出 deadline（秒）时按关闭流程处理：先 begin_shutdown()，最多等待 deadline 秒，
+        到时仍未结束的任务直接放弃（工作线程为守护线程，进程池的进程被终止），
+        返回被放弃的任务 id 并记录到日志。
+        """
+        if deadline is not None:
+            self.begin_shutdown()
+        with self._state_lock:
+            if self._shut_down:
+                return []
+            self._shut_down = True
+            self._closed = True
+            monitor, self._monitor = self._monitor, None
+        if monitor is not None:
+            monitor.cancel()
+
+        abandoned = []
         try:
-            self.executor.shutdown(wait=wait)
+            if deadline is not None:
+                abandoned = self._wait_active(deadline)
+                wait, cancel_futures = False, True
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+            if self._process_pool is not None:
+                self._process_pool.shutdown(wait=wait, cancel_futures=cancel_futures,
+                                            terminate=bool(abandoned))
+            if self._coalesced:
+                log.debug("合并重复任务 %d 次: %s", self.get_coalesced_count(), dict(self._coalesced))
+            for prefix, stats in self.get_task_summary().items():
+                log.debug("任务统计 %s: %d 次，失败率 %.1f%%，p50 %.1fms，p95 %.1fms",
+                          prefix, stats['count'], stats['failure_rate'] * 100,
+                          stats['p50_ms'], stats['p95_ms'])
             log.info("线程管理器关闭")
         except Exception as e:
             log.error(f"线程管理器关闭失败: {str(e)}")
+        return abandoned
+
+    def _wait_active(self, deadline: float) -> List[str]:
+        # 等待未结束的任务，返回超时后仍未结束的任务 id
+        records = self.registry.active_records()
+        # 协程在界面线程的事件循环上执行，界面线程阻塞等待时它们不可能结束，直接取消
+        for record in records:
+            if record.coroutine and record.future is not None:
+                record.future.cancel()
+        futures = [record.future for record in records
+                   if record.future is not None and not record.future.done()]
+        app = QCoreApplication.instance()
+        on_gui_thread = app is not None and QThread.currentThread() == app.thread()
+        end = time.monotonic() + deadline
+        while futures:
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                break
+            if on_gui_thread:
+                # 分段等待，其间处理事件，协程的取消和 finally 得以执行
+                QCoreApplication.processEvents()
+                remaining = min(remaining, 0.02)
+            futures = list(wait_futures(futures, timeout=remaining).not_done)
+        now = time.time()
+        abandoned = [record for record in records
+                     if record.future is None or not record.future.done()]
+        if abandoned:
+            details = ", ".join(
+                f"{record.task_id}（{record.status}，已运行 {now - (record.start_time or record.submit_time):.1f}s）"
+                for record in abandoned
+            )
+            log.warning(f"关闭超时（{deadline:.1f}s），放弃 {len(abandoned)} 个未完成的任务: {details}")
+        return [record.task_id for record in abandoned]
+
+
+def _forward_outcome(source: Future, target: Future) -> None:
+    try:
+        if source.cancelled():
+            target.cancel()
+        elif source.exception() is not None:
+            target.set_exception(source.exception())
+        else:
+            target.set_result(source.result())
+    except InvalidStateError:
+        # 调用方已经取消
+        pass
+
+
+def _record_process_outcome(record, future: Future) -> None:
+    record.start_time = getattr(future, 'start_time', None)
+    record.end_time = getattr(future, 'end_time', None)
+    if future.cancelled():
+        return
+    error = future.exception()
+    record.status = 'failed' if error is not None else 'completed'
+    if error is not None:
+        record.error = str(error)
+
+
+def _cancel_with_owner(owner: QObject, future: Future) -> None:
+    """owner 销毁时取消 future；future 先结束时断开连接，不让控件持有已完成的任务"""
+    alive = [True]
+
+    def on_destroyed():
+        alive[0] = False
+        future.cancel()
+
+    def on_done(_):
+        if alive[0]:
+            try:
+                owner.destroyed.disconnect(on_destroyed)
+            except (RuntimeError, TypeError):
+                pass
+
+    owner.destroyed.connect(on_destroyed)
+    future.add_done_callback(on_done)
 
 # 全局实例
 thread_manager = ThreadManager() 
\ No newline at end of file
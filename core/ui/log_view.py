@@ -0,0 +1,463 @@
+from PySide6.QtWidgets import QTableView, QStyledItemDelegate, QStyle, QHeaderView, QAbstractItemView
+from PySide6.QtCore import Qt, QAbstractTableModel, QAbstractProxyModel, QModelIndex, Signal
+from PySide6.QtGui import QColor, QFont
+from array import array
+from bisect import bisect_left
+import time
+
+# 日志级别颜色（与统计按钮保持一致）
+LEVEL_COLORS = {
+    'INFO': QColor("#2E7D32"),     # 墨绿色
+    'WARNING': QColor("#FFC107"),
+    'DEBUG': QColor("#9C27B0"),    # 浅紫色
+    'ERROR': QColor("#F44336"),
+    'CRITICAL': QColor("#F44336"),
+}
+DEFAULT_LEVEL_COLOR = QColor("#333333")
+TIME_COLOR = QColor("#666666")
+FILE_COLOR = QColor("#0066CC")
+TASK_COLOR = QColor("#00897B")
+
+# 过滤按钮名称到日志级别的映射
+FILTER_LEVELS = {
+    'WARN': 'WARNING',
+}
+
+
+class LogTableModel(QAbstractTableModel):
+    """日志记录表格模型
+
+    记录以 LogEntry 列表保存，视图只会请求可见行的数据。
+    同时按级别、任务以及（任务, 级别）维护绝对行号索引，过滤时无需重新扫描全部记录。
+    """
+
+    COLUMN_TIME, COLUMN_LEVEL, COLUMN_FILE, COLUMN_TASK, COLUMN_MESSAGE = range(5)
+    HEADERS = ("时间", "级别", "文件:行号", "任务", "消息")
+
+    def __init__(self, max_rows=None, parent=None):
+        super().__init__(parent)
+        self.max_rows = max_rows
+        self._entries = []
+        self._base = 0           # 已裁剪掉的行数，绝对行号 = _base + 行号
+        self._level_rows = {}    # 级别 -> array('q') 绝对行号
+        self._task_rows = {}     # task_id -> array('q') 绝对行号
+        self._task_level_rows = {}  # (task_id, 级别) -> array('q') 绝对行号
+        self._time_cache = {}
+
+    # ---- Qt 模型接口 ----
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._entries)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        return self.data_at(index.row(), index.column(), role)
+
+    def data_at(self, row, column, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole and role != Qt.ToolTipRole:
+            return None
+        entry = self.entry(row)
+        if column == self.COLUMN_TIME:
+            return self.format_time(entry.timestamp)
+        if column == self.COLUMN_LEVEL:
+            return entry.level
+        if column == self.COLUMN_FILE:
+            return f"{entry.file}:{entry.line}"
+        if column == self.COLUMN_TASK:
+            if not entry.task:
+                return ""
+            text = f"{entry.task} +{entry.task_elapsed:.0f}ms"
+            if role == Qt.ToolTipRole and entry.task_parent:
+                text += f"\n父任务: {entry.task_parent}"
+            return text
+        return entry.message
+
+    # ---- 数据操作 ----
+    def format_time(self, timestamp):
+        second = int(timestamp)
+        text = self._time_cache.get(second)
+        if text is None:
+            if len(self._time_cache) > 4096:
+                self._time_cache.clear()
+            text = self._time_cache[second] = time.strftime('%H:%M:%S', time.localtime(second))
+        return text
+
+    def entry(self, row):
+        return self._entries[row]
+
+    def entries(self):
+        return self._entries
+
+    def set_entries(self, entries):
+        self.beginResetModel()
+        self._entries = list(entries)
+        self._base = 0
+        self._level_rows = {}
+        self._task_rows = {}
+        self._task_level_rows = {}
+        self._index_levels(0, self._entries)
+        self.endResetModel()
+        self._trim()
+
+    def append_entries(self, entries):
+        if not entries:
+            return
+        first = len(self._entries)
+        self.beginInsertRows(QModelIndex(), first, first + len(entries) - 1)
+        self._entries.extend(entries)
+        self._index_levels(self._base + first, entries)
+        self.endInsertRows()
+        self._trim()
+
+    def _index_levels(self, start, entries):
+        level_rows = self._level_rows
+        for offset, entry in enumerate(entries, start):
+            rows = level_rows.get(entry.level)
+            if rows is None:
+                rows = level_rows[entry.level] = array('q')
+            rows.append(offset)
+            if entry.task:
+                self._index_row(self._task_rows, entry.task, offset)
+                self._index_row(self._task_level_rows, (entry.task, entry.level), offset)
+
+    @staticmethod
+    def _index_row(index, key, row):
+        rows = index.get(key)
+        if rows is None:
+            rows = index[key] = array('q')
+        rows.append(row)
+
+    def _trim(self):
+        if not self.max_rows or len(self._entries) <= self.max_rows:
+            return
+        # 批量裁剪，避免每追加一行就移动一次整个列表
+        excess = len(self._entries) - self.max_rows + self.max_rows // 10
+        excess = min(excess, len(self._entries))
+        self.beginRemoveRows(QModelIndex(), 0, excess - 1)
+        del self._entries[:excess]
+        self._base += excess
+        for rows in self._level_rows.values():
+            del rows[:bisect_left(rows, self._base)]
+        for index in (self._task_rows, self._task_level_rows):
+            for key in list(index):
+                rows = index[key]
+                del rows[:bisect_left(rows, self._base)]
+                if not rows:
+                    del index[key]  # 任务的记录已全部被裁剪
+        self.endRemoveRows()
+
+    # ---- 供代理模型使用 ----
+    @property
+    def base(self):
+        return self._base
+
+    def level_rows(self, level):
+        rows = self._level_rows.get(level)
+        if rows is None:
+            rows = self._level_rows[level] = array('q')
+        return rows
+
+    def level_count(self, level):
+        rows = self._level_rows.get(level)
+        return len(rows) if rows is not None else 0
+
+    def filter_rows(self, level=None, task=None):
+        """返回满足级别/任务条件的绝对行号数组，两者都为 None 时返回 None（不过滤）"""
+        if task is None:
+            return None if level is None else self.level_rows(level)
+        index, key = (self._task_rows, task) if level is None else (self._task_level_rows, (task, level))
+        rows = index.get(key)
+        return rows if rows is not None else array('q')
+
+    def task_ids(self):
+        """当前保留的记录中出现过的任务"""
+        return list(self._task_rows)
+
+
+class MappedLogModel(LogTableModel):
+    """历史日志文件模型：行数据按需从 MappedLogFile 解析
+
+    后台建立行索引时通过 lines_indexed 信号（自动排队到 GUI 线程）逐步增加行数，
+    文件刚打开就能浏览已索引的部分。
+    """
+
+    lines_indexed = Signal(int)
+
+    def __init__(self, mapped_file, parent=None):
+        super().__init__(parent=parent)
+        self.mapped_file = mapped_file
+        self._rows = 0
+        self.lines_indexed.connect(self.set_row_count)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._rows
+
+    def entry(self, row):
+        return self.mapped_file.entry(row)
+
+    def entries(self):
+        return []
+
+    def set_row_count(self, count):
+        if count > self._rows:
+            self.beginInsertRows(QModelIndex(), self._rows, count - 1)
+            self._rows = count
+            self.endInsertRows()
+
+
+class LogLevelProxyModel(QAbstractProxyModel):
+    """按日志级别和任务过滤的代理模型
+
+    直接复用源模型维护的行号索引，切换过滤条件是 O(1) 的，
+    不需要对每一行调用一次 filterAcceptsRow。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._level = None   # None 表示显示全部
+        self._task = None    # None 表示不按任务过滤
+        self._rows = None
+        self._count = 0
+        self._pending_remove = 0
+
+    def setSourceModel(self, model):
+        old = self.sourceModel()
+        if old is not None:
+            old.rowsInserted.disconnect(self._on_rows_inserted)
+            old.rowsAboutToBeRemoved.disconnect(self._on_rows_about_to_be_removed)
+            old.rowsRemoved.disconnect(self._on_rows_removed)
+            old.modelReset.disconnect(self._on_model_reset)
+        self.beginResetModel()
+        super().setSourceModel(model)
+        model.rowsInserted.connect(self._on_rows_inserted)
+        model.rowsAboutToBeRemoved.connect(self._on_rows_about_to_be_removed)
+        model.rowsRemoved.connect(self._on_rows_removed)
+        model.modelReset.connect(self._on_model_reset)
+        self._refresh()
+        self.endResetModel()
+
+    def set_level(self, level):
+        """设置过滤级别，'ALL' 或 None 表示显示全部"""
+        level = None if level in (None, 'ALL') else FILTER_LEVELS.get(level, level)
+        if level == self._level:
+            return
+        self.beginResetModel()
+        self._level = level
+        self._refresh()
+        self.endResetModel()
+
+    def level(self):
+        return self._level
+
+    def set_task(self, task):
+        """只显示某个任务产生的日志，None 表示不按任务过滤"""
+        task = task or None
+        if task == self._task:
+            return
+        self.beginResetModel()
+        self._task = task
+        self._refresh()
+        self.endResetModel()
+
+    def task(self):
+        return self._task
+
+    def _refresh(self):
+        source = self.sourceModel()
+        if source is None:
+            self._rows, self._count = None, 0
+            return
+        self._rows = source.filter_rows(self._level, self._task)
+        self._count = source.rowCount() if self._rows is None else len(self._rows)
+
+    def _source_length(self):
+        source = self.sourceModel()
+        return source.rowCount() if self._rows is None else len(self._rows)
+
+    def _on_rows_inserted(self, parent, first, last):
+        # 任务的行号数组可能在裁剪时被删除、追加时重新创建，每次重新取一次
+        self._rows = self.sourceModel().filter_rows(self._level, self._task)
+        new_count = self._source_length()
+        if new_count > self._count:
+            self.beginInsertRows(QModelIndex(), self._count, new_count - 1)
+            self._count = new_count
+            self.endInsertRows()
+
+    def _on_rows_about_to_be_removed(self, parent, first, last):
+        # 源模型只会从头部裁剪
+        source = self.sourceModel()
+        if self._rows is None:
+            removed = last - first + 1
+        else:
+            removed = bisect_left(self._rows, source.base + last + 1)
+        self._pending_remove = removed
+        if removed:
+            self.beginRemoveRows(QModelIndex(), 0, removed - 1)
+
+    def _on_rows_removed(self, parent, first, last):
+        if self._pending_remove:
+            self._count -= self._pending_remove
+            self._pending_remove = 0
+            self.endRemoveRows()
+
+    def _on_model_reset(self):
+        self.beginResetModel()
+        self._refresh()
+        self.endResetModel()
+
+    # ---- 映射 ----
+    def source_row(self, row):
+        if self._rows is None:
+            return row
+        return self._rows[row] - self.sourceModel().base
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid() or self.sourceModel() is None:
+            return QModelIndex()
+        return self.sourceModel().index(self.source_row(proxy_index.row()), proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        row = source_index.row()
+        if self._rows is not None:
+            absolute = self.sourceModel().base + row
+            row = bisect_left(self._rows, absolute)
+            if row >= self._count or self._rows[row] != absolute:
+                return QModelIndex()
+        return self.index(row, source_index.column())
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or row < 0 or row >= self._count or column < 0 or column >= self.columnCount():
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._count
+
+    def columnCount(self, parent=QModelIndex()):
+        source = self.sourceModel()
+        return 0 if parent.isValid() or source is None else source.columnCount()
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        source = self.sourceModel()
+        return source.headerData(section, orientation, role) if source is not None else None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        return self.sourceModel().data_at(self.source_row(index.row()), index.column(), role)
+
+    def entry(self, row):
+        return self.sourceModel().entry(self.source_row(row))
+
+
+class LogItemDelegate(QStyledItemDelegate):
+    """日志行绘制委托：按级别着色，文件:行号列使用等宽蓝色字体
+
+    直接用 QPainter 绘制单行文本，不走完整的样式计算，滚动时只绘制可见行。
+    """
+
+    HIGHLIGHT_COLOR = QColor("#FFE4B5")
+    CURRENT_HIGHLIGHT_COLOR = QColor("#FFB74D")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.bold_font = None
+        # 搜索匹配提供者：index -> [(起始, 结束, 是否当前匹配), ...]
+        self.match_provider = None
+
+    def paint(self, painter, option, index):
+        painter.save()
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(option.rect, QColor("#E3F2FD"))
+
+        column = index.column()
+        text = index.data(Qt.DisplayRole) or ""
+        font = option.font
+        if column == LogTableModel.COLUMN_LEVEL:
+            painter.setPen(LEVEL_COLORS.get(text, DEFAULT_LEVEL_COLOR))
+            if self.bold_font is None:
+                self.bold_font = QFont(font)
+                self.bold_font.setBold(True)
+            font = self.bold_font
+        elif column == LogTableModel.COLUMN_FILE:
+            painter.setPen(FILE_COLOR)
+        elif column == LogTableModel.COLUMN_TIME:
+            painter.setPen(TIME_COLOR)
+        elif column == LogTableModel.COLUMN_TASK:
+            painter.setPen(TASK_COLOR)
+        else:
+            painter.setPen(DEFAULT_LEVEL_COLOR)
+
+        painter.setFont(font)
+        rect = option.rect.adjusted(8, 0, -8, 0)
+        metrics = option.fontMetrics
+        elided = metrics.elidedText(text, Qt.ElideRight, rect.width())
+        if self.match_provider is not None and column == LogTableModel.COLUMN_MESSAGE:
+            spans = self.match_provider(index)
+            if spans:
+                self._paint_highlight(painter, metrics, rect, elided, spans, elided != text)
+        painter.drawText(rect, Qt.AlignVCenter | Qt.AlignLeft, elided)
+        painter.restore()
+
+    def _paint_highlight(self, painter, metrics, rect, text, spans, elided):
+        # 被省略号截断的部分不再绘制高亮
+        visible = len(text) - 1 if elided else len(text)
+        for start, end, current in spans:
+            if start >= visible:
+                continue
+            end = min(end, visible)
+            x = rect.left() + metrics.horizontalAdvance(text[:start])
+            width = metrics.horizontalAdvance(text[start:end])
+            color = self.CURRENT_HIGHLIGHT_COLOR if current else self.HIGHLIGHT_COLOR
+            painter.fillRect(x, rect.top() + 2, width, rect.height() - 4, color)
+
+
+class LogTableView(QTableView):
+    """固定行高的日志表格视图，百万行时也只布局和绘制可见区域"""
+
+    ROW_HEIGHT = 24
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setItemDelegate(LogItemDelegate(self))
+        self.setShowGrid(False)
+        self.setWordWrap(False)
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+
+        vertical = self.verticalHeader()
+        vertical.setVisible(False)
+        vertical.setSectionResizeMode(QHeaderView.Fixed)
+        vertical.setDefaultSectionSize(self.ROW_HEIGHT)
+
+        horizontal = self.horizontalHeader()
+        horizontal.setVisible(False)
+        horizontal.setSectionResizeMode(QHeaderView.Interactive)
+        horizontal.setStretchLastSection(True)
+
+    def setModel(self, model):
+        super().setModel(model)
+        header = self.horizontalHeader()
+        header.resizeSection(LogTableModel.COLUMN_TIME, 90)
+        header.resizeSection(LogTableModel.COLUMN_LEVEL, 80)
+        header.resizeSection(LogTableModel.COLUMN_FILE, 260)
+        header.resizeSection(LogTableModel.COLUMN_TASK, 160)
+
+    def is_at_bottom(self):
+        bar = self.verticalScrollBar()
+        return bar.value() >= bar.maximum()
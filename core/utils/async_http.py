@@ -0,0 +1,72 @@
+'''
+协程里使用的 HTTP 请求
+
+事件循环接入 Qt 主循环时用 QNetworkAccessManager 发请求，等待响应期间不占用任何线程；
+退回到独立线程的事件循环时改用 requests 在线程池上执行。
+'''
+import asyncio
+import json
+from typing import Optional
+import requests
+from PySide6.QtCore import QUrl
+from PySide6.QtNetwork import QNetworkAccessManager, QNetworkRequest
+from core.thread.async_loop import async_loop
+
+_manager: Optional[QNetworkAccessManager] = None
+
+
+class HttpResponse:
+    """与 requests.Response 常用属性一致的简单响应"""
+
+    def __init__(self, url: str, status_code: int, content: bytes):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+async def http_get(url: str, headers: Optional[dict] = None, timeout: float = 3.0) -> HttpResponse:
+    """GET 请求，网络错误或超时抛出 ConnectionError / TimeoutError，HTTP 错误码照常返回"""
+    if async_loop.mode == 'qt':
+        return await _qt_get(url, headers or {}, timeout)
+    response = await asyncio.to_thread(requests.get, url, headers=headers, timeout=timeout)
+    return HttpResponse(url, response.status_code, response.content)
+
+
+async def _qt_get(url: str, headers: dict, timeout: float) -> HttpResponse:
+    global _manager
+    if _manager is None:
+        _manager = QNetworkAccessManager()
+
+    request = QNetworkRequest(QUrl(url))
+    for name, value in headers.items():
+        request.setRawHeader(name.encode('utf-8'), value.encode('utf-8'))
+    request.setTransferTimeout(int(timeout * 1000))
+
+    future = asyncio.get_running_loop().create_future()
+    reply = _manager.get(request)
+
+    def on_finished():
+        if not future.done():
+            status = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
+            if status is not None:
+                future.set_result(HttpResponse(url, int(status), bytes(reply.readAll().data())))
+            elif reply.error() == reply.NetworkError.OperationCanceledError:
+                future.set_exception(TimeoutError(f"请求超时: {url}"))
+            else:
+                future.set_exception(ConnectionError(reply.errorString()))
+        reply.deleteLater()
+
+    reply.finished.connect(on_finished)
+    try:
+        return await future
+    except asyncio.CancelledError:
+        # 协程被取消（例如发起请求的控件已销毁）时中止请求
+        reply.abort()
+        raise
@@ -2,10 +2,15 @@ from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import Qt
 from core.font.font_manager import FontManager
 from core.log.log_manager import log
+from core.thread.async_loop import async_loop
+from core.log.log_retention import LogRetention, RetentionPolicy
 from core.pages_core.pages_manager import PagesManager
 import os
+import json
 
 class InitializationManager:
+    log_retention = None
+    
     @staticmethod
     def init_log_directory():
         # 确保日志目录存在
@@ -13,9 +18,47 @@ class InitializationManager:
         os.makedirs(log_dir, exist_ok=True)
         log.info("日志目录初始化完成")
 
+    @staticmethod
+    def init_log_pipeline(config_file='config.json'):
+        # 原生崩溃和未捕获异常都转储最后的日志
+        log.install_crash_hooks()
+        
+        # 根据配置开启异步日志（默认保持同步写入）
+        config = {}
+        try:
+            if os.path.exists(config_file):
+                with open(config_file, 'r', encoding='utf-8') as f:
+                    config = json.load(f)
+            if 'log_buffer_size' in config:
+                log.set_ring_buffer_capacity(int(config['log_buffer_size']))
+            if config.get('log_async', False):
+                log.enable_async(
+                    capacity=int(config.get('log_queue_size', 10000)),
+                    policy=config.get('log_overflow_policy', 'block')
+                )
+        except Exception as e:
+            log.error(f"初始化异步日志失败: {str(e)}")
+        
+        # 启动后在后台清理和压缩旧日志（未配置时使用默认策略）
+        try:
+            max_mb = config.get('log_retention_max_mb', 200)
+            policy = RetentionPolicy(
+                max_total_bytes=int(max_mb * 1024 * 1024) if max_mb else None,
+                max_age_days=config.get('log_retention_days', 30),
+                max_sessions=config.get('log_retention_sessions', 50),
+                compress=config.get('log_compress', True)
+            )
+            InitializationManager.log_retention = LogRetention(log.log_dir, log.log_file, policy)
+            InitializationManager.log_retention.schedule(config.get('log_retention_delay', 30))
+        except Exception as e:
+            log.error(f"初始化日志清理失败: {str(e)}")
+
     @staticmethod
     def init_application():
         app = QApplication([])
+        InitializationManager.init_log_pipeline()
+        # asyncio 事件循环接入 Qt 主循环，主程序用 async_loop.run(app) 启动
+        async_loop.install()
         # 设置应用程序属性
         app.setAttribute(Qt.AA_DontShowIconsInMenus, True)
         app.setQuitOnLastWindowClosed(True)
@@ -1,17 +1,42 @@
-import requests
+import asyncio
 import random
 import time
 from core.log.log_manager import log
 from core.thread.thread_manager import thread_manager
+from core.thread.qt_future import QtFuture
+from core.utils.async_http import http_get
 from typing import Callable, List, Tuple, Optional
-from PySide6.QtCore import QObject, Signal
 
-class YiyanAPI(QObject):
-    # 定义信号
-    hitokoto_ready = Signal(str)
-    
+# 添加请求头 
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': '*/*',
+    'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
+    'Connection': 'keep-alive',
+    'Referer': 'https://hitokoto.cn/',
+    'Origin': 'https://hitokoto.cn',
+    'X-User': 'ClutUI-Nextgen'
+}
+
+APIS = [
+    ('https://v1.hitokoto.cn/?c=a&encode=json', lambda r: r.json()['hitokoto']),
+    ('https://api.oick.cn/yiyan/api.php', lambda r: r.text),
+    ('https://api.apiopen.top/api/sentences', lambda r: r.json()['result']['name']),
+    ('https://v1.jinrishici.com/all.json', lambda r: r.json()['content']),
+    ('https://api.xygeng.cn/one', lambda r: r.json()['data']['content']),
+    ('https://saying.api.azwcl.com/saying/get', lambda r: r.json()['data']['content'])
+]
+
+# 合并重复获取的时间窗口(秒)
+REQUEST_TTL = 5.0
+
+class YiyanAPI:
+    # 缓存由所有实例共用：submit_once 把各页面的获取合并成一次请求，
+    # 实际执行的是最先提交的那个实例，结果要对每个实例都可见
+    cached_quotes: List[str] = []
+    last_request_time = 0.0
+
     def __init__(self):
-        super().__init__()
         # 备用的一言列表，当API请求失败时使用 
         self.fallback_quotes = [
             "ClutUI Nextgen Welcome ",
@@ -27,29 +52,26 @@ class YiyanAPI(QObject):
         ]
         
         # 缓存最近获取的一言，避免频繁请求API
-        self.cached_quotes = []
         self.max_cache_size = 10
-        self.last_request_time = 0
         self.cache_ttl = 3600  # 缓存有效期(秒)
         
-    def get_hitokoto_async(self):
-        """异步获取一言，立即返回一个临时值，并在后台获取新的一言"""
-        def fetch_hitokoto():
-            result = self.get_hitokoto_sync()
-            # 使用信号发送结果到主线程
-            self.hitokoto_ready.emit(result)
-            
-        # 使用线程管理器提交任务
-        thread_manager.submit_task("fetch_hitokoto", fetch_hitokoto)
+    def get_hitokoto_async(self, owner=None) -> QtFuture:
+        """异步获取一言，返回的 QtFuture 用 on_done 在界面线程上接收结果
+
+        请求和重试等待都在 asyncio 事件循环上进行，不占用线程；owner 控件销毁时自动取消。
+        多个页面同时获取时只发一次请求，REQUEST_TTL 秒内的重复获取直接复用上次的结果。
+        """
+        return thread_manager.submit_once("fetch_hitokoto", self.fetch_hitokoto,
+                                          ttl=REQUEST_TTL, owner=owner)
         
-        # 优先从缓存中返回，如果缓存为空则返回备用语句
+    def get_cached_hitokoto(self) -> str:
+        """立即返回一句，不发起请求：优先从缓存中返回，如果缓存为空则返回备用语句"""
         if self.cached_quotes:
             return random.choice(self.cached_quotes)
         return random.choice(self.fallback_quotes)
         
-    def get_hitokoto_sync(self) -> str:
-        """同步获取一言，如果API失败则返回备用语句"""
-        # 检查缓存是否有效
+    async def fetch_hitokoto(self) -> str:
+        """获取一言，如果API失败则返回备用语句"""
         current_time = time.time()
         if (current_time - self.last_request_time < self.cache_ttl and 
             len(self.cached_quotes) > 0):
@@ -57,36 +79,15 @@ class YiyanAPI(QObject):
             return random.choice(self.cached_quotes)
             
         try:
-            # 添加请求头 
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': '*/*',
-                'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
-                'Connection': 'keep-alive',
-                'Referer': 'https://hitokoto.cn/',
-                'Origin': 'https://hitokoto.cn',
-                'X-User': 'ClutUI-Nextgen'
-            }
-            
-            apis = [
-                ('https://v1.hitokoto.cn/?c=a&encode=json', lambda r: r.json()['hitokoto']),
-                ('https://api.oick.cn/yiyan/api.php', lambda r: r.text),
-                ('https://api.apiopen.top/api/sentences', lambda r: r.json()['result']['name']),
-                ('https://v1.jinrishici.com/all.json', lambda r: r.json()['content']),
-                ('https://api.xygeng.cn/one', lambda r: r.json()['data']['content']),
-                ('https://saying.api.azwcl.com/saying/get', lambda r: r.json()['data']['content'])
-            ]
-            
+            apis = list(APIS)
             random.shuffle(apis)
             
             for api_url, parse_func in apis:
-                result = self._try_request_with_retry(api_url, parse_func, headers)
+                result = await self._request_with_retry_async(api_url, parse_func, HEADERS)
                 if result:
-                    # 更新缓存
                     self._update_cache(result)
                     return result
             
-            # 如果所有API都失败了，返回备用语句
             log.warning("所有API请求都失败了，使用备用语句")
             return random.choice(self.fallback_quotes)
                 
@@ -94,26 +95,22 @@ class YiyanAPI(QObject):
             log.error(f"获取一言/诗词失败: {str(e)}")
             return random.choice(self.fallback_quotes)
             
-    def _try_request_with_retry(self, api_url: str, parse_func: Callable, 
-                               headers: dict, max_retries: int = 2) -> Optional[str]:
-        """尝试请求API，支持重试机制"""
+    async def _request_with_retry_async(self, api_url: str, parse_func: Callable, 
+                                        headers: dict, max_retries: int = 2) -> Optional[str]:
+        """尝试请求API，支持重试机制，重试等待用 asyncio.sleep"""
         for attempt in range(max_retries + 1):
             try:
-                response = requests.get(api_url, headers=headers, timeout=3)
+                response = await http_get(api_url, headers=headers, timeout=3)
                 
                 if response.status_code == 200:
                     return parse_func(response)
-                else:
-                    log.warning(f"API {api_url} 返回状态码: {response.status_code}, 尝试 {attempt+1}/{max_retries+1}")
-                    if attempt < max_retries:
-                        time.sleep(0.5)  # 重试前等待
-                    continue
+                log.warning(f"API {api_url} 返回状态码: {response.status_code}, 尝试 {attempt+1}/{max_retries+1}")
                     
             except Exception as e:
                 log.warning(f"API {api_url} 请求失败: {str(e)}, 尝试 {attempt+1}/{max_retries+1}")
-                if attempt < max_retries:
-                    time.sleep(0.5)  # 重试前等待
-                continue
+                
+            if attempt < max_retries:
+                await asyncio.sleep(0.5)  # 重试前等待
         
         return None
         
@@ -124,4 +121,4 @@ class YiyanAPI(QObject):
                 self.cached_quotes.pop(0)  # 移除最旧的缓存
             self.cached_quotes.append(quote)
             
-        self.last_request_time = time.time()
+        YiyanAPI.last_request_time = time.time()
@@ -1,8 +1,12 @@
 from PySide6.QtWidgets import QApplication
 from core.log.log_manager import log
 from core.animations.close_app import CloseAppAnimation
+from core.thread.thread_manager import thread_manager
 
 class WindowManager:
+    # 关闭动画结束后最多再等后台任务多久（秒），超时的任务直接放弃
+    SHUTDOWN_DEADLINE = 1.5
+
     @staticmethod
     def handle_close_event(window, event):
         if window._closing:
@@ -16,7 +20,10 @@ class WindowManager:
             
             # 停止所有动画
             window.pages_manager.stop_animations()
-            
+
+            # 还没创建的页面不再创建
+            window.pages_manager.cancel_pending_pages()
+
             # 确保所有页面都停止扫描
             stacked_widget = window.pages_manager.get_stacked_widget()
             for i in range(stacked_widget.count()):
@@ -24,6 +31,9 @@ class WindowManager:
                 if hasattr(page, 'safe_cleanup'):
                     page.safe_cleanup()
             
+            # 取消排队中的任务，通知执行中的任务在关闭动画期间自行结束
+            thread_manager.begin_shutdown()
+            
             # NEW: Close App Animation [Beta]
             window._close_animation = CloseAppAnimation(window)
             window._close_animation.start()
@@ -35,6 +45,9 @@ class WindowManager:
     @staticmethod
     def finish_close(window):
         try:
+            # 等待后台任务结束，超过期限的放弃并记录
+            thread_manager.shutdown(deadline=WindowManager.SHUTDOWN_DEADLINE)
+            
             # 强制清理所有页面的引用
             stacked_widget = window.pages_manager.get_stacked_widget()
             while stacked_widget.count() > 0:
@@ -53,22 +66,22 @@ class WindowManager:
         except Exception as e:
             log.error(f"Error: 中头彩了|{str(e)}")
             window.close()
+        finally:
+            # 写出异步队列中剩余的日志
+            log.disable_async()
 
     @staticmethod
     def switch_page(window, page_name):
         try:
-            # 获取页面索引
-            page_index = {
-                "快速开始": 0,
-                "关于": 1,
+            # 获取页面名称，页面可能还没创建（堆叠窗口里是占位控件），交给页面管理器创建并切换
+            page_key = {
+                "快速开始": "quick_start",
+                "关于": "about",
             }.get(page_name)
             
-            if page_index is not None:
-                # 切换到对应页面
-                window.pages_manager.get_stacked_widget().setCurrentIndex(page_index)
-                # 更新侧边栏选中状态
-                if hasattr(window, 'sidebar'):
-                    window.sidebar.select_item(page_name)
+            if page_key is not None:
+                # 切换到对应页面，侧边栏按钮状态由页面管理器更新
+                window.pages_manager.switch_page(page_key)
                 log.info(f"切换到页面: {page_name}")
             else:
                 log.error(f"未找到页面: {page_name}")
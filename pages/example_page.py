@@ -8,6 +8,7 @@ from core.animations.scroll_hide_show import ScrollBarAnimation
 from core.ui.notice import Notice
 from core.i18n import i18n
 from core.utils.yiyanapi import YiyanAPI
+from core.thread.frame_queue import frame_queue
 
 class ExamplePage(QWidget):
     def __init__(self, parent=None):
@@ -114,8 +115,9 @@ class ExamplePage(QWidget):
         notice_layout = QVBoxLayout(notice_container)
         notice_layout.setContentsMargins(40, 20, 40, 0)
         
-        hitokoto = self.yiyan_api.get_hitokoto_sync()
-        self.notice = Notice(message=hitokoto, icon="info")
+        # 先显示缓存的一句，获取到新的一言后再替换
+        self.notice = Notice(message=self.yiyan_api.get_cached_hitokoto(), icon="info")
+        self.yiyan_api.get_hitokoto_async(owner=self.notice).on_done(self.notice.set_message)
         notice_layout.addWidget(self.notice)
         self.layout.addWidget(notice_container)
         
@@ -149,22 +151,37 @@ class ExamplePage(QWidget):
         layout.setContentsMargins(40, 20, 40, 20)
         layout.setSpacing(20)
         
-        # 原有的按钮和卡片内容
+        # 按钮和卡片分帧添加：页面框架先显示出来，内容在之后的几次事件循环里逐个填入
+        self._build = frame_queue.batch("example_page", owner=self)
+        self._build.add(lambda: self._add_buttons(layout))
+        for title, description in self._card_texts():
+            self._build.add(lambda title=title, description=description:
+                            self._add_card(layout, title, description))
+        self._build.add(layout.addStretch)
+        
+        # 设置滚动区域的内容
+        scroll_area.setWidget(container)
+        scroll_container_layout.addWidget(scroll_area)
+        
+        # 将滚动容器添加到主布局
+        self.layout.addWidget(scroll_container)
+
+    def _add_buttons(self, layout):
         button_layout = QHBoxLayout()
         button_layout.setSpacing(12)
-        
+
         # 基础消息框按钮
         basic_btn = QPushButton("基础消息框")
         self.font_manager.apply_normal_style(basic_btn)
         basic_btn.setFixedSize(120, 36)
         basic_btn.clicked.connect(self.show_basic_message)
-        
+
         # 确认消息框按钮
         confirm_btn = QPushButton("确认消息框")
         self.font_manager.apply_normal_style(confirm_btn)
         confirm_btn.setFixedSize(120, 36)
         confirm_btn.clicked.connect(self.show_confirm_message)
-        
+
         # 自定义消息框按钮
         custom_btn = QPushButton("自定义消息框")
         self.font_manager.apply_normal_style(custom_btn)
@@ -176,28 +193,23 @@ class ExamplePage(QWidget):
         button_layout.addWidget(custom_btn)
         button_layout.addStretch()
         layout.addLayout(button_layout)
-        
+
+    @staticmethod
+    def _card_texts():
         text = """在PySide6开发中，文本自动换行和图标管理是两个常见的UI优化问题。本文将从以下几个方面详细讲解实现步骤：首先，我们需要使用QLabel的setWordWrap和setMaximumWidth属性来实现基础的文本换行功能。其次，通过自定义的format_text_with_breaks方法，我们可以在指定字符数后强制换行，避免单行文本过长，超出屏幕导致的观感不协调。对于图标，我采用了FontManager类来统一管理Material Icons字体图标
 在处理长文本显示时，我实现了展开/收起功能，默认显示两行文本并在末尾显示省略号，用户点击展开后可以查看完整内容。这样有利于软件的观感，而不是一大篇文章，对于文本宽度控制，我通过setMaximumWidth和elideText等方法确保文本不会超出卡片边界。
 最后，我们还优化了卡片的视觉效果，添加了阴影、圆角和悬浮状态"""
-        
-        info_card = CardWhite(
-            title="我是帖子Title",
-            description="简单的提示消息,只包含一个确定按钮",
-        )
-        
-        confirm_card = CardWhite(
-            title="我是帖子Title",
-            description="包含确认和取消按钮,用于需要用户确认的操作",
-        )
-        
-        custom_card = CardWhite(
-            title="论我是如何将本卡片的自动换行和图标完善的？在Pyside6中实现这些的步骤总共有哪些？过长的言论会不会飘出屏幕？这些都是很好的问题，本篇文章将详细描述",
-            description=text
-        )
-        
+        return [
+            ("我是帖子Title", "简单的提示消息,只包含一个确定按钮"),
+            ("我是帖子Title", "包含确认和取消按钮,用于需要用户确认的操作"),
+            ("论我是如何将本卡片的自动换行和图标完善的？在Pyside6中实现这些的步骤总共有哪些？过长的言论会不会飘出屏幕？这些都是很好的问题，本篇文章将详细描述", text),
+        ]
+
+    def _add_card(self, layout, title, description):
+        card = CardWhite(title=title, description=description)
+
         # 设置卡片样式
-        card_style = """
+        card.setStyleSheet("""
             CardWhite {
                 background: transparent;
                 border-radius: 12px;
@@ -220,23 +232,8 @@ class ExamplePage(QWidget):
                 line-height: 1.6;
                 letter-spacing: 0.2px;
             }
-        """
-        
-        info_card.setStyleSheet(card_style)
-        confirm_card.setStyleSheet(card_style)
-        custom_card.setStyleSheet(card_style)
-        
-        layout.addWidget(info_card)
-        layout.addWidget(confirm_card)
-        layout.addWidget(custom_card)
-        layout.addStretch()
-        
-        # 设置滚动区域的内容
-        scroll_area.setWidget(container)
-        scroll_container_layout.addWidget(scroll_area)
-        
-        # 将滚动容器添加到主布局
-        self.layout.addWidget(scroll_container)
+        """)
+        layout.addWidget(card)
 
     def show_basic_message(self):
         message_box = MessageBoxWhite(
@@ -3,16 +3,15 @@ from core.ui.expandable_card import ExpandableCard
 from core.utils.notif import Notification, NotificationType, show_info
 from core.ui.scroll_style import ScrollStyle
 from core.ui.progress_bar import ProgressBar
-from PySide6.QtCore import QTimer
+from core.thread.scheduler import scheduler
 
 class ExpandableExamplePage(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setup_ui()
         
-        # 创建定时器用于动态更新进度
-        self.progress_timer = QTimer(self)
-        self.progress_timer.timeout.connect(self.update_progress)
+        # 动态更新进度的定时任务，页面隐藏时自动暂停
+        self.progress_job = None
         self.current_progress = 0
         
     def setup_ui(self):
@@ -210,22 +209,27 @@ class ExpandableExamplePage(QWidget):
             widget.show()
         
     def toggle_progress(self):
-        if self.progress_timer.isActive():
-            self.progress_timer.stop()
+        if self.progress_job is not None:
+            self._stop_progress()
             self.start_button.setText("开始")
             self.current_progress = 0
             self.dynamic_progress.setProgress(0, animated=False)
         else:
             self.current_progress = 0
             self.dynamic_progress.setProgress(0, animated=False)
-            self.progress_timer.start(100)  # 每100ms更新一次
+            self.progress_job = scheduler.call_every(0.1, self.update_progress, owner=self)  # 每100ms更新一次
             self.start_button.setText("重置")
             
     def update_progress(self):
         if self.current_progress >= 100:
-            self.progress_timer.stop()
+            self._stop_progress()
             self.start_button.setText("开始")
             return
             
         self.current_progress = min(self.current_progress + 2, 100)  # 每次增加2%，最大不超过100%
-        self.dynamic_progress.setProgress(self.current_progress, animated=True) 
\ No newline at end of file
+        self.dynamic_progress.setProgress(self.current_progress, animated=True)
+        
+    def _stop_progress(self):
+        if self.progress_job is not None:
+            self.progress_job.cancel()
+            self.progress_job = None
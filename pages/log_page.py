@@ -1,29 +1,130 @@
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QTextEdit, QLabel, 
-                             QHBoxLayout, QLineEdit, QPushButton, QScrollBar)
-from PySide6.QtCore import Qt, QTimer, QRegularExpression
-from PySide6.QtGui import QTextCharFormat, QColor, QTextCursor
+import os
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, 
+                             QHBoxLayout, QLineEdit, QPushButton, QScrollBar, QComboBox)
+from PySide6.QtCore import Qt, QTimer, Signal
 from core.log.log_manager import log
+from core.log.log_tail import LogTailer
+from core.log.log_mmap import MappedLogFile, list_log_sessions, rotated_segments
+from core.log.log_stats import load_log_stats
+from core.thread.thread_manager import thread_manager
+from core.thread.task_context import current_token
+from core.thread.scheduler import scheduler
 from core.ui.scroll_style import ScrollStyle
+from core.ui.log_view import LogTableModel, LogLevelProxyModel, LogTableView, MappedLogModel
+from core.log.log_search import (LogSearchEngine, SEARCH_PLAIN, SEARCH_IGNORE_CASE,
+                                 SEARCH_REGEX, SEARCH_REGEX_IGNORE_CASE)
 from core.font.font_pages_manager import FontPagesManager
 from core.i18n import i18n
-import os
-import re
+
+# 实时日志流的合并间隔（秒）
+LOG_STREAM_INTERVAL = 0.1
+
+# 增量读取日志文件时页面最多保留的记录数
+LOG_TAIL_MAX_ENTRIES = 50000
+
+# 搜索输入防抖间隔（毫秒）
+SEARCH_DEBOUNCE_MS = 250
+
+# 任务下拉框最多列出的任务数（超出时移除最早出现的）
+MAX_LISTED_TASKS = 200
+
+TOOL_BUTTON_STYLE = """
+    QPushButton {
+        padding: 8px 15px;
+        border: 1px solid #E0E0E0;
+        border-radius: 5px;
+        font-size: 13px;
+        background: white;
+        color: #666666;
+    }
+    QPushButton:checked {
+        background: #2196F3;
+        color: white;
+        border: 1px solid #1976D2;
+    }
+    QPushButton:hover {
+        background: #E3F2FD;
+    }
+    QPushButton:checked:hover {
+        background: #1976D2;
+    }
+"""
+
+COMBO_STYLE = """
+    QComboBox {
+        padding: 5px 10px;
+        border: 1px solid #E0E0E0;
+        border-radius: 5px;
+        background: white;
+        color: #666666;
+    }
+"""
 
 class LogPage(QWidget):
+    # 后台建立索引的进度 (模型, 行数)，排队送回界面线程后只转给仍在显示的历史模型
+    _history_progress = Signal(object, int)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.current_filter = 'ALL'  # 添加当前过滤级别的记录
         self.font_manager = FontPagesManager()  # 添加字体管理器
-        self.last_content = ""  # 添加变量保存上次的内容
-        self.last_update_time = 0  # 添加变量记录上次更新时间
         self.auto_scroll = True  # 添加自动滚动标志
+        
+        self.tailer = None
+        self.update_timer = None
+        
+        # 历史模式：浏览内存映射的旧会话日志
+        self.history_file = None
+        self.history_model = None
+        self.history_stats = None
+        self.history_index = None
+        self.history_task = None
+        self._history_progress.connect(self._on_history_progress)
+        self._listed_tasks = set()
+        
+        if log.ring_buffer is not None:
+            # 直接使用日志系统的内存缓冲，不再读取磁盘
+            entries = log.ring_buffer.snapshot()
+            max_entries = log.ring_buffer.capacity
+        else:
+            # 未开启内存缓冲时按字节偏移增量读取当前日志文件
+            self.tailer = LogTailer(log.log_file)
+            entries = self.tailer.poll()
+            max_entries = LOG_TAIL_MAX_ENTRIES
+        self.last_seq = entries[-1].seq if entries else 0
+        
+        # 模型/视图：只布局和绘制可见行，过滤由代理模型完成
+        self.log_model = LogTableModel(max_rows=max_entries, parent=self)
+        self.proxy_model = LogLevelProxyModel(self)
+        self.proxy_model.setSourceModel(self.log_model)
+        self.log_model.set_entries(self._visible_entries(entries))
+        
+        # 后台检索：输入防抖，结果增量返回
+        self.search_engine = LogSearchEngine(self)
+        self.search_engine.matches_found.connect(self.on_matches_found)
+        self.search_engine.search_finished.connect(self.on_search_finished)
+        self.search_engine.search_failed.connect(self.on_search_failed)
+        self.log_model.modelReset.connect(self.search_engine.index.clear)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.search_logs)
+        self.search_matches = []   # [(绝对行号, 起始, 结束), ...]
+        self.match_spans = {}      # 绝对行号 -> [(起始, 结束, 匹配序号), ...]
+        self.current_match = -1
+        self.search_running = False
+        
         self.setup_ui()
         self.load_logs()
         
-        # 修改定时器间隔为更合理的值
-        self.update_timer = QTimer(self)
-        self.update_timer.timeout.connect(self.check_logs_update)
-        self.update_timer.start(2000)  # 改为2秒检查一次
+        if self.tailer is None:
+            # 实时日志流：只追加增量；每 100 毫秒合并一次，页面隐藏时暂停
+            stream = log.get_stream()
+            stream.records_appended.connect(self.on_records_appended)
+            self.update_timer = scheduler.call_every(LOG_STREAM_INTERVAL, stream.flush, owner=self)
+        else:
+            # 2秒检查一次，只读取新增字节；页面隐藏时暂停
+            self.update_timer = scheduler.call_every(2.0, self.check_logs_update, owner=self, jitter=0.1)
         
         # 连接语言变更信号
         i18n.language_changed.connect(self.update_text)
@@ -65,35 +166,40 @@ class LogPage(QWidget):
                 border: 1px solid #2196F3;
             }
         """)
-        self.search_input.textChanged.connect(self.search_logs)  # 改为实时搜索
+        # 输入停顿后再检索，连续按键不会堆积查询
+        self.search_input.textChanged.connect(lambda: self.search_timer.start())
+        self.search_input.returnPressed.connect(self.next_match)
+        
+        # 区分大小写 / 正则 开关和上一个/下一个匹配
+        self.case_btn = QPushButton("Aa")
+        self.case_btn.setCheckable(True)
+        self.case_btn.setToolTip("区分大小写")
+        self.regex_btn = QPushButton(".*")
+        self.regex_btn.setCheckable(True)
+        self.regex_btn.setToolTip("正则表达式")
+        self.prev_match_btn = QPushButton("↑")
+        self.prev_match_btn.setToolTip("上一个匹配")
+        self.next_match_btn = QPushButton("↓")
+        self.next_match_btn.setToolTip("下一个匹配")
+        for button in (self.case_btn, self.regex_btn, self.prev_match_btn, self.next_match_btn):
+            button.setStyleSheet(TOOL_BUTTON_STYLE)
+            self.font_manager.apply_normal_style(button)
+        self.case_btn.clicked.connect(self.search_logs)
+        self.regex_btn.clicked.connect(self.search_logs)
+        self.prev_match_btn.clicked.connect(self.previous_match)
+        self.next_match_btn.clicked.connect(self.next_match)
         
         # 添加自动滚动按钮
         self.auto_scroll_btn = QPushButton(i18n.get_text("auto_scroll"))
         self.auto_scroll_btn.setCheckable(True)
-        self.auto_scroll_btn.setStyleSheet("""
-            QPushButton {
-                padding: 8px 15px;
-                border: 1px solid #E0E0E0;
-                border-radius: 5px;
-                font-size: 13px;
-                background: white;
-                color: #666666;
-            }
-            QPushButton:checked {
-                background: #2196F3;
-                color: white;
-                border: 1px solid #1976D2;
-            }
-            QPushButton:hover {
-                background: #E3F2FD;
-            }
-            QPushButton:checked:hover {
-                background: #1976D2;
-            }
-        """)
+        self.auto_scroll_btn.setStyleSheet(TOOL_BUTTON_STYLE)
         self.font_manager.apply_normal_style(self.auto_scroll_btn)
         self.auto_scroll_btn.clicked.connect(self.toggle_auto_scroll)
         search_layout.addWidget(self.search_input)
+        search_layout.addWidget(self.case_btn)
+        search_layout.addWidget(self.regex_btn)
+        search_layout.addWidget(self.prev_match_btn)
+        search_layout.addWidget(self.next_match_btn)
         search_layout.addWidget(self.auto_scroll_btn)
         layout.addLayout(search_layout)
 
@@ -147,21 +253,55 @@ class LogPage(QWidget):
         self.stats_buttons['ALL'].setChecked(True)
         
         stats_layout.addStretch()
+        
+        # 按任务过滤：只看某个线程池任务的日志，任务列显示距提交的耗时
+        self.task_combo = QComboBox()
+        self.task_combo.setMinimumWidth(180)
+        self.task_combo.setToolTip("按任务过滤")
+        self.font_manager.apply_small_style(self.task_combo)
+        self.task_combo.addItem("全部任务", None)
+        self.task_combo.currentIndexChanged.connect(self.filter_task)
+        stats_layout.addWidget(self.task_combo)
+        
+        # 日志文件选择：当前会话为实时日志，其余为历史会话（含轮转备份）
+        self.session_combo = QComboBox()
+        self.session_combo.setMinimumWidth(220)
+        self.font_manager.apply_small_style(self.session_combo)
+        self.session_combo.setStyleSheet(COMBO_STYLE)
+        self.task_combo.setStyleSheet(COMBO_STYLE)
+        self._add_tasks(self.log_model.task_ids())
+        self.refresh_sessions()
+        self.session_combo.currentIndexChanged.connect(self.on_session_changed)
+        stats_layout.addWidget(self.session_combo)
         layout.addLayout(stats_layout)
 
+        # 搜索结果提示
+        self.search_info = QLabel()
+        self.font_manager.apply_small_style(self.search_info)
+        self.search_info.setStyleSheet("""
+            QLabel {
+                color: #666666;
+                padding: 5px;
+                background-color: #F5F5F5;
+                border-radius: 5px;
+            }
+        """)
+        self.search_info.hide()
+        layout.addWidget(self.search_info)
+
         # 日志显示区域
-        self.log_display = QTextEdit()
-        self.font_manager.apply_normal_style(self.log_display)  # 应用普通字体
-        self.log_display.setReadOnly(True)
-        self.log_display.setStyleSheet(f"""
-            QTextEdit {{
+        self.log_view = LogTableView()
+        self.font_manager.apply_normal_style(self.log_view)  # 应用普通字体
+        self.log_view.setModel(self.proxy_model)
+        self.log_view.itemDelegate().match_provider = self._spans_for_index
+        self.log_view.setStyleSheet(f"""
+            QTableView {{
                 background-color: #FFFFFF;
                 border: 1px solid #E0E0E0;
                 border-radius: 10px;
-                padding: 20px;
+                padding: 10px;
                 font-family: "Consolas", "Microsoft YaHei UI", monospace;
                 font-size: 13px;
-                line-height: 1.5;
             }}
             {ScrollStyle.get_style()}
         """)
@@ -187,48 +327,130 @@ class LogPage(QWidget):
                 background: none;
             }
         """)
-        self.log_display.setVerticalScrollBar(scroll_bar)
+        self.log_view.setVerticalScrollBar(scroll_bar)
         
-        layout.addWidget(self.log_display)
+        layout.addWidget(self.log_view)
 
         # 设置日志显示区域的最小高度
-        self.log_display.setMinimumHeight(300)
+        self.log_view.setMinimumHeight(300)
+
+    def _search_mode(self):
+        if self.regex_btn.isChecked():
+            return SEARCH_REGEX if self.case_btn.isChecked() else SEARCH_REGEX_IGNORE_CASE
+        return SEARCH_PLAIN if self.case_btn.isChecked() else SEARCH_IGNORE_CASE
 
     def search_logs(self):
+        """在后台线程检索全部记录，旧的查询会被自动作废"""
+        self.search_timer.stop()
         search_text = self.search_input.text().strip()
-        if not search_text:
-            self.load_logs()
-            return
-        
-        # 获取当前HTML内容并保存原始格式
-        current_html = self.log_display.toHtml()
+        self.search_matches = []
+        self.match_spans = {}
+        self.current_match = -1
+        self.search_running = bool(search_text)
         
-        # 只高亮搜索文本，不改变其他样式
-        highlight_format = 'background-color: #FFE4B5'
-        
-        # 使用正则表达式来只匹配文本内容，不匹配HTML标签内的内容
-        pattern = f'(?<!<[^>]*){re.escape(search_text)}'
-        highlighted_text = re.sub(
-            pattern,
-            r'<span style="{}">\g<0></span>'.format(highlight_format),
-            current_html,
-            flags=re.IGNORECASE
+        self.search_engine.search(
+            self.log_model.entries(), self.log_model.base,
+            search_text, self._search_mode()
         )
-        
-        # 计算匹配数量（排除HTML标签中的匹配）
-        match_count = len(re.findall(pattern, current_html, re.IGNORECASE))
-        
-        if match_count > 0:
-            # 添加搜索统计信息
-            info_text = f'<div style="color: #666666; margin-bottom: 10px; padding: 5px; background-color: #F5F5F5; border-radius: 5px;">找到 {match_count} 处匹配项 "{search_text}"</div>'
-            # 确保在表格之前插入统计信息
-            table_start = highlighted_text.find('<table')
-            if table_start != -1:
-                highlighted_text = highlighted_text[:table_start] + info_text + highlighted_text[table_start:]
-            else:
-                highlighted_text = info_text + highlighted_text
-        
-        self.log_display.setHtml(highlighted_text)
+        if not search_text:
+            self.search_info.hide()
+        self.log_view.viewport().update()
+
+    def on_matches_found(self, generation, matches):
+        if generation != self.search_engine.generation:
+            return
+        for row, start, end in matches:
+            self.match_spans.setdefault(row, []).append((start, end, len(self.search_matches)))
+            self.search_matches.append((row, start, end))
+        if self.search_running:
+            self.search_info.setText(f'正在搜索… 已找到 {len(self.search_matches)} 处匹配项')
+        else:
+            self._show_match_count()
+        self.search_info.show()
+        self.log_view.viewport().update()
+
+    def _show_match_count(self):
+        search_text = self.search_input.text().strip()
+        if self.search_matches:
+            self.search_info.setText(f'找到 {len(self.search_matches)} 处匹配项 "{search_text}"')
+        else:
+            self.search_info.setText(f'没有找到 "{search_text}"')
+
+    def on_search_finished(self, generation, total):
+        if generation != self.search_engine.generation:
+            return
+        self.search_running = False
+        self._show_match_count()
+        self.search_info.show()
+
+    def on_search_failed(self, generation, error):
+        if generation != self.search_engine.generation:
+            return
+        self.search_running = False
+        self.search_info.setText(f'搜索表达式无效: {error}')
+        self.search_info.show()
+
+    def _spans_for_index(self, index):
+        if not self.match_spans or self.history_model is not None:
+            return None
+        absolute = self.log_model.base + self.proxy_model.source_row(index.row())
+        spans = self.match_spans.get(absolute)
+        if not spans:
+            return None
+        return [(start, end, number == self.current_match) for start, end, number in spans]
+
+    def _match_proxy_row(self, number):
+        row = self.search_matches[number][0] - self.log_model.base
+        if row < 0:
+            return None  # 已被裁剪
+        proxy_index = self.proxy_model.mapFromSource(self.log_model.index(row, 0))
+        return proxy_index if proxy_index.isValid() else None
+
+    def _goto_match(self, step):
+        count = len(self.search_matches)
+        if not count:
+            return
+        number = self.current_match
+        # 跳过当前级别过滤下不可见的匹配
+        for _ in range(count):
+            number = (number + step) % count
+            proxy_index = self._match_proxy_row(number)
+            if proxy_index is not None:
+                self.current_match = number
+                # 手动定位时关闭自动滚动，避免新日志把视图带走
+                self.auto_scroll = False
+                self.auto_scroll_btn.setChecked(False)
+                self.log_view.scrollTo(proxy_index, LogTableView.PositionAtCenter)
+                self.log_view.selectRow(proxy_index.row())
+                self.search_info.setText(
+                    f'第 {number + 1}/{count} 处匹配 "{self.search_input.text().strip()}"'
+                )
+                self.log_view.viewport().update()
+                return
+
+    def next_match(self):
+        self._goto_match(1)
+
+    def previous_match(self):
+        self._goto_match(-1)
+
+    def filter_task(self, index):
+        self.proxy_model.set_task(self.task_combo.itemData(index))
+        if self.auto_scroll:
+            self.log_view.scrollToBottom()
+
+    def _add_tasks(self, task_ids):
+        """把新出现的任务加入下拉框"""
+        for task_id in task_ids:
+            if task_id in self._listed_tasks:
+                continue
+            self._listed_tasks.add(task_id)
+            self.task_combo.addItem(task_id, task_id)
+        # 超出上限时移除最早的任务（当前选中的保留）
+        while self.task_combo.count() - 1 > MAX_LISTED_TASKS:
+            index = 1 if self.task_combo.currentIndex() != 1 else 2
+            self._listed_tasks.discard(self.task_combo.itemData(index))
+            self.task_combo.removeItem(index)
 
     def filter_logs(self, level: str):
         # 更新按钮状态和当前过滤级别
@@ -238,185 +460,193 @@ class LogPage(QWidget):
         
         self.apply_filter()  # 应用过滤
 
+    @staticmethod
+    def _visible_entries(entries):
+        # 分隔线不显示
+        return [entry for entry in entries if not entry.message.startswith('===')]
+
     def apply_filter(self):
         try:
-            # 获取最新的日志文件
-            log_dir = os.path.join(os.path.expanduser('~'), '.clutui_nextgen_example', 'logs')
-            latest_log = max(
-                [os.path.join(log_dir, f) for f in os.listdir(log_dir) if f.endswith('.log')],
-                key=os.path.getmtime
-            )
-            
-            with open(latest_log, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            # 过滤并格式化日志内容
-            formatted_content = []
-            for line in content.splitlines():
-                if not line.strip() or line.strip().startswith('==='):
-                    continue
-                    
-                if self.current_filter == 'ALL' or (f'│ {self.current_filter}' in line):
-                    parts = line.split('│')
-                    if len(parts) >= 3:
-                        # 完整保留时间戳，不再截断
-                        timestamp = parts[0].strip()
-                        level = parts[1].strip()      # INFO/DEBUG/etc
-                        
-                        # 处理消息部分，提取文件路径和行号
-                        full_message = '│'.join(parts[2:]).strip()
-                        
-                        # 使用正则表达式匹配文件路径和行号
-                        file_match = re.match(r'(.*?):(\d+)\s*\|\s*(.*)', full_message)
-                        if file_match:
-                            file_path = file_match.group(1).strip()
-                            line_num = file_match.group(2)
-                            message = file_match.group(3).strip()
-                            file_info = f"{file_path:<30} :{line_num}"
-                        else:
-                            file_info = ""
-                            message = full_message
-                        
-                        # 根据日志级别设置颜色
-                        if 'INFO' in level:
-                            level_color = "#2E7D32"  # 墨绿色
-                        elif 'WARNING' in level:
-                            level_color = "#FFC107"
-                        elif 'DEBUG' in level:
-                            level_color = "#9C27B0"  # 浅紫色
-                        elif 'ERROR' in level:
-                            level_color = "#F44336"
-                        else:
-                            level_color = "#333333"
-                        
-                        # 修改时间戳的显示宽度
-                        formatted_line = (
-                            '<tr style="line-height: 1.5;">'
-                            f'<td style="width: 150px; padding-right: 10px; white-space: nowrap; color: #666666;">{timestamp}</td>'  # 增加宽度到150px
-                            f'<td style="width: 60px; padding: 0 10px; white-space: nowrap; color: {level_color}; font-weight: bold;">{level}</td>'
-                            f'<td style="width: 350px; padding: 0 10px; white-space: pre; color: #0066CC; font-family: Consolas;">{file_info}</td>'
-                            f'<td style="padding-left: 10px; word-break: break-all;">{message}</td>'
-                            '</tr>'
-                        )
-                        formatted_content.append(formatted_line)
-            
-            # 使用表格包装所有内容以保持对齐
-            html_content = (
-                '<table style="border-collapse: collapse; width: 100%; '
-                'font-family: Consolas, \'Microsoft YaHei UI\', monospace; font-size: 13px; '
-                'table-layout: fixed;">'
-                f'{"".join(formatted_content)}'
-                '</table>'
-            )
-            
-            self.log_display.setHtml(html_content)
-            self.update_stats(content)
+            self.proxy_model.set_level(self.current_filter)
+            self.update_stats()
+            if self.auto_scroll:
+                self.log_view.scrollToBottom()
             
         except Exception as e:
             log.error(f"过滤日志失败: {str(e)}")
-            self.log_display.setText(f"过滤日志失败: {str(e)}")
-
-    def update_stats(self, content):
-        # 使用更准确的正则表达式来匹配日志级别
-        patterns = {
-            'INFO': r'\[.*?\] │ INFO',     # 匹配新的日志格式
-            'WARN': r'\[.*?\] │ WARNING',  # 匹配新的日志格式
-            'DEBUG': r'\[.*?\] │ DEBUG',   # 匹配新的日志格式
-            'ERROR': r'\[.*?\] │ ERROR'    # 匹配新的日志格式
-        }
-        
-        # 统计各级别日志数量
-        for level, pattern in patterns.items():
-            count = len(re.findall(pattern, content))
+
+    def update_stats(self):
+        if self.history_model is not None:
+            # 历史会话读取计数文件，没有计数文件的旧日志不显示数量
+            levels = self.history_stats['levels'] if self.history_stats else {}
+            for level in ('INFO', 'WARN', 'DEBUG', 'ERROR'):
+                count = levels.get('WARNING' if level == 'WARN' else level, 0) if self.history_stats else '-'
+                self.stats_buttons[level].setText(f"{level}: {count}")
+            return
+        # 直接读取日志系统维护的本次会话计数，不受表格裁剪影响
+        counters = log.counters
+        for level in ('INFO', 'WARN', 'DEBUG', 'ERROR'):
+            count = counters.level_count('WARNING' if level == 'WARN' else level)
             self.stats_buttons[level].setText(f"{level}: {count}")
 
-    def check_logs_update(self):
+    def on_records_appended(self, batch):
+        """接收日志流的增量记录，只追加新行"""
         try:
-            log_dir = os.path.join(os.path.expanduser('~'), '.clutui_nextgen_example', 'logs')
-            latest_log = max(
-                [os.path.join(log_dir, f) for f in os.listdir(log_dir) if f.endswith('.log')],
-                key=os.path.getmtime
-            )
+            new_entries = [entry for entry in batch if entry.seq > self.last_seq]
+            if not new_entries:
+                return
+            self.last_seq = new_entries[-1].seq
+            
+            live = self.history_model is None
+            was_at_bottom = live and self.log_view.is_at_bottom()
+            visible_entries = self._visible_entries(new_entries)
+            start_row = self.log_model.base + self.log_model.rowCount()
+            self.log_model.append_entries(visible_entries)
+            self._add_tasks(dict.fromkeys(entry.task for entry in visible_entries if entry.task))
+            if live and (self.auto_scroll or was_at_bottom):
+                self.log_view.scrollToBottom()
+            self.update_stats()
             
-            with open(latest_log, 'r', encoding='utf-8') as f:
-                current_content = f.read()
+            # 有搜索内容时只检索新增的记录，已有匹配和当前位置保持不变
+            if not self.search_timer.isActive():
+                self.search_engine.search_appended(visible_entries, start_row)
             
-            if current_content != self.last_content:
-                self.last_content = current_content
-                self.load_logs(force_update=False)
-                
+        except Exception as e:
+            log.error(f"追加日志失败: {str(e)}")
+
+    def check_logs_update(self):
+        try:
+            batch = self.tailer.poll()
+            if batch:
+                self.on_records_appended(batch)
         except Exception as e:
             log.error(f"检查日志更新失败: {str(e)}")
 
     def load_logs(self, force_update=True):
         try:
-            # 保存当前搜索文本和滚动条位置
-            search_text = self.search_input.text().strip()
-            current_scroll = self.log_display.verticalScrollBar().value()
-            was_at_bottom = current_scroll == self.log_display.verticalScrollBar().maximum()
-            
-            # 获取当前显示的内容
-            current_content = self.log_display.toHtml()
-            
-            # 如果不是强制更新且内容没有变化，则直接返回
-            if not force_update and current_content == self.last_content:
-                return
-                
-            # 获取最新的日志文件
-            log_dir = os.path.join(os.path.expanduser('~'), '.clutui_nextgen_example', 'logs')
-            if not os.path.exists(log_dir):
-                self.log_display.setText("日志目录不存在")
-                return
-                
-            log_files = [f for f in os.listdir(log_dir) if f.endswith('.log')]
-            if not log_files:
-                self.log_display.setText("没有找到日志文件")
-                return
-
-            # 应用过滤器前暂时禁用更新
-            self.log_display.setUpdatesEnabled(False)
-            
-            # 应用当前的过滤器
             self.apply_filter()
             
             # 如果有搜索文本，重新应用搜索
-            if search_text:
+            if self.search_input.text().strip():
                 self.search_logs()
-                
-            # 修改滚动条位置逻辑
-            if self.auto_scroll:
-                # 如果开启了自动滚动，总是滚动到底部
-                self.log_display.verticalScrollBar().setValue(
-                    self.log_display.verticalScrollBar().maximum()
-                )
-            else:
-                # 保持原有的滚动位置逻辑
-                if was_at_bottom:
-                    self.log_display.verticalScrollBar().setValue(
-                        self.log_display.verticalScrollBar().maximum()
-                    )
-                else:
-                    self.log_display.verticalScrollBar().setValue(current_scroll)
             
-            # 重新启用更新并刷新显示
-            self.log_display.setUpdatesEnabled(True)
-            self.log_display.update()
+            if self.auto_scroll:
+                self.log_view.scrollToBottom()
 
         except Exception as e:
-            log.error(f"加载日志文件失败: {str(e)}")
-            self.log_display.setText(f"加载日志文件时出错: {str(e)}")
+            log.error(f"加载日志失败: {str(e)}")
+
+    def refresh_sessions(self):
+        """重新列出日志目录中的历史会话，保留当前选择"""
+        current = self.session_combo.currentData()
+        self.session_combo.blockSignals(True)
+        self.session_combo.clear()
+        self.session_combo.addItem("当前会话（实时）", None)
+        for path in list_log_sessions(log.log_dir, exclude=log.log_file):
+            name = os.path.basename(path)[len('clutui_nextgen_'):-len('.log')]
+            segments = rotated_segments(path)
+            try:
+                size = sum(os.path.getsize(p) for p in segments)
+            except OSError:
+                continue
+            compressed = ", gz" if any(p.endswith('.gz') for p in segments) else ""
+            self.session_combo.addItem(f"{name} ({size / 1048576:.1f}MB{compressed})", path)
+        index = self.session_combo.findData(current)
+        self.session_combo.setCurrentIndex(max(index, 0))
+        self.session_combo.blockSignals(False)
+
+    def on_session_changed(self, index):
+        path = self.session_combo.itemData(index)
+        if path is None:
+            self.close_history()
+        else:
+            self.open_history(path)
+
+    def open_history(self, path):
+        """映射历史会话日志，后台建立行索引，已索引的部分可立即浏览"""
+        try:
+            mapped = MappedLogFile(path)
+        except Exception as e:
+            log.error(f"打开历史日志失败: {str(e)}")
+            self.session_combo.setCurrentIndex(0)
+            return
+        self.close_history(restore_live=False)
+        
+        self.history_file = mapped
+        self.history_model = MappedLogModel(mapped, self)
+        self.history_model.lines_indexed.connect(self._on_history_indexed)
+        self.history_stats = load_log_stats(mapped.path)
+        self.log_view.setModel(self.history_model)
+        self._set_live_controls_enabled(False)
+        self._on_history_indexed(0)
+        self.update_stats()
+        
+        model = self.history_model
+
+        def progress(count):
+            # 在工作线程上执行：历史已关闭时结束索引；不直接碰模型，它可能已经被销毁
+            current_token().raise_if_cancelled()
+            self._history_progress.emit(model, count)
+
+        self.history_task = f"log_index_{os.path.basename(mapped.path)}"
+        self.history_index = thread_manager.submit_task(self.history_task, mapped.build_index, progress)
+
+    def close_history(self, restore_live=True):
+        if self.history_file is None:
+            return
+        # 先让视图离开历史模型，再释放映射
+        if restore_live:
+            self.log_view.setModel(self.proxy_model)
+        # 先通知后台索引结束，再释放映射和模型
+        if self.history_index is not None and not self.history_index.done():
+            thread_manager.cancel_task(self.history_task)
+        self.history_index = None
+        self.history_task = None
+        self.history_file.close()
+        self.history_model.deleteLater()
+        self.history_file = None
+        self.history_model = None
+        self.history_stats = None
+        if restore_live:
+            self._set_live_controls_enabled(True)
+            self.search_info.hide()
+            self.update_stats()
+            if self.auto_scroll:
+                self.log_view.scrollToBottom()
+
+    def _on_history_progress(self, model, count):
+        if model is self.history_model:
+            model.lines_indexed.emit(count)
+
+    def _on_history_indexed(self, count):
+        if self.history_file is None:
+            return
+        state = "" if self.history_file.is_indexed else "，正在建立索引…"
+        segments = len(self.history_file.segments)
+        self.search_info.setText(f"历史日志: {segments} 个文件，{count} 行{state}")
+        self.search_info.show()
+
+    def _set_live_controls_enabled(self, enabled):
+        # 搜索和级别过滤只作用于实时日志
+        for widget in (self.search_input, self.case_btn, self.regex_btn,
+                       self.prev_match_btn, self.next_match_btn, self.auto_scroll_btn, self.task_combo,
+                       *self.stats_buttons.values()):
+            widget.setEnabled(enabled)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # 每次进入页面时刷新历史会话列表（上次运行后可能新增了日志）
+        if self.history_model is None:
+            self.refresh_sessions()
 
     def toggle_auto_scroll(self):
         self.auto_scroll = self.auto_scroll_btn.isChecked()
         if self.auto_scroll:
             # 立即滚动到底部
-            self.log_display.verticalScrollBar().setValue(
-                self.log_display.verticalScrollBar().maximum()
-            )
+            self.log_view.scrollToBottom()
 
     def update_text(self):
         self.title_label.setText(i18n.get_text("system_log"))
         self.search_input.setPlaceholderText(i18n.get_text("search_placeholder"))
         self.auto_scroll_btn.setText(i18n.get_text("auto_scroll"))
-        for btn_level, button in self.stats_buttons.items():
-            button.setText(f"{btn_level}: 0")
+        self.update_stats()
@@ -135,8 +135,9 @@ class QuickStartPage(QWidget):
         self.layout.addWidget(main_title)
         
         # 说明文本
-        hitokoto = self.yiyan_api.get_hitokoto_sync()
-        description = QLabel(f"{hitokoto}")
+        # 先显示缓存的一句，获取到新的一言后再替换
+        description = QLabel(self.yiyan_api.get_cached_hitokoto())
+        self.yiyan_api.get_hitokoto_async(owner=description).on_done(description.setText)
         self.font_manager.apply_font(description, "normal")  # 应用普通字体
         description.setStyleSheet("""
             QLabel {
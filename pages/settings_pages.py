@@ -21,6 +21,7 @@ from core.ui.button_white import WhiteButton
 from core.ui.scroll_style import ScrollStyle
 from core.animations.scroll_hide_show import ScrollBarAnimation
 from core.font.font_pages_manager import FontPagesManager
+from core.thread.frame_queue import frame_queue
 
 class SettingsPage(QWidget):
     settings_changed = Signal(dict)  # 发出设置改变信号
@@ -82,11 +83,7 @@ class SettingsPage(QWidget):
         except Exception as e:
             log.error(f"连接语言变更信号失败: {str(e)}")
             
-        # 最后连接其他信号
-        try:
-            self._connect_signals()
-        except Exception as e:
-            log.error(f"连接组件信号失败: {str(e)}")
+        # 其他信号在选项卡分帧创建完成后连接（见 _init_ui）
 
     def closeEvent(self, event):
         """处理关闭事件"""
@@ -251,15 +248,22 @@ class SettingsPage(QWidget):
         self.tab_widget = QTabWidget()
         self.tab_widget.setDocumentMode(True)
         
-        # 创建各个设置选项卡
+        # 常规选项卡默认显示，直接创建；外观和高级选项卡先放空容器，分帧创建后填入
         general_tab = self._create_general_tab()
-        appearance_tab = self._create_appearance_tab()
-        advanced_tab = self._create_advanced_tab()
+        appearance_holder = self._create_tab_holder()
+        advanced_holder = self._create_tab_holder()
         
         # 添加选项卡到tab_widget
         self.tab_widget.addTab(general_tab, i18n.get_text("general"))
-        self.tab_widget.addTab(appearance_tab, i18n.get_text("appearance"))
-        self.tab_widget.addTab(advanced_tab, i18n.get_text("advanced"))
+        self.tab_widget.addTab(appearance_holder, i18n.get_text("appearance"))
+        self.tab_widget.addTab(advanced_holder, i18n.get_text("advanced"))
+        
+        # 全部选项卡创建完成后再连接信号；切到还没创建好的选项卡时立即补完
+        self._build = frame_queue.batch("settings_page", owner=self)
+        self._build.add(lambda: appearance_holder.layout().addWidget(self._create_appearance_tab()))
+        self._build.add(lambda: advanced_holder.layout().addWidget(self._create_advanced_tab()))
+        self._build.finished.connect(self._connect_signals)
+        self.tab_widget.currentChanged.connect(self._on_tab_changed)
         
         container_layout.addWidget(self.tab_widget)
         
@@ -472,6 +476,17 @@ class SettingsPage(QWidget):
         
         return general_tab
     
+    def _on_tab_changed(self, index):
+        if index and not self._build.is_finished():
+            self._build.flush()
+    
+    def _create_tab_holder(self):
+        """分帧创建的选项卡的外层容器"""
+        holder = QWidget()
+        layout = QVBoxLayout(holder)
+        layout.setContentsMargins(0, 0, 0, 0)
+        return holder
+    
     def _create_appearance_tab(self):
         """创建外观设置选项卡"""
         appearance_tab = QWidget()
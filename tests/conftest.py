@@ -0,0 +1,10 @@
+'''
+测试共用的 Qt 应用实例：页面测试需要 QApplication，必须在其他模块创建 QCoreApplication 之前建好
+'''
+import os
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+app = QApplication.instance() or QApplication([])
@@ -0,0 +1,195 @@
+'''
+弹性线程池：原地调整上限、空闲线程退出、排队过久时扩容和空闲后收缩，以及优先级通道
+
+在仓库根目录运行: python -m pytest -q tests
+'''
+import threading
+import time
+
+import pytest
+
+from core.thread.elastic_pool import (ElasticThreadPool, LANE_BACKGROUND, LANE_INTERACTIVE,
+                                     LANE_NORMAL)
+
+
+@pytest.fixture
+def pools():
+    created = []
+
+    def make(**kwargs):
+        pool = ElasticThreadPool(**kwargs)
+        created.append(pool)
+        return pool
+
+    yield make
+    for pool in created:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def wait_until(predicate, timeout=2.0):
+    end = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() >= end:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def block_workers(pool, count):
+    """提交 count 个阻塞任务，返回 (放行用的 Event, 每个任务开始时释放一次的信号量, futures)"""
+    release = threading.Event()
+    started = threading.Semaphore(0)
+
+    def blocker():
+        started.release()
+        release.wait(5)
+
+    futures = [pool.submit(blocker) for _ in range(count)]
+    return release, started, futures
+
+
+def test_threads_are_created_on_demand_and_reused(pools):
+    pool = pools(base_workers=4, min_workers=1)
+    assert pool.stats()['workers'] == 0
+
+    results = [pool.submit(pow, i, 2) for i in range(50)]
+    assert [future.result(timeout=2) for future in results] == [i * i for i in range(50)]
+    assert pool.stats()['spawned'] <= 4
+
+
+def test_set_max_workers_resizes_in_place(pools):
+    pool = pools(base_workers=2, min_workers=1, max_limit=8, wait_target=10)
+    release, started, futures = block_workers(pool, 6)
+    assert wait_until(lambda: pool.stats()['queued'] == 4)
+    assert pool.stats()['workers'] == 2
+
+    # 扩大上限：排队的任务立即由新线程接手，已在执行的任务不受影响
+    pool.set_max_workers(6)
+    for _ in range(6):
+        assert started.acquire(timeout=2)
+    assert pool.stats()['workers'] == 6
+
+    # 缩小上限：多余线程做完手头任务后退出
+    pool.set_max_workers(1)
+    release.set()
+    for future in futures:
+        future.result(timeout=2)
+    assert wait_until(lambda: pool.stats()['workers'] == 1)
+
+
+def test_idle_threads_retire_down_to_min_workers(pools):
+    pool = pools(base_workers=4, min_workers=1, idle_timeout=0.1)
+    release, started, futures = block_workers(pool, 4)
+    for _ in range(4):
+        assert started.acquire(timeout=2)
+    release.set()
+    for future in futures:
+        future.result(timeout=2)
+
+    assert wait_until(lambda: pool.stats()['workers'] == 1)
+    assert pool.stats()['retired'] == 3
+
+
+def test_grows_when_tasks_wait_too_long(pools):
+    grown = []
+    pool = pools(base_workers=1, min_workers=1, max_limit=8, wait_target=0.01,
+                 on_grow=lambda: grown.append(pool.max_workers))
+    futures = [pool.submit(time.sleep, 0.03) for _ in range(12)]
+    for future in futures:
+        future.result(timeout=5)
+
+    assert grown
+    assert pool.max_workers > 1
+    assert pool.stats()['spawned'] > 1
+
+
+def test_autoscale_shrinks_back_to_base_after_idle(pools):
+    pool = pools(base_workers=2, min_workers=1, max_limit=16, idle_timeout=0.05)
+    pool.set_max_workers(12)
+    time.sleep(0.06)
+
+    limits = []
+    while True:
+        target = pool.autoscale()
+        if target is None:
+            break
+        limits.append(target)
+    # 每次收回与基础线程数差距的一半，逐步回到 base_workers
+    assert limits == sorted(limits, reverse=True)
+    assert pool.max_workers == 2
+
+
+def test_autoscale_grows_with_backlog(pools):
+    pool = pools(base_workers=2, min_workers=1, max_limit=16, wait_target=0.01)
+    release, started, futures = block_workers(pool, 2)
+    for _ in range(2):
+        assert started.acquire(timeout=2)
+    queued = [pool.submit(time.sleep, 0) for _ in range(4)]
+    # 等待样本在任务出队时记录，线程都被占着时没有新样本，这里直接放入最近的等待时间
+    pool._waits.extend([0.05] * 20)
+
+    assert pool.autoscale() == 3
+    release.set()
+    for future in futures + queued:
+        future.result(timeout=2)
+
+
+# ---------- 优先级通道 ----------
+
+def test_idle_worker_takes_higher_lanes_first(pools):
+    pool = pools(base_workers=1, min_workers=1, aging=10.0, wait_target=10)
+    release, started, futures = block_workers(pool, 1)
+    assert started.acquire(timeout=2)
+
+    order = []
+    queued = [pool.submit_to(lane, order.append, lane)
+              for lane in (LANE_BACKGROUND, LANE_NORMAL, LANE_INTERACTIVE, LANE_NORMAL)]
+    release.set()
+    for future in futures + queued:
+        future.result(timeout=2)
+    assert order == [LANE_INTERACTIVE, LANE_NORMAL, LANE_NORMAL, LANE_BACKGROUND]
+
+
+def test_background_share_keeps_threads_for_other_lanes(pools):
+    pool = pools(base_workers=4, min_workers=1, background_share=0.5, wait_target=10)
+    release = threading.Event()
+    background = [pool.submit_to(LANE_BACKGROUND, release.wait, 5) for _ in range(4)]
+    assert wait_until(lambda: pool.stats()['lanes'][LANE_BACKGROUND]['running'] == 2)
+
+    # 4 个线程里 background 最多占 2 个，普通任务不用等 background 结束
+    lanes = pool.stats()['lanes']
+    assert lanes[LANE_BACKGROUND]['queued'] == 2
+    assert pool.submit_to(LANE_NORMAL, lambda: 'normal').result(timeout=1) == 'normal'
+    assert pool.stats()['lanes'][LANE_BACKGROUND]['running'] == 2
+
+    release.set()
+    for future in background:
+        future.result(timeout=2)
+
+
+def test_aging_promotes_long_waiting_background(pools):
+    pool = pools(base_workers=1, min_workers=1, aging=0.05, wait_target=10)
+    release, started, futures = block_workers(pool, 1)
+    assert started.acquire(timeout=2)
+
+    order = []
+    queued = [pool.submit_to(LANE_BACKGROUND, order.append, LANE_BACKGROUND)]
+    # 排队超过两级优先级折算的时间后，background 排到新来的 interactive 前面
+    time.sleep(0.15)
+    queued.append(pool.submit_to(LANE_INTERACTIVE, order.append, LANE_INTERACTIVE))
+    release.set()
+    for future in futures + queued:
+        future.result(timeout=2)
+    assert order == [LANE_BACKGROUND, LANE_INTERACTIVE]
+
+
+def test_lane_stats_and_unknown_lane(pools):
+    pool = pools(base_workers=2, min_workers=1)
+    for lane in (LANE_INTERACTIVE, LANE_NORMAL, LANE_BACKGROUND):
+        pool.submit_to(lane, time.sleep, 0).result(timeout=2)
+    lanes = pool.stats()['lanes']
+    assert all(lanes[lane]['completed'] == 1 for lane in lanes)
+    assert sum(count for _, count in lanes[LANE_NORMAL]['histogram']) == 1
+
+    with pytest.raises(ValueError):
+        pool.submit_to('urgent', time.sleep, 0)
@@ -0,0 +1,54 @@
+'''
+崩溃飞行记录器：记录可以读回、关闭与写入并发时不写已关闭的映射、未正常退出时生成报告
+
+在仓库根目录运行: python -m pytest -q tests
+'''
+import logging
+import threading
+
+from core.log.flight_recorder import FlightRecorder
+
+
+def make_record(message):
+    return logging.LogRecord('test', logging.INFO, __file__, 1, message, None, None)
+
+
+def test_records_survive_unclean_exit(tmp_path):
+    recorder = FlightRecorder(str(tmp_path))
+    assert recorder.open() is None
+    for i in range(3):
+        recorder.append(make_record(f"第 {i} 条"))
+    recorder.close(clean=False)
+
+    # 上次没有正常退出：下次打开时生成崩溃报告，包含最后的记录
+    report = FlightRecorder(str(tmp_path)).open()
+    assert report is not None
+    with open(report, encoding='utf-8') as f:
+        text = f.read()
+    assert "第 0 条" in text and "第 2 条" in text
+
+
+def test_append_racing_close(tmp_path):
+    recorder = FlightRecorder(str(tmp_path))
+    recorder.open()
+    errors = []
+    start = threading.Barrier(5)
+
+    def writer():
+        start.wait()
+        try:
+            for i in range(2000):
+                recorder.append(make_record(f"记录 {i}"))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    recorder.close()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    recorder.append(make_record("关闭之后"))
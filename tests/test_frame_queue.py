@@ -0,0 +1,85 @@
+'''
+分帧任务队列：优先级顺序、时间片预算、批次完成信号和任务异常
+
+在仓库根目录运行: python -m pytest -q tests
+'''
+import os
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import pytest  # noqa: E402
+from PySide6.QtCore import QCoreApplication, QEvent, QObject  # noqa: E402
+from core.thread.frame_queue import (FrameQueue, PRIORITY_HIGH, PRIORITY_IDLE,  # noqa: E402
+                                     PRIORITY_NORMAL)
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def test_runs_by_priority_then_submission_order(app):
+    queue = FrameQueue()
+    ran = []
+    queue.post(lambda: ran.append('idle'), PRIORITY_IDLE)
+    queue.post(lambda: ran.append('normal-1'))
+    queue.post(lambda: ran.append('high'), PRIORITY_HIGH)
+    queue.post(lambda: ran.append('normal-2'), PRIORITY_NORMAL)
+
+    queue.flush()
+    assert ran == ['high', 'normal-1', 'normal-2', 'idle']
+    assert queue.stats()['pending'] == 0
+
+
+def test_slice_yields_after_budget(app):
+    queue = FrameQueue(budget_ms=5)
+    ran = []
+    for i in range(6):
+        queue.post(lambda i=i: (time.sleep(0.003), ran.append(i)))
+
+    # 每个任务 3 毫秒，5 毫秒的预算在第二个任务后用完
+    queue._run_slice()
+    assert ran == [0, 1]
+    assert queue.stats()['pending'] == 4
+
+    queue.flush()
+    assert ran == list(range(6))
+
+
+def test_batch_finishes_when_job_raises(app):
+    queue = FrameQueue()
+    batch = queue.batch("raising")
+    progress = []
+    finished = []
+    batch.progress.connect(lambda done, total: progress.append((done, total)))
+    batch.finished.connect(lambda: finished.append(True))
+
+    def boom():
+        raise ValueError("boom")
+
+    batch.add(lambda: None)
+    batch.add(boom)
+    batch.add(lambda: None)
+
+    # 任务异常只记录日志，不影响统计和批次进度
+    queue.flush()
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+    assert finished == [True]
+    assert queue.stats()['executed'] == 3
+
+
+def test_cancelled_and_orphaned_jobs_are_skipped(app):
+    queue = FrameQueue()
+    ran = []
+    owner = QObject()
+    queue.post(lambda: ran.append('owned'), owner=owner)
+    job = queue.post(lambda: ran.append('cancelled'))
+    queue.post(lambda: ran.append('kept'))
+
+    job.cancel()
+    owner.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+    queue.flush()
+    assert ran == ['kept']
@@ -0,0 +1,31 @@
+'''
+日志检索：匹配位置对应原文的行号和列，小写后长度改变的字符不会让位置偏移
+
+在仓库根目录运行: python -m pytest -q tests
+'''
+import pytest
+
+from core.log.log_search import (LogSearchEngine, _IndexChunk, SEARCH_IGNORE_CASE, SEARCH_PLAIN,
+                                 SEARCH_REGEX)
+
+
+def search(messages, text, mode, start_row=0):
+    chunk = _IndexChunk(start_row, messages)
+    matches = LogSearchEngine._search_chunk(chunk, LogSearchEngine._build_matcher(text, mode), mode)
+    return [(row, messages[row - start_row][start:end]) for row, start, end in matches]
+
+
+@pytest.mark.parametrize('mode', [SEARCH_PLAIN, SEARCH_IGNORE_CASE, SEARCH_REGEX])
+def test_matches_map_to_rows_and_columns(mode):
+    messages = ['启动完成', 'error: 连接失败 error', '', 'no match']
+    assert search(messages, 'error', mode, start_row=100) == [
+        (101, 'error'), (101, 'error'),
+    ]
+
+
+def test_ignore_case_after_length_changing_lowercase():
+    # 'İ'.lower() 是两个码位，按小写文本计算的偏移会整体后移
+    messages = ['İstanbul İİ Error here', 'plain ERROR line', 'İ']
+    assert search(messages, 'error', SEARCH_IGNORE_CASE, start_row=10) == [
+        (10, 'Error'), (11, 'ERROR'),
+    ]
@@ -0,0 +1,82 @@
+'''
+日志增量读取：只读新追加的字节，半行等到写完，轮转时先读完旧文件剩余部分
+
+在仓库根目录运行: python -m pytest -q tests
+'''
+import os
+
+from core.log.log_tail import LogTailer
+
+
+def line(number):
+    return f"[12:00:{number % 60:02d}] │ INFO     │ test.py                  :{number:<4} │ 第 {number} 条\n"
+
+
+def append(path, text):
+    with open(path, 'a', encoding='utf-8', newline='') as f:
+        f.write(text)
+
+
+def messages(entries):
+    return [entry.message for entry in entries]
+
+
+def rotate(path):
+    # 与 RotatingFileHandler 相同：当前文件重命名为 .1（inode 不变），再新建同名文件
+    os.replace(path, f"{path}.1")
+    open(path, 'w').close()
+
+
+def test_reads_only_new_complete_lines(tmp_path):
+    path = str(tmp_path / 'clutui_nextgen_2026-01-01_00-00-00.log')
+    append(path, line(1) + line(2))
+    tailer = LogTailer(path)
+    assert messages(tailer.poll()) == ['第 1 条', '第 2 条']
+    assert tailer.poll() == []
+
+    # 写了一半的行等换行符到了再解析
+    partial = line(3)
+    append(path, partial[:20])
+    assert tailer.poll() == []
+    append(path, partial[20:] + line(4))
+    assert messages(tailer.poll()) == ['第 3 条', '第 4 条']
+    assert tailer.offset == os.path.getsize(path)
+
+
+def test_rotation_drains_old_file_before_new_one(tmp_path):
+    path = str(tmp_path / 'clutui_nextgen_2026-01-01_00-00-00.log')
+    append(path, line(1))
+    tailer = LogTailer(path)
+    assert messages(tailer.poll()) == ['第 1 条']
+
+    # 两次轮询之间：旧文件又写了两行后被轮转，新文件也写了一行
+    append(path, line(2) + line(3))
+    rotate(path)
+    append(path, line(4))
+    assert messages(tailer.poll()) == ['第 2 条', '第 3 条', '第 4 条']
+
+    append(path, line(5))
+    assert messages(tailer.poll()) == ['第 5 条']
+
+
+def test_rotation_keeps_unterminated_last_line(tmp_path):
+    path = str(tmp_path / 'clutui_nextgen_2026-01-01_00-00-00.log')
+    append(path, line(1) + line(2).rstrip('\n'))
+    tailer = LogTailer(path)
+    assert messages(tailer.poll()) == ['第 1 条']
+
+    # 旧文件之后没有新内容，最后一行没有换行符也不能丢
+    rotate(path)
+    append(path, line(3))
+    assert messages(tailer.poll()) == ['第 2 条', '第 3 条']
+
+
+def test_truncated_file_is_read_from_start(tmp_path):
+    path = str(tmp_path / 'clutui_nextgen_2026-01-01_00-00-00.log')
+    append(path, line(1) + line(2))
+    tailer = LogTailer(path)
+    tailer.poll()
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(line(3))
+    assert messages(tailer.poll()) == ['第 3 条']
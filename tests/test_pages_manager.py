@@ -0,0 +1,64 @@
+'''
+页面管理器：页面在第一次用到时创建，创建失败后占位控件保留，下次可以重试
+
+在仓库根目录运行: python -m pytest -q tests
+'''
+import os
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import pytest  # noqa: E402
+from PySide6.QtWidgets import QApplication, QWidget  # noqa: E402
+from core.pages_core.pages_manager import PagesManager  # noqa: E402
+from core.thread.frame_queue import frame_queue  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def manager():
+    app = QApplication.instance() or QApplication([])
+    manager = PagesManager()
+    yield manager
+    manager.cancel_pending_pages()
+    app.processEvents()
+
+
+def test_page_is_built_on_first_use(manager):
+    built = []
+
+    def factory():
+        built.append(True)
+        return QWidget()
+
+    manager.register_page("lazy_test", factory)
+    assert built == [] and "lazy_test" not in manager.pages
+
+    page = manager._build_page("lazy_test")
+    assert built == [True]
+    assert manager._build_page("lazy_test") is page
+    assert manager.stacked_widget.indexOf(manager.pages["lazy_test"]) != -1
+
+
+def test_failed_factory_can_be_retried(manager):
+    attempts = []
+
+    def factory():
+        attempts.append(True)
+        if len(attempts) == 1:
+            raise ImportError("页面模块加载失败")
+        return QWidget()
+
+    manager.register_page("flaky_test", factory)
+    count = manager.stacked_widget.count()
+
+    # 第一次失败：占位控件还在，工厂保留
+    assert manager._build_page("flaky_test") is None
+    assert "flaky_test" not in manager.pages
+    assert manager.stacked_widget.count() == count
+
+    # 预创建走分帧队列再试一次，这次成功替换占位控件
+    manager.prefetch_page("flaky_test")
+    frame_queue.flush()
+    page = manager.pages["flaky_test"]
+    assert len(attempts) == 2
+    assert manager.stacked_widget.count() == count
+    assert manager.stacked_widget.indexOf(page) != -1
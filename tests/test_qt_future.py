@@ -0,0 +1,49 @@
+'''
+QtFuture：回调在界面线程执行，一个回调失败不影响其余回调
+
+在仓库根目录运行: python -m pytest -q tests
+'''
+import os
+import threading
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import pytest  # noqa: E402
+from PySide6.QtCore import QCoreApplication  # noqa: E402
+from core.thread.qt_future import QtFuture  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def test_callbacks_run_on_gui_thread(app):
+    future = QtFuture()
+    seen = []
+    future.on_done(lambda value: seen.append((value, threading.current_thread() is threading.main_thread())))
+
+    worker = threading.Thread(target=future.future.set_result, args=(42,))
+    worker.start()
+    worker.join()
+    assert seen == []
+
+    app.processEvents()
+    assert seen == [(42, True)]
+
+
+def test_raising_callback_does_not_drop_later_ones(app):
+    future = QtFuture()
+    seen = []
+
+    def boom(_value):
+        raise ValueError("boom")
+
+    future.on_done(boom)
+    future.on_done(seen.append)
+    future.then(lambda value: value + 1).on_done(seen.append)
+
+    future.future.set_result(1)
+    app.processEvents()
+    app.processEvents()
+    assert seen == [1, 2]
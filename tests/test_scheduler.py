@@ -0,0 +1,124 @@
+'''
+时间轮调度器：跨层插入的任务在到期刻度执行、休眠唤醒后跳转、周期任务和回调异常
+
+在仓库根目录运行: python -m pytest -q tests
+'''
+import os
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import pytest  # noqa: E402
+from PySide6.QtCore import QCoreApplication, QEventLoop, QTimer  # noqa: E402
+from core.thread.scheduler import Scheduler, ScheduledJob, TICK_MS  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def make_job(due_tick, interval=None, callback=None):
+    job = ScheduledJob(0, callback or (lambda: None), interval, 0.0, None)
+    job.due_tick = due_tick
+    return job
+
+
+def fire_ticks(wheel, jobs, limit=100):
+    """按 _on_timeout 的方式反复唤醒，返回每个任务实际执行的刻度"""
+    fired = {}
+    for _ in range(limit):
+        tick = wheel._next_tick()
+        if tick is None:
+            break
+        for job in wheel._advance(tick):
+            fired[jobs.index(job)] = tick
+    return fired
+
+
+def test_upper_level_cascade_before_level0_job(app):
+    wheel = Scheduler()
+    a = make_job(65)
+    wheel._insert(a)              # 当前刻度 0，相差 65，放在第 1 层
+    assert wheel._advance(60) == []
+    b = make_job(123)
+    wheel._insert(b)              # 当前刻度 60，相差 63，放在第 0 层
+
+    # 第 1 层的槽在刻度 64 下沉，早于第 0 层的 123
+    assert wheel._next_tick() == 64
+    assert fire_ticks(wheel, [a, b]) == {0: 65, 1: 123}
+
+
+@pytest.mark.parametrize('due', [1, 63, 64, 65, 128, 4095, 4096, 4097, 262144, 300000, 20_000_000])
+def test_job_fires_on_its_due_tick(app, due):
+    wheel = Scheduler()
+    job = make_job(due)
+    wheel._insert(job)
+    assert fire_ticks(wheel, [job]) == {0: due}
+    assert wheel.stats()['scheduled'] == 0
+
+
+def test_jobs_across_levels_fire_in_order(app):
+    wheel = Scheduler()
+    dues = [3, 70, 64, 5000, 4096, 129, 128, 66]
+    jobs = [make_job(due) for due in dues]
+    for job in jobs:
+        wheel._insert(job)
+    fired = fire_ticks(wheel, jobs)
+    assert fired == {index: due for index, due in enumerate(dues)}
+
+
+def test_long_gap_jumps_and_periodic_job_resumes(app):
+    wheel = Scheduler()
+    runs = []
+    periodic = make_job(40, interval=2.0, callback=lambda: runs.append(wheel._current))
+    later = make_job(10_000_000)
+    wheel._insert(periodic)
+    wheel._insert(later)
+
+    # 模拟休眠一天后醒来：一次跳过去，周期任务只补执行一次
+    target = 24 * 3600 * 1000 // TICK_MS
+    due = wheel._advance(target)
+    assert due == [periodic]
+    assert wheel._current == target
+    for job in due:
+        wheel._run(job)
+    assert runs == [target]
+    assert periodic.due_tick == target + 2000 // TICK_MS
+    assert later.due_tick == 10_000_000
+    assert wheel.stats()['scheduled'] == 2
+
+
+def test_raising_periodic_job_keeps_running(app):
+    wheel = Scheduler()
+    calls = []
+
+    def boom():
+        calls.append(1)
+        raise ValueError("boom")
+
+    job = make_job(1, interval=0.1, callback=boom)
+    wheel._insert(job)
+    for _ in range(3):
+        for due in wheel._advance(wheel._next_tick()):
+            wheel._run(due)
+    assert len(calls) == 3
+    assert job.runs == 3
+    assert wheel.stats()['scheduled'] == 1
+
+
+def test_call_later_and_call_every_on_event_loop(app):
+    wheel = Scheduler()
+    started = time.monotonic()
+    fired = []
+    ticks = []
+    wheel.call_later(0.1, lambda: fired.append(time.monotonic() - started))
+    job = wheel.call_every(0.05, lambda: ticks.append(1))
+
+    loop = QEventLoop()
+    QTimer.singleShot(400, loop.quit)
+    loop.exec()
+    job.cancelled = True
+
+    assert len(fired) == 1 and fired[0] >= 0.1
+    assert 4 <= len(ticks) <= 9
@@ -0,0 +1,68 @@
+'''
+任务组取消：执行中的任务通过取消令牌得到通知并提前结束
+
+在仓库根目录运行: python -m pytest -q tests
+'''
+import os
+import threading
+from concurrent.futures import CancelledError
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import pytest  # noqa: E402
+from PySide6.QtCore import QCoreApplication  # noqa: E402
+from core.thread.task_context import current_token, TaskCancelled  # noqa: E402
+from core.thread.thread_manager import thread_manager  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def manager():
+    # ThreadManager 是单例，关闭后不能再提交，整个模块共用一个，结束时再关闭
+    app = QCoreApplication.instance() or QCoreApplication([])
+    yield thread_manager
+    thread_manager.shutdown(wait=True, cancel_futures=True)
+    app.processEvents()
+
+
+def test_cancel_stops_running_task(manager):
+    started = threading.Event()
+    outcome = []
+
+    def work():
+        started.set()
+        token = current_token()
+        try:
+            for _ in range(100):
+                token.sleep(0.05)
+        except TaskCancelled:
+            outcome.append('cancelled')
+            raise
+        outcome.append('ran-to-end')
+
+    group = manager.task_group("cancel_test", max_concurrency=1)
+    future = group.submit(work)
+    assert started.wait(2.0)
+
+    assert group.cancel() == 1
+    with pytest.raises(CancelledError):
+        future.result(timeout=0)
+
+    # 任务在下一次 token.sleep 时看到取消，不会等满 5 秒
+    record = manager.registry.get("cancel_test_0")
+    record.future.exception(timeout=2.0)
+    assert outcome == ['cancelled']
+    assert record.status == 'cancelled'
+    assert group.stats()['running'] == 0
+
+
+def test_cancel_drops_pending_tasks(manager):
+    release = threading.Event()
+    ran = []
+    group = manager.task_group("pending_test", max_concurrency=1)
+    group.submit(release.wait, 2.0)
+    queued = [group.submit(ran.append, i) for i in range(3)]
+
+    assert group.cancel() == 4
+    release.set()
+    assert all(future.cancelled() for future in queued)
+    assert ran == []
@@ -0,0 +1,85 @@
+'''
+冷启动首帧基准：从导入页面管理器到默认页面第一次绘制的耗时
+
+每次在新的子进程里用离屏平台测量，窗口只包含侧边栏和页面堆叠窗口：
+- import:      导入 core.pages_core.pages_manager（含它导入的页面模块）
+- construct:   PagesManager() 构造
+- first_paint: 从开始导入到默认页面收到第一次绘制事件
+- pages:       第一次绘制时已经创建的页面数
+
+第二个参数可以指定另一份代码目录（例如用 git worktree 检出的旧版本）做对比。
+在当前平台上无法导入的依赖（例如 winreg）会让测量失败并打印错误。
+
+用法: python tools/bench_first_paint.py [重复次数] [代码目录]
+'''
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r'''
+import json, sys, time
+sys.path.insert(0, ROOT)
+from PySide6.QtWidgets import QApplication, QWidget, QHBoxLayout
+from PySide6.QtCore import QObject, QEvent, QTimer
+app = QApplication([])
+
+started = time.perf_counter()
+from core.pages_core.pages_manager import PagesManager
+imported = time.perf_counter()
+manager = PagesManager()
+constructed = time.perf_counter()
+result = {}
+
+class FirstPaint(QObject):
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint and 'first_paint_ms' not in result:
+            result['first_paint_ms'] = (time.perf_counter() - started) * 1000
+            result['pages'] = len(manager.pages)
+            QTimer.singleShot(200, app.quit)
+        return False
+
+window = QWidget()
+window.resize(1080, 650)
+layout = QHBoxLayout(window)
+layout.addWidget(manager.get_sidebar())
+layout.addWidget(manager.get_stacked_widget())
+watcher = FirstPaint()
+manager.get_stacked_widget().currentWidget().installEventFilter(watcher)
+window.show()
+QTimer.singleShot(5000, app.quit)
+app.exec()
+result['import_ms'] = (imported - started) * 1000
+result['construct_ms'] = (constructed - imported) * 1000
+print(json.dumps(result))
+'''
+
+
+def measure(root):
+    # 日志和配置写到临时目录，不污染用户目录
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(os.environ, HOME=home, USERPROFILE=home, QT_QPA_PLATFORM='offscreen')
+        code = CHILD.replace('ROOT', repr(root))
+        completed = subprocess.run([sys.executable, '-c', code], env=env, cwd=home,
+                                   capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr else '子进程失败')
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    root = os.path.abspath(sys.argv[2]) if len(sys.argv) > 2 else ROOT
+    results = [measure(root) for _ in range(runs)]
+    median = lambda key: sorted(r[key] for r in results)[runs // 2]
+    print(f"{root}: {runs} 次取中位数")
+    print(f"导入:     {median('import_ms'):7.1f}ms")
+    print(f"构造:     {median('construct_ms'):7.1f}ms")
+    print(f"首次绘制: {median('first_paint_ms'):7.1f}ms  已创建页面 {median('pages')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+'''
+调用方解析微基准：对比旧的逐帧遍历（每个处理器一次）和记录创建时一次性解析的单条日志开销
+
+用法: python tools/bench_log_caller.py [记录数]
+'''
+import inspect
+import logging
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+_tmp_home = tempfile.mkdtemp(prefix='clutui_bench_')
+os.environ['HOME'] = _tmp_home
+os.environ['USERPROFILE'] = _tmp_home
+_real_stdout = sys.stdout
+sys.stdout = open(os.devnull, 'w', encoding='utf-8')
+
+from core.log.log_manager import log, ColoredFormatter  # noqa: E402
+
+FMT = '[%(asctime)s] │ %(levelname)s │ %(pathname)s:%(lineno)s │ %(message)s'
+
+
+class _NullStream:
+    def write(self, _):
+        pass
+
+    def flush(self):
+        pass
+
+
+class LegacyWalkFormatter(logging.Formatter):
+    """旧实现：每次 format 都 import inspect 并从当前帧向上遍历"""
+
+    def __init__(self):
+        super().__init__('[%(asctime)s] │ %(levelname)-8s │ %(pathname)-25s:%(lineno)-4d │ %(message)s',
+                         '%H:%M:%S')
+
+    def format(self, record):
+        original_pathname = record.pathname
+        frame = inspect.currentframe()
+        while frame:
+            module_name = frame.f_globals.get('__name__', '')
+            if (not module_name.startswith('logging') and
+                    not module_name.startswith('core.log') and
+                    frame.f_code.co_name not in ('format', 'info', 'emit', 'handle')):
+                break
+            frame = frame.f_back
+        if frame:
+            filename = os.path.basename(frame.f_code.co_filename)
+            if len(filename) > 25:
+                filename = filename[:22] + "..."
+            record.pathname = filename
+            record.lineno = frame.f_lineno
+        result = super().format(record)
+        record.pathname = original_pathname
+        return result
+
+
+class LegacyFacade:
+    def __init__(self, logger):
+        self.logger = logger
+
+    def info(self, message):
+        self.logger.info(message)
+
+
+def make_handlers(formatter_factory):
+    handlers = []
+    for _ in range(2):  # 文件 + 控制台两个处理器
+        handler = logging.StreamHandler(_NullStream())
+        handler.setFormatter(formatter_factory())
+        handlers.append(handler)
+    return handlers
+
+
+def measure(call, total):
+    for i in range(200):  # 预热
+        call(f"warmup {i}")
+    start = time.perf_counter()
+    for i in range(total):
+        call(f"切换到页面: page_{i & 7}")
+    return (time.perf_counter() - start) / total * 1e9
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+
+    legacy_logger = logging.getLogger('ClutBench.legacy')
+    legacy_logger.propagate = False
+    legacy_logger.setLevel(logging.DEBUG)
+    for handler in make_handlers(LegacyWalkFormatter):
+        legacy_logger.addHandler(handler)
+    legacy = LegacyFacade(legacy_logger)
+
+    saved_handlers = list(log.logger.handlers)
+    log.logger.handlers[:] = make_handlers(
+        lambda: ColoredFormatter(FMT, datefmt='%H:%M:%S', use_colors=False)
+    )
+    try:
+        legacy_ns = measure(legacy.info, total)
+        current_ns = measure(log.info, total)
+    finally:
+        log.logger.handlers[:] = saved_handlers
+
+    print(f"旧实现(每处理器遍历栈帧): {legacy_ns:>8.0f} ns/条", file=_real_stdout)
+    print(f"新实现(创建时解析一次):   {current_ns:>8.0f} ns/条", file=_real_stdout)
+    print(f"节省: {(1 - current_ns / legacy_ns) * 100:.1f}%", file=_real_stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+'''
+延迟构造日志消息基准：模拟一次页面切换产生的日志调用，比较立即格式化与延迟格式化的开销
+
+所有处理器都关闭 DEBUG 后，调试日志在构造消息之前就应被丢弃；
+再把级别提到 WARNING，模拟发布版本中页面切换的全部日志都被过滤的情况。
+
+用法: python tools/bench_log_lazy.py [切换次数]
+'''
+import logging
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# 日志写到临时目录，不污染用户目录
+os.environ['HOME'] = os.environ['USERPROFILE'] = tempfile.mkdtemp(prefix='clutui_lazy_')
+# 控制台处理器创建时绑定 sys.stdout，先换成空设备，初始化日志和测量期间的输出都不会混进结果
+_real_stdout = sys.stdout
+sys.stdout = open(os.devnull, 'w', encoding='utf-8')
+
+from core.log.log_manager import log  # noqa: E402
+from core.i18n import i18n  # noqa: E402
+
+PAGES = ['home', 'settings', 'about', 'log', 'quick_start']
+
+
+def debug_eager(name, task_id):
+    # 改造前的写法：无论级别是否开启都先格式化/查翻译
+    log.debug(f"提交任务: {task_id}")
+    log.debug(i18n.get_text("already_on_page", name))
+
+
+def debug_lazy(name, task_id):
+    log.debug("提交任务: %s", task_id)
+    log.debug(lambda: i18n.get_text("already_on_page").format(name))
+
+
+def switch_page_eager(name, task_id):
+    debug_eager(name, task_id)
+    log.info(i18n.get_text("switch_to_page", name))
+    log.info(i18n.get_text("page_switch_complete", name))
+
+
+def switch_page_lazy(name, task_id):
+    debug_lazy(name, task_id)
+    log.info(lambda: i18n.get_text("switch_to_page").format(name))
+    log.info(lambda: i18n.get_text("page_switch_complete").format(name))
+
+
+def set_all_handlers(level):
+    for handler in set(log.get_logger().handlers) | set(log._io_handlers):
+        handler.setLevel(level)
+    log.refresh_levels()
+
+
+def measure(func, count):
+    best = float('inf')
+    for _ in range(5):
+        start = time.perf_counter()
+        for i in range(count):
+            func(PAGES[i % len(PAGES)], f"task_{i}")
+        best = min(best, time.perf_counter() - start)
+    return best / count * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    cases = (
+        (logging.INFO, "关闭 DEBUG，被过滤的调用", debug_eager, debug_lazy),
+        (logging.WARNING, "关闭 DEBUG/INFO，整次切换", switch_page_eager, switch_page_lazy),
+    )
+    for level, label, eager_func, lazy_func in cases:
+        set_all_handlers(level)
+        eager = measure(eager_func, count)
+        lazy = measure(lazy_func, count)
+        print(f"{label:<20} 立即格式化: {eager:7.2f}us/次  延迟格式化: {lazy:7.2f}us/次  "
+              f"节省 {eager - lazy:6.2f}us ({(1 - lazy / eager) * 100:.0f}%)", file=_real_stdout)
+
+    disabled = time.perf_counter()
+    for i in range(count):
+        if log.enabled(logging.DEBUG):
+            log.debug(f"提交任务: task_{i}")
+    print(f"log.enabled(DEBUG) 守卫: {(time.perf_counter() - disabled) / count * 1e9:.0f}ns/次",
+          file=_real_stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+'''
+历史日志映射基准：测量大日志文件的打开、首批可用行、完整索引和随机访问耗时
+
+用法: python tools/bench_log_mmap.py [文件大小MB]
+'''
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.log.log_mmap import MappedLogFile  # noqa: E402
+
+LINE = "[12:34:56] │ INFO     │ pages_manager.py         :214  │ 切换到页面: settings {}\n"
+
+
+def write_file(path, size_bytes):
+    chunk = ''.join(LINE.format(i) for i in range(10000)).encode('utf-8')
+    with open(path, 'wb') as f:
+        written = 0
+        while written < size_bytes:
+            f.write(chunk)
+            written += len(chunk)
+
+
+def main():
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 200
+    workdir = tempfile.mkdtemp(prefix='clutui_mmap_')
+    path = os.path.join(workdir, 'clutui_nextgen_2024-01-01_00-00-00.log')
+    # 一个当前文件加两个轮转备份
+    for suffix in ('.2', '.1', ''):
+        write_file(path + suffix, size_mb * 1024 * 1024 / 3)
+
+    start = time.perf_counter()
+    mapped = MappedLogFile(path)
+    opened = time.perf_counter() - start
+
+    first_rows = []
+
+    def progress(count):
+        if not first_rows:
+            first_rows.append((time.perf_counter() - start, count))
+
+    mapped.build_index(progress)
+    indexed = time.perf_counter() - start
+    print(f"文件总大小: {mapped.total_bytes / 1048576:.0f}MB, {len(mapped.segments)} 个文件")
+    print(f"映射打开: {opened * 1e3:.2f}ms")
+    print(f"首批可用: {first_rows[0][0] * 1e3:.1f}ms ({first_rows[0][1]} 行)")
+    print(f"完整索引: {indexed * 1e3:.0f}ms ({mapped.line_count()} 行)")
+
+    index_bytes = sum(len(segment.offsets) * segment.offsets.itemsize for segment in mapped.segments)
+    print(f"行索引占用: {index_bytes / 1048576:.1f}MB")
+
+    total = mapped.line_count()
+
+    def browse():
+        samples = []
+        for _ in range(200):
+            row = random.randrange(total)
+            begin = time.perf_counter()
+            for offset in range(40):  # 一屏约 40 行
+                mapped.entry(min(row + offset, total - 1))
+            samples.append(time.perf_counter() - begin)
+        samples.sort()
+        return samples
+
+    samples = browse()
+    print(f"随机跳转一屏:    p50={samples[100] * 1e3:.2f}ms p99={samples[198] * 1e3:.2f}ms")
+
+    # 只跟踪浏览阶段的分配，确认页缓存的内存有上限
+    tracemalloc.start()
+    browse()
+    current, peak = tracemalloc.get_traced_memory()
+    print(f"浏览阶段堆占用: 当前 {current / 1048576:.1f}MB, 峰值 {peak / 1048576:.1f}MB")
+    mapped.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+'''
+日志管道基准测试：对比同步模式与异步模式的吞吐量和调用延迟
+
+用法: python tools/bench_log_pipeline.py [记录数] [线程数]
+'''
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# 日志写到临时目录，控制台输出丢弃，避免污染真实日志和终端
+_tmp_home = tempfile.mkdtemp(prefix='clutui_bench_')
+os.environ['HOME'] = _tmp_home
+os.environ['USERPROFILE'] = _tmp_home
+_real_stdout = sys.stdout
+sys.stdout = open(os.devnull, 'w', encoding='utf-8')
+
+from core.log.log_manager import log  # noqa: E402
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+    return ordered[index]
+
+
+def run_workload(total, threads):
+    per_thread = total // threads
+    latencies = [[] for _ in range(threads)]
+
+    def worker(slot):
+        samples = latencies[slot]
+        for i in range(per_thread):
+            start = time.perf_counter()
+            if i % 4 == 0:
+                log.debug(f"提交任务: bench_{slot}_{i}")
+            else:
+                log.info(f"处理记录 {i} 来自线程 {slot}")
+            samples.append(time.perf_counter() - start)
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    call_elapsed = time.perf_counter() - start
+    log.flush(timeout=None)
+    total_elapsed = time.perf_counter() - start
+
+    merged = [s for chunk in latencies for s in chunk]
+    return {
+        'records': len(merged),
+        'calls_per_sec': len(merged) / call_elapsed,
+        'drained_per_sec': len(merged) / total_elapsed,
+        'p50_us': percentile(merged, 50) * 1e6,
+        'p99_us': percentile(merged, 99) * 1e6,
+    }
+
+
+def report(name, result):
+    print(
+        f"{name:<22} 记录数={result['records']:<8} "
+        f"调用吞吐={result['calls_per_sec']:>10.0f}/s  "
+        f"落盘吞吐={result['drained_per_sec']:>10.0f}/s  "
+        f"p50={result['p50_us']:>8.1f}us  p99={result['p99_us']:>8.1f}us",
+        file=_real_stdout
+    )
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    report('sync', run_workload(total, threads))
+    for policy in ('block', 'drop_oldest', 'drop_debug'):
+        log.enable_async(capacity=10000, policy=policy)
+        result = run_workload(total, threads)
+        stats = log.get_async_stats()
+        log.disable_async()
+        report(f'async/{policy}', result)
+        if stats['dropped']:
+            print(f"{'':<22} 丢弃={stats['dropped']}", file=_real_stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+'''
+增量读取基准：在接近 10MB 轮转上限的日志文件上测量单次轮询耗时
+
+用法: python tools/bench_log_tail.py [文件大小MB]
+'''
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.log.log_tail import LogTailer  # noqa: E402
+
+LINE = "[12:34:56] │ INFO     │ pages_manager.py         :214  │ 切换到页面: settings {}\n"
+
+
+def write_lines(path, count, start=0):
+    with open(path, 'a', encoding='utf-8') as f:
+        for i in range(start, start + count):
+            f.write(LINE.format(i))
+
+
+def timed(func, repeat=200):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2] * 1e3, samples[int(len(samples) * 0.99)] * 1e3
+
+
+def main():
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    workdir = tempfile.mkdtemp(prefix='clutui_tail_')
+    path = os.path.join(workdir, 'clutui_nextgen_2024-01-01_00-00-00.log')
+
+    line_bytes = len(LINE.format(0).encode('utf-8'))
+    total_lines = int(size_mb * 1024 * 1024 / line_bytes)
+    write_lines(path, total_lines)
+
+    tailer = LogTailer(path)
+    start = time.perf_counter()
+    first = tailer.poll()
+    print(f"首次读取 {os.path.getsize(path) / 1048576:.1f}MB: {len(first)} 条, "
+          f"{(time.perf_counter() - start) * 1e3:.1f}ms")
+
+    p50, p99 = timed(tailer.poll)
+    print(f"无新增轮询:      p50={p50:.3f}ms p99={p99:.3f}ms")
+
+    counter = [total_lines]
+
+    def append_and_poll():
+        write_lines(path, 10, counter[0])
+        counter[0] += 10
+        tailer.poll()
+
+    def append_only():
+        write_lines(path, 10, counter[0])
+        counter[0] += 10
+
+    append_p50, _ = timed(append_only)
+    p50, p99 = timed(append_and_poll)
+    print(f"新增10行轮询:    p50={p50 - append_p50:.3f}ms p99={p99 - append_p50:.3f}ms (已扣除写入耗时)")
+
+    os.replace(path, path + '.1')
+    write_lines(path, 5)
+    rotated = tailer.poll()
+    print(f"轮转后首次轮询:  {len(rotated)} 条")
+
+
+if __name__ == "__main__":
+    main()
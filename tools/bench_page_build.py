@@ -0,0 +1,111 @@
+'''
+页面构建卡顿基准：一次性构建和分帧构建时界面线程最长被阻塞多久
+
+每次在新的子进程里用离屏平台测量，页面放进一个显示着的窗口里构建：
+- sync:   构建后立即 frame_queue.flush()，等同于改动前在一次调用里建完所有控件
+- frames: 构建后交给事件循环，frame_queue 每轮最多执行 FRAME_BUDGET_MS
+PagesManager 只同步创建默认页面，其余页面在构建后对注册表中的每一项调用 prefetch_page，
+由 frame_queue 逐个创建（sync 模式下同样立即 flush）。
+max_stall 为 StallMonitor 测得的最长阻塞，ready 为从开始构建到内容全部建完的耗时。
+在当前平台上无法导入的页面（例如依赖 winreg 的设置页）会被跳过。
+
+用法: python tools/bench_page_build.py [重复次数]
+'''
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = {
+    'ExamplePage': 'pages.example_page:ExamplePage',
+    'SettingsPage': 'pages.settings_pages:SettingsPage',
+    'PagesManager': 'core.pages_core.pages_manager:PagesManager',
+}
+
+CHILD = r'''
+import importlib, json, sys, time
+sys.path.insert(0, ROOT)
+from PySide6.QtWidgets import QApplication, QWidget, QVBoxLayout
+from PySide6.QtCore import QTimer
+app = QApplication([])
+from core.thread.frame_queue import frame_queue, stall_monitor
+
+module_name, class_name = TARGET.split(':')
+target = getattr(importlib.import_module(module_name), class_name)
+
+window = QWidget()
+window.resize(1080, 650)
+QVBoxLayout(window)
+window.show()
+result = {}
+
+def build():
+    started = time.perf_counter()
+    built = target()
+    widget = built.get_stacked_widget() if hasattr(built, 'get_stacked_widget') else built
+    window.layout().addWidget(widget)
+    window.keep = built
+    if hasattr(built, 'prefetch_page'):
+        for name, *_ in built.PAGE_REGISTRY:
+            built.prefetch_page(name)
+    if MODE == 'sync':
+        frame_queue.flush()
+    def wait_ready():
+        if frame_queue.stats()['pending']:
+            QTimer.singleShot(1, wait_ready)
+            return
+        result['ready_ms'] = (time.perf_counter() - started) * 1000
+        QTimer.singleShot(100, app.quit)
+    wait_ready()
+
+def start():
+    stall_monitor.reset()
+    QTimer.singleShot(20, build)
+
+stall_monitor.start()
+QTimer.singleShot(200, start)
+app.exec()
+result.update(stall_monitor.stats())
+result.update(frame_queue.stats())
+print(json.dumps(result))
+'''
+
+
+def measure(target, mode):
+    # 日志和配置写到临时目录，不污染用户目录
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(os.environ, HOME=home, USERPROFILE=home, QT_QPA_PLATFORM='offscreen')
+        code = (CHILD.replace('ROOT', repr(ROOT)).replace('TARGET', repr(target))
+                .replace('MODE', repr(mode)))
+        completed = subprocess.run([sys.executable, '-c', code], env=env, cwd=home,
+                                   capture_output=True, text=True)
+    if completed.returncode != 0:
+        return None, completed.stderr.strip().splitlines()[-1] if completed.stderr else ''
+    return json.loads(completed.stdout.strip().splitlines()[-1]), None
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    print(f"{runs} 次取中位数，单位毫秒")
+    for name, target in TARGETS.items():
+        for mode in ('sync', 'frames'):
+            results = []
+            for _ in range(runs):
+                result, error = measure(target, mode)
+                if result is None:
+                    break
+                results.append(result)
+            if not results:
+                print(f"{name:13s} 跳过: {error}")
+                break
+            median = lambda key: sorted(r[key] for r in results)[len(results) // 2]
+            print(f"{name:13s} {mode:6s}  max_stall {median('max_stall_ms'):7.1f}  "
+                  f"ready {median('ready_ms'):7.1f}  longest_slice {median('longest_slice_ms'):6.1f}  "
+                  f"longest_job {median('longest_job_ms'):6.1f}  slices {median('slices'):3d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+'''
+任务通道基准：后台任务积压时界面任务的排队等待
+
+先一次性提交大量后台任务（模拟一言重试、图片解码这类带等待的任务），
+再每隔一段时间提交一个界面任务（模拟字体加载），比较：
+- fifo:  所有任务都走 normal 通道（改造前的单一 FIFO 队列）
+- lanes: 后台任务走 background，界面任务走 interactive
+
+同时检查后台任务没有被饿死（全部完成，给出等待分位数）。
+
+用法: python tools/bench_thread_lanes.py [后台任务数] [界面任务数]
+'''
+import os
+import sys
+import time
+from concurrent.futures import wait
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.thread.elastic_pool import (  # noqa: E402
+    ElasticThreadPool, LANE_INTERACTIVE, LANE_NORMAL, LANE_BACKGROUND
+)
+
+WORKERS = 8
+BACKGROUND_SECONDS = 0.02
+INTERACTIVE_SECONDS = 0.002
+INTERACTIVE_INTERVAL = 0.01
+
+
+def job(waits, submitted, seconds):
+    waits.append(time.perf_counter() - submitted)
+    time.sleep(seconds)
+
+
+def percentile_ms(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))] * 1000
+
+
+def run(use_lanes, background_count, interactive_count):
+    # 固定线程数，只比较调度顺序
+    pool = ElasticThreadPool(base_workers=WORKERS, min_workers=WORKERS, max_limit=WORKERS)
+    background_lane = LANE_BACKGROUND if use_lanes else LANE_NORMAL
+    interactive_lane = LANE_INTERACTIVE if use_lanes else LANE_NORMAL
+    background_waits, interactive_waits = [], []
+
+    futures = [pool.submit_to(background_lane, job, background_waits, time.perf_counter(), BACKGROUND_SECONDS)
+               for _ in range(background_count)]
+    for _ in range(interactive_count):
+        futures.append(pool.submit_to(interactive_lane, job, interactive_waits,
+                                      time.perf_counter(), INTERACTIVE_SECONDS))
+        time.sleep(INTERACTIVE_INTERVAL)
+    wait(futures)
+    histogram = pool.stats()['lanes'][interactive_lane]['histogram']
+    pool.shutdown()
+    return interactive_waits, background_waits, histogram
+
+
+def report(label, interactive, background):
+    print(f"{label:<6} 界面任务 等待 p50 {percentile_ms(interactive, 0.5):8.1f}ms  "
+          f"p95 {percentile_ms(interactive, 0.95):8.1f}ms   "
+          f"后台任务 p50 {percentile_ms(background, 0.5):8.1f}ms  "
+          f"最长 {max(background) * 1000:8.1f}ms  完成 {len(background)}")
+
+
+def main():
+    background_count = int(sys.argv[1]) if len(sys.argv) > 1 else 800
+    interactive_count = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    print(f"{WORKERS} 线程，后台任务 {background_count} 个 x {BACKGROUND_SECONDS * 1000:.0f}ms，"
+          f"界面任务 {interactive_count} 个 x {INTERACTIVE_SECONDS * 1000:.0f}ms")
+
+    interactive, background, _ = run(False, background_count, interactive_count)
+    report("fifo", interactive, background)
+    interactive, background, histogram = run(True, background_count, interactive_count)
+    report("lanes", interactive, background)
+
+    print("lanes 界面任务等待直方图（线程池统计）:")
+    for upper, count in histogram:
+        if count:
+            label = f"<= {upper}ms" if upper is not None else "> 5000ms"
+            print(f"  {label:>10}: {count}")
+
+
+if __name__ == "__main__":
+    main()
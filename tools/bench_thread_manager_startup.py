@@ -0,0 +1,82 @@
+'''
+线程管理器启动开销基准：冷启动导入 thread_manager 的耗时、导入后的线程数和 psutil 是否已加载
+
+每次在新的子进程里测量（模块只会导入一次），按 ClutUI_Nextgen_Main.py 的顺序先导入日志系统再导入
+thread_manager，两段都从解释器刚启动时开始计时：
+- import:  导入 core.log.log_manager 和 core.thread.thread_manager 的耗时，以及导入后进程里的线程
+- submit:  第一次提交任务（含线程池创建）到拿到结果的耗时，以及之后的线程
+- idle:    任务完成、空闲一段时间后的线程
+psutil 一列为该阶段结束时 psutil 是否已经导入。
+
+用法: python tools/bench_thread_manager_startup.py [重复次数]
+'''
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r'''
+import json, sys, threading, time
+sys.path.insert(0, ROOT)
+
+def threads():
+    return sorted(t.name for t in threading.enumerate())
+
+started = time.perf_counter()
+from core.log.log_manager import log
+logged = time.perf_counter()
+from core.thread.thread_manager import thread_manager
+imported = time.perf_counter()
+after_import = threads()
+psutil_after_import = 'psutil' in sys.modules
+
+thread_manager.submit_task("bench_noop", lambda: None).result()
+submitted = time.perf_counter()
+after_submit = threads()
+psutil_after_submit = 'psutil' in sys.modules
+time.sleep(IDLE_SECONDS)
+
+print(json.dumps({
+    'log_ms': (logged - started) * 1000,
+    'import_ms': (imported - logged) * 1000,
+    'submit_ms': (submitted - imported) * 1000,
+    'after_import': after_import,
+    'after_submit': after_submit,
+    'after_idle': threads(),
+    'psutil_after_import': psutil_after_import,
+    'psutil_after_submit': psutil_after_submit,
+}))
+'''
+
+IDLE_SECONDS = 1.0
+
+
+def measure():
+    # 日志写到临时目录，不污染用户目录
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(os.environ, HOME=home, USERPROFILE=home, QT_QPA_PLATFORM='offscreen')
+        code = CHILD.replace('ROOT', repr(ROOT)).replace('IDLE_SECONDS', repr(IDLE_SECONDS))
+        output = subprocess.run([sys.executable, '-c', code], env=env, cwd=home,
+                                capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    results = [measure() for _ in range(runs)]
+    median = lambda key: sorted(r[key] for r in results)[runs // 2]
+    last = results[-1]
+    print(f"{runs} 次取中位数")
+    print(f"导入 log_manager:    {median('log_ms'):7.1f}ms")
+    print(f"导入 thread_manager: {median('import_ms'):7.1f}ms  psutil {last['psutil_after_import']}  "
+          f"导入后线程 {len(last['after_import'])}: {last['after_import']}")
+    print(f"首次提交任务:        {median('submit_ms'):7.1f}ms  psutil {last['psutil_after_submit']}  "
+          f"提交后线程 {len(last['after_submit'])}: {last['after_submit']}")
+    print(f"空闲 {IDLE_SECONDS:.0f}s 后线程 {len(last['after_idle'])}: {last['after_idle']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+'''
+弹性线程池基准：突发提交下比较三种线程池策略的吞吐、排队等待和线程创建数
+
+- fixed:   固定大小的 ThreadPoolExecutor
+- rebuild: 原 ThreadManager 的做法，监控线程按活动任务数重建 ThreadPoolExecutor（旧执行器 shutdown(wait=False)）
+- elastic: ElasticThreadPool，按排队等待时间原地扩容，空闲线程超时退出
+
+每轮突发提交一批模拟 I/O 的任务（sleep），轮与轮之间留出空闲间隔。
+
+用法: python tools/bench_thread_pool.py [轮数] [每轮任务数]
+'''
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.thread.elastic_pool import ElasticThreadPool  # noqa: E402
+
+BASE_WORKERS = 8
+TASK_SECONDS = 0.004
+IDLE_GAP = 0.3
+
+
+class FixedPool:
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=BASE_WORKERS)
+        self.threads = set()
+
+    def submit(self, fn, *args):
+        return self.executor.submit(fn, *args)
+
+    def tick(self, active):
+        pass
+
+    def close(self):
+        self.threads.update(self.executor._threads)
+        self.executor.shutdown()
+        return len(self.threads)
+
+
+class RebuildPool(FixedPool):
+    """模拟改造前 _adjust_thread_pool 的重建策略"""
+
+    def __init__(self):
+        super().__init__()
+        self.old = []
+
+    def tick(self, active):
+        current = self.executor._max_workers
+        if active > current * 0.8:
+            new_workers = min(current * 2, 256)
+        elif active < current * 0.2:
+            new_workers = max(current // 2, BASE_WORKERS)
+        else:
+            new_workers = BASE_WORKERS
+        if new_workers != current:
+            old = self.executor
+            self.executor = ThreadPoolExecutor(max_workers=new_workers)
+            self.threads.update(old._threads)
+            old.shutdown(wait=False)
+            self.old.append(old)
+
+    def close(self):
+        for old in self.old:
+            old.shutdown()
+        return super().close()
+
+
+class ElasticPool:
+    def __init__(self):
+        self.executor = ElasticThreadPool(base_workers=BASE_WORKERS, min_workers=2,
+                                          max_limit=BASE_WORKERS * 4, idle_timeout=1.0)
+
+    def submit(self, fn, *args):
+        return self.executor.submit(fn, *args)
+
+    def tick(self, active):
+        self.executor.autoscale()
+
+    def close(self):
+        spawned = self.executor.stats()['spawned']
+        self.executor.shutdown()
+        return spawned
+
+
+def run(pool, bursts, burst_size):
+    waits = []
+    lock = threading.Lock()
+    active = [0]
+
+    def job(submitted):
+        started = time.perf_counter()
+        with lock:
+            waits.append(started - submitted)
+        time.sleep(TASK_SECONDS)
+        with lock:
+            active[0] -= 1
+
+    # 监控节拍：与原实现一样周期检查，这里缩短到 50ms 以便在基准时长内触发
+    stop = threading.Event()
+
+    def monitor():
+        while not stop.wait(0.05):
+            pool.tick(active[0])
+
+    monitor_thread = threading.Thread(target=monitor, daemon=True)
+    monitor_thread.start()
+
+    busy = 0.0
+    for _ in range(bursts):
+        start = time.perf_counter()
+        futures = []
+        for _ in range(burst_size):
+            with lock:
+                active[0] += 1
+            futures.append(pool.submit(job, time.perf_counter()))
+        wait(futures)
+        busy += time.perf_counter() - start
+        time.sleep(IDLE_GAP)
+
+    stop.set()
+    monitor_thread.join()
+    threads = pool.close()
+    waits.sort()
+    return {
+        'throughput': bursts * burst_size / busy,
+        'p50': waits[len(waits) // 2] * 1000,
+        'p95': waits[int(len(waits) * 0.95)] * 1000,
+        'threads': threads,
+    }
+
+
+def main():
+    bursts = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    burst_size = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+    print(f"{bursts} 轮 x {burst_size} 个任务，每个 {TASK_SECONDS * 1000:.0f}ms，基础线程数 {BASE_WORKERS}")
+    for name, factory in (("fixed", FixedPool), ("rebuild", RebuildPool), ("elastic", ElasticPool)):
+        result = run(factory(), bursts, burst_size)
+        print(f"{name:<8} 吞吐 {result['throughput']:8.0f} 任务/s  等待 p50 {result['p50']:7.1f}ms  "
+              f"p95 {result['p95']:7.1f}ms  创建线程 {result['threads']:4d}")
+
+
+if __name__ == "__main__":
+    main()